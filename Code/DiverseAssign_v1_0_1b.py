@@ -18,12 +18,21 @@ openblas library 0.3.23
 
 import sys
 import os
-from pandas import read_csv, DataFrame
-from numpy import tile, arange, exp
-from math import log, ceil, comb
-from random import shuffle, uniform
-from collections import deque 
-from time import perf_counter, sleep
+import json
+from argparse import ArgumentParser
+from time import sleep, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import freeze_support
+
+# Scoring, heuristics and search. See the diverse_assign package
+from diverse_assign import helpers
+from diverse_assign.helpers import csvCheck
+from diverse_assign import heuristicEstimator, iterator, parallelIterator, solve, solveCsv
+from diverse_assign import RunControl, stopOnSignals, RandomStream
+from numpy.random import SeedSequence
+
+# pandas is imported only where it is used: importing it takes most of the start-up time
+# of a short headless run. See loadCsv()
 
 #%% Before compiling production: COMMENT OUT THIS IMPORT
 # Only used with MEGATESTER
@@ -57,1141 +66,24 @@ HELPER FUNCTIONS
 debug_flag = True
 # debug_flag = False
 
-#%% debug_print() function
+# Pass debug_flag on to the diverse_assign package
+helpers.debug_flag = debug_flag
 
-# The function debug_print(message, variable, bool): prints a variable for debug tracing
-def debug_print(message: str, variable, debug_flag: bool):
-    if debug_flag == True:
-        print(f"debug tracing : {message} : {variable}")
+#%% loadCsv() function. Reads a CSV file into a DataFrame. Imports pandas on first use
 
-#%% csvCheck() function. Check whether file is CSV
+def loadCsv(file_path):
+    from pandas import read_csv
+    return read_csv(file_path)
 
-def csvCheck(file_path):
-    _, file_extension = os.path.splitext(file_path)
-    return file_extension.lower() == ".csv"
+#%% MegaTester CSV headers. One row per solution of iterator()
 
-#%% weightModfier() function. 
-# Goal: generates weights to balance the influence of each column on the 
-# grand sum diversity.
-#
-# Weights will scale the column Shannon-Weiner Index in proportion of the 
-# Aggregate Diversity Score (ADS).
-#
-# Weights will scale to the max proportion.
-#
-# However, it is unclear if this is the actual effect. Needs further study.
-#
-# This is because the sum of the Shannon-Weiner Index 
-# is not the same as that of the whole population.
-#
-# Maximising the Shannon-Weiner Index in a group means 
-# minimising the dominance of any category within a feature in that group.
-# It is a small sample size, sensitive to dominance.
-# In contrast, the population is a larger than a sample. 
-# It is much less sensitive to dominance.
-
-### FOR FUTURE USE. NOT USED IN DIVERSEASSIGN.v.1.0.1
-
-def weightModfier(data):
-    # Obtain Shannon-Weiner Index for each column.
-    obtain = calculateDiversity(data, return_shannon_weiner_index = True)
-    ads, swi_dict = obtain[0], obtain[1]
-        
-    # largest proportion of swi in each column of the dataset ADS
-    max_proportion = max(swi_dict.values()) / ads
-    # debug_print('max(swi_dict.values()), ads, max_proportion', (max(swi_dict.values()), ads, max_proportion), debug_flag)
-  
-    # Initialise dict to calculate and store weight for each column
-    weight_column_dict = {}
-    for column, swi in swi_dict.items():
-        if swi == 0: 
-            weight_column_dict[column] = 0
-        else:
-            weight = max_proportion / (swi_dict[column] / ads)
-            weight_column_dict[column] = weight
-            
-    return weight_column_dict
-
-#%% calculateDiversity() function. To calculate a diversity of a dataset.
-# Weights balance the influence of all columns on the Aggregate Diversity Score (ADS)
-
-def calculateDiversity(data, **kwargs):
-    return_shannon_weiner_index = kwargs.get('return_shannon_weiner_index', False)
-    weight_modifier_dict = kwargs.get('weight_modifier_dict', None)
-    shannonEntropyFormula = lambda p_i: -p_i * log(p_i)
-    # If return_shannon_weiner_index is True, 
-    # store and return the Shannon Weiner Index of each column
-    if return_shannon_weiner_index is True:
-        return_swi_flag = True
-        
-        # Intialise dict to store Shannon Weiner Index of each column
-        swi_dict = {}
-        
-    else:
-        return_swi_flag = False
-    
-    # If weight modifiers are present, retrieve the dataset weights.
-    if weight_modifier_dict is None:
-        weight_modifier_dict = {}
-    else:
-        weight_modifier_dict = weight_modifier_dict
-    
-    column_lst = data.columns
-    row_total_count = len(data)
-    total_count_N = row_total_count
-
-    # Calculate Aggregate Diversity Score (ads) of dataset.
-    ads = 0
-    
-    for column in column_lst:
-        column_attribute_count = data.groupby(column).size()
-        column_attribute_len =  len(column_attribute_count)
-        
-        shannon_weiner_index = 0   
-        # shorten Shannon-Weiner Index calculation for columns which have all unique rows
-        if column_attribute_len == row_total_count:
-            p_i = 1 / total_count_N
-            h = shannonEntropyFormula(p_i)
-            h = h  * row_total_count
-            shannon_weiner_index += h
-            
-        elif column_attribute_len != row_total_count:
-            # shorten Shannon-Weiner Index calculation for homogenous column 
-            if column_attribute_len == 1:
-                shannon_weiner_index = 0
-            # calculate Shannon-Weiner Index for non-homogenous column 
-            else:
-                for attribute_row in range(column_attribute_len):
-                    attribute_count_n = column_attribute_count.iloc[attribute_row]
-                    p_i = attribute_count_n / total_count_N
-                    h = shannonEntropyFormula(p_i)
-                    # debug_print("attribute_count_n", attribute_count_n, debug_flag)
-                    # debug_print("total_count_N", total_count_N, debug_flag)
-                    # debug_print("p_i", p_i, debug_flag)
-                    # debug_print("h", h, debug_flag)
-                    shannon_weiner_index += h
-                
-        # debug_print("shannon_weiner_index", shannon_weiner_index, debug_flag)
-        shannon_weiner_index = shannon_weiner_index * weight_modifier_dict.get(column, 1)
-                
-        if return_swi_flag is True:
-            swi_dict[column] = shannon_weiner_index
-        
-        ads += shannon_weiner_index
-    
-    if return_swi_flag is True:
-        # debug_print('column, swi_dict', (column, swi_dict), debug_flag)
-        return ads, swi_dict
-        
-    else:
-        return ads
-    
-#%% Function determines number of instances to run.
-# Heuristic used to determine number of instances 
-# Heuristic is based on the simulated annealing cooling rate
-# and a target annealing probability 
-# based on a reasonable minimum delta diversity to be detected.
-
-def heuristicEstimator(num_rows, num_groups, num_cols, **kwargs):
-    cooling_schedule = kwargs.get('cooling_schedule', 0.95)
-    exhaust_count = comb(num_rows, num_rows // num_groups)
-    
-    # Standard parameter obtained from experiments.
-    # Standard parameter has 5 groups and 6 columns or features
-    # Standard parameter is the scale of known sensitivity response to known ADS
-    standard_ads_size = 5 * 6
-    
-    # Scale of data's ADS
-    data_ads_size = num_groups * num_cols
-    
-    # Relative scale of data's ADS to defined paramater
-    relative_ads_size = data_ads_size / standard_ads_size
-    
-    # Scaling delta diversity sensitivity to relative scale
-    given_delta_diversity = -0.001 / (relative_ads_size)
-    
-    # Target annealing probability at the final simulated annealing iteration
-    target_probability = 0.03 
-    
-    # Heuristic to determine number of instances
-    power_value = log(target_probability)
-    target_temperature = given_delta_diversity / power_value
-    instance_count = log(target_temperature, cooling_schedule)
-    instance_count = ceil(instance_count) # see below note
-    ## The number of instances and target temperature will autoscale with: 
-    ## - target probability
-    ## - relative ADS scale
-    ## - target delta diversity sensitivity
-    ## The instances count refers to the number of iterations for simulated annealing 
-    ## deteremined by the temperature which depends on the target annealing probability
-    ## Standard parameter is the desired ratio of delta diversity to grand sum ADS
-    ## Cooling schedule is fixed at 0.95
-    ## Why scaling: grand sum ADS scales and delta diveristy scales with num_group and num_cols.
-    ## Hence, scaling is required for constant sentivity performance. 
-    
-    # Exhaust_count: Number of assignment combinations if explored exhaustivel
-    # Below is for rare situaitons when the exhaustive number is smaller than the simulated annealing
-    # In this situation, heuristic will prefer using the exhaustive number of iterations.
-    if instance_count > exhaust_count:
-        instance_count = exhaust_count
-    
-    return exhaust_count, instance_count
-    
-#%% heuristicDominanceDetector() function is a heuristic to relax 
-### the no-homogenous-feature-in-any-group constraint.
-### Heuristic will enable relax if an element in the feature is too dominant
-### hence impossible to split the groups without seeing a homogenous feature
-### If too dominant, returns check_homogen_flag = FALSE
-
-def heuristicDominanceDetector(data, num_groups):
-    
-    dominanceHeursitic = lambda row_total_count, attribute_count_n, num_groups: \
-        ((row_total_count - attribute_count_n) // num_groups) <= 0
-    
-    data = data.copy(deep=True)
-    column_lst = data.columns
-    row_total_count = len(data)
-    
-    dominant_flag = False
-    while dominant_flag == False:
-        
-        for column in column_lst:
-            column_attribute_count = data.groupby(column).size()
-            column_attribute_len = len(column_attribute_count)
-    
-            # Skips columns which have all unique rows
-            if column_attribute_len != row_total_count:
-            
-                for attribute_row in range(column_attribute_len):   
-                    attribute_count_n = column_attribute_count.iloc[attribute_row]
-                    
-                    # Dominance heuristic
-                    if dominanceHeursitic(row_total_count, 
-                                          attribute_count_n, 
-                                          num_groups):
-                        dominant_flag = True
-                        break
-                if dominant_flag == True:
-                    break
-            if dominant_flag == True:
-                break           
-        break
-    
-    if dominant_flag == True:
-        check_homogen_flag = False
-        return check_homogen_flag 
-    else:
-        check_homogen_flag = True
-        return check_homogen_flag
-
-#%% assigner() function to assign and swap groups
-
-def assigner(num_groups, num_rows, data, shuffle_flag, **kwargs):
-    weight_modifier_dict = kwargs.get('weight_modifier_dict', None)
-    carried_over_homogen_result = kwargs.get('carried_over_homogen_result', None)
-    algorithm = kwargs.get('algorithm', 'TwoHill')
-    temperature = kwargs.get('temperature', 1.0)
-    mode = kwargs.get('mode', None)
-    
-    #%% Algorithm settings
-    algo_dict = {'TwoHill': (True, True, False),
-                 'SimAnneal': (True, True, False),
-                 'RandomRestart': (False, True, False),
-                 'UnclosedAC3': (False, True, False), 
-                 'Pseudorandom': (False, False, True)}
-    if debug_flag:
-        print()
-        debug_print('algorithm', algorithm, debug_flag)
-    
-    simulated_annealing_flag = algo_dict[algorithm][0]
-    homogen_flag = algo_dict[algorithm][1]
-    randomise_flag = algo_dict[algorithm][2]
-    
-    # If weight modifiers are present, modify the weights of that feature.
-    if weight_modifier_dict is None:
-        None
-    else:
-        weight_modifier_dict
-    
-    #%% Load data
-    
-    data = data.copy(deep=True) 
-    
-    #%% Initialise variables and load them
-    
-    # Detect homogenity
-    if homogen_flag == True:
-        # Check whether there is a result loaded carried over from previous instance
-        if carried_over_homogen_result is not None:
-            check_homogen_flag = carried_over_homogen_result
-            
-        # Else no result from previous instance
-        # Check whether to relax no-homogenous-columns in any group 
-        # if no relax, check_homogen_flag = TRUE
-        else:
-            check_homogen_flag = heuristicDominanceDetector(data, num_groups)
-        
-            # If above TRUE, check whether there 
-            # are no homogenous columns in the entire dataset
-            if check_homogen_flag == False:
-        
-                if 1 in list(data.nunique()):
-                    check_homogen_flag = False
-
-                    if mode == 'MegaTester':
-                        debug_print('list(data.nunique() == 1)', 
-                                    list(data.nunique() == 1), 
-                                    debug_flag)    
-                else:
-                    check_homogen_flag = True
-    
-    # Instead, don't check
-    elif homogen_flag == False:
-        check_homogen_flag = False
-        
-    # Generate sequence of groups.
-    # Used to tell programme which rows to swap groups to increase diversity
-    # Each element in sequence represents a index in data.iterrows()
-    grouping_lst = arange(1, num_groups + 1)
-    
-    # If shuffle_flag == TRUE: Initialise the initial assignment with sequential grouping
-    if shuffle_flag == True:
-        assignment = tile(grouping_lst, num_rows // num_groups + 1)[:num_rows] 
-        data['assigned_group'] = assignment
-    
-    # Hidden Else: start off the initial assignment from the given assignment from previous solution
-    
-    # Initialise dict to store diversity for each group
-    dict_diversity_store = {}
-    for i in grouping_lst:
-        # debug_print("i group", i, debug_flag)
-        subset = data.loc[data['assigned_group'] == i]
-        dict_diversity_store[i] = calculateDiversity(subset, 
-                                                     weight_modifier_dict = weight_modifier_dict)
-    # debug_print("dict_diversity_store", dict_diversity_store, debug_flag)
-
-    initial_diversity = 0
-    for value in dict_diversity_store.values():
-        initial_diversity += value
-    # debug_print("initial diversity", initial_diversity , debug_flag)
-    
-    
-    # If shuffle_flag == TRUE: 
-    # Shuffle the initial assignment to start exploring 
-    # new local search space (or 'tree')
-    if shuffle_flag == True:
-        shuffled_grouping_lst = grouping_lst
-        shuffle(shuffled_grouping_lst)
-        assignment = tile(shuffled_grouping_lst, num_rows // num_groups + 1)[:num_rows] 
-        data['assigned_group'] = assignment
-        if randomise_flag == False and check_homogen_flag == True:
-            # Identify homogenous features in groups before swap
-            # If homogenous, reshuffle, to get a non-homogenous features in groups
-            while True: 
-                escape_flag = True
-                for i in range(1, num_groups + 1):
-                    subset = data.loc[data['assigned_group'] == i]
-                    subset = subset.drop(columns='assigned_group')
-                    if 1 in list(subset.nunique()):    
-                        shuffle(assignment)
-                        data['assigned_group'] = assignment
-                        escape_flag = False
-                        break
-                if escape_flag == False:
-                    continue
-                else:
-                    break
-    # Intermediary check for future debugging
-    # if debug_flag:
-    #     data.to_csv('PreAssignIndexedDataV1_0_1b.csv', index = True)
-        
-    #%% Unclosed AC3 algorithm: Initialise variables for this algorithm
-
-    # Constraint for Unclosed AC3 algorithm: No homogenous column in entire dataset 
-    # Detects whether data has a homogenous column
-    # If there is a 
-    ### For pseudo-random only algorithm, homogen_flag == False
-    ### Assume there is a column homogenous throughout dataset
-    ### Hence bypass the "no homogoenous column constraint" check
-    ### Effectively turns off constraint propagation.
-        
-    # Initialise a set tracker, using set. Used in 'for' loop in data.iterrows(). 
-    # If index has already been swapped, this variable is used to identify the index to skip.
-    previous_index = set()
-    
-    # Initialise a dict: create hashmap to track visited neighbour solution 
-    visited_nodes = {}
-    
-    # Initialise a dict: create hashmap to track whether a potential swap 
-    # has looped back to having any column in either groups homogenous
-    homogen_nodes = {}
-    
-    # Generate a random sequence of indices to pop. 
-    target_lst = [i for i in range(num_rows)]
-    shuffle(target_lst)
-        
-    # Use deque() for the sequence to pop.   
-    target_lst = deque(target_lst)
- 
-    # Deque size
-    target_lst_size = len(target_lst)   
-    
-    # Make a back-up of current data with its assignments
-    backup_group_col = data['assigned_group'].copy(deep=True)
-    
-    #%% Unclosed AC3 algorithm
-    ## Note: Regardless whether constraints are in place, this algorithm will
-    ##       drive the swapping of group assignments
-    
-    while True:
-        # Group assignment, using iterrows() for iteration. 
-        # This 'for' loop drives the swaps. 
-        # If check_homogen_flag == True, constraint is propagated
-        
-        # Initialise restart flag. Used with homogenous features detected in a group
-        restart_flag = False
-        
-        for index, i in data.iterrows():
-            # debug_print("index undergoing assignment", index, debug_flag)
-            
-            # 'assign_i' is the index iterrows()
-            assign_i = data.at[index, 'assigned_group']
-            subset_i = data.loc[data['assigned_group'] == assign_i].copy(deep=True)
-            
-            # Create index iterrows() as key in visited_nodes hashmap
-            # Tracks index target_lst visited by index iterrows()
-            visited_nodes[index] = set()
-            
-            #%% Constraint propagation.
-            
-            # Create index iterrows() as key in homogen_nodes hashmap
-            # Tracks index target_lst visited by index iterrows() that
-            # resulted in homogenous rows
-            homogen_nodes[index] = set()
-            
-            #%% Swap
-            
-            # This 'while' loop drives the swapping and constraint propagation
-            while target_lst_size > 1:
-
-                # Begin restart, because restart flag detected
-                if restart_flag == True:
-                    break
-                
-                # Update deque size
-                target_lst_size = len(target_lst)
-                # debug_print("deque size", target_lst_size, debug_flag)
-                
-                # pointer is the index target_lst to swap with index iterrows()
-                pointer = target_lst.popleft()
-                
-                # If the index target_lst has already swapped, skip swapping
-                if index in previous_index: 
-                    # debug_print("previous_index", previous_index, debug_flag)
-                    
-                    # Exit 'while' loop driving swap at this index iterrows()
-                    break
-                
-                # If the deque pointer has already been visited, stop swapping
-                # Because this means we have cycled through the deque and couldn't make a swap
-                visited_check = visited_nodes.get(index, None)
-                # debug_print("visited_check", visited_check, debug_flag)
-                
-                if visited_check is not None: 
-                    if pointer in visited_check:
-                        # debug_print("index", index, debug_flag)
-                        # debug_print("pointer", pointer, debug_flag)
-                        # debug_print("visited_check", visited_check, debug_flag)
-                        # debug_print("target_lst_size visited", target_lst_size, debug_flag)
-                        
-                        # Exit 'while' loop driving swap at this index iterrows()
-                        break
-                    else:
-                        # Move pointer to end of deque
-                        target_lst.append(pointer)
-                        visited_nodes[index].add(pointer)
-        
-                # 'assign_j' is the index target_lst
-                assign_j = data.at[pointer, 'assigned_group']
-                
-                # Prevent self-swapping or row swapping within the same group 
-                # Then move the pointer's value to the end of the deque
-                # Then re-try using the first element in the deque as the new pointer
-                if pointer == index or assign_i == assign_j:
-                    previous_index.add(index)
-                    previous_index.add(pointer)
-                    
-                    # Move pointer to end of deque
-                    target_lst.append(pointer)
-                    visited_nodes[index].add(pointer)
-                    
-                    # Re-try 'while' loop driving swap at this index iterrows()
-                    # Try to find another swap
-                    continue
-    
-                else:    
-                    # take snapshots of assignment and group-level diversity before swap
-                    snapshot_i = assign_i.copy()
-                    snapshot_j = assign_j.copy()
-                    # debug_print("assign_i", assign_i, debug_flag)
-                    # debug_print("assign_j", assign_j, debug_flag)
-                    # debug_print("snapshot_i", snapshot_i, debug_flag)
-                    # debug_print("snapshot_j", snapshot_j, debug_flag)
-                    
-                    # Snapshot previous diversity of the 2 groups. 
-                    # (Before the 2 groups had a row swapped)
-                    
-                    subset_j = data.loc[data['assigned_group'] == assign_j].copy(deep=True)
-                    
-                    snapshot_diversity_i = calculateDiversity(subset_i, 
-                                                              weight_modifier_dict = weight_modifier_dict)
-                    snapshot_diversity_j = calculateDiversity(subset_j, 
-                                                              weight_modifier_dict = weight_modifier_dict)
-                    
-                    # Swap group assignments
-                    data.at[index, 'assigned_group'] = snapshot_j
-                    data.at[pointer, 'assigned_group'] = snapshot_i     
-                    subset_i = data.loc[data['assigned_group'] == assign_i].copy(deep=True)
-                    subset_j = data.loc[data['assigned_group'] == assign_j].copy(deep=True)
-    
-                    # Prevent groups with homogenous columns from forming
-                    # (if dataset has no homogenous columns).
-                    # If dataset has no homogenous columns
-                    # and 
-                    # if dataset makes any column in either groups 
-                    # to be homogenous
-                    # re-try another swap.
-                    ### check_homogen_flag == False will effectively turns off 
-                    ### constraint propagation 
-                    
-                    #%% Constraint propagation.
-                    
-                    # If the deque pointer has looped back to 
-                    # creating homogenous columns, stop swapping.
-                    # Because this means all of the remaining elements of the deque
-                    # will create homogenous columns for this index iterrows()
-                    homogen_check = homogen_nodes.get(index, None)
-                    # debug_print("homogen_check", homogen_check, debug_flag)
-                                
-                    if homogen_check is not None: 
-                        if pointer in homogen_check:
-                            # debug_print("index", index, debug_flag)
-                            # debug_print("pointer", pointer, debug_flag)
-                            # debug_print("homogen_check", homogen_check, debug_flag)
-                            # debug_print("target_lst_size visited", target_lst_size, debug_flag)
-                            
-                            # Homogenous features detected in a group. Begin restart process
-                            # Revert all assginments to backup and restart assignments
-                            data['assigned_group'] = backup_group_col
-                            target_lst = [i for i in range(num_rows)]
-                            shuffle(target_lst)
-                            target_lst = deque(target_lst)
-                            restart_flag = True
-                            continue
-                    
-                    if check_homogen_flag == True:
-                        
-                        # Identify homogenous columns after swaps
-                        homogen_check_1 = list(subset_i.drop(columns = 'assigned_group').nunique())
-                        homogen_check_2 = list(subset_j.drop(columns = 'assigned_group').nunique())
-                        if 1 in homogen_check_1 or 1 in homogen_check_2:
-                            # debug_print("homogen_check_1", homogen_check_1, debug_flag)
-                            # debug_print("homogen_check_2", homogen_check_2, debug_flag)
-                            # revert the swap to snapshots
-                            data.at[index, 'assigned_group'] = snapshot_i
-                            data.at[pointer, 'assigned_group'] = snapshot_j
-                            
-                            # Move pointer to end of deque
-                            target_lst.append(pointer)
-                            homogen_nodes[index].add(pointer)
-                            # debug_print("homogen found: index:", index, debug_flag)
-                            # debug_print("homogen found: pointer:", pointer, debug_flag)
-                            # debug_print("homogen_check:", homogen_check, debug_flag)
-                            # debug_print("homogen_nodes:", homogen_nodes, debug_flag)
-                            
-                            # Re-try 'while' loop driving swap at this index iterrows()
-                            # Try to find another swap
-                            continue
-                    
-                    elif check_homogen_flag == False:
-                        pass # do nothing
-                    
-                    #%% Proceeding on with the swap
-                    
-                    # Calculate the change in diversity
-                    pair_snapshot_diversity = snapshot_diversity_i + snapshot_diversity_j 
-                    
-                    dict_diversity_store[assign_i] = calculateDiversity(subset_i, 
-                                                                        weight_modifier_dict = weight_modifier_dict)
-                    dict_diversity_store[assign_j] = calculateDiversity(subset_j, 
-                                                                        weight_modifier_dict = weight_modifier_dict)
-                    pair_swapped_diversity = dict_diversity_store[assign_i] + dict_diversity_store[assign_j]
-                    
-                    delta_diversity = pair_swapped_diversity - pair_snapshot_diversity
-                    # debug_print("delta_diversity", delta_diversity, debug_flag)
-                    
-                    #%% UnclosedAC- and Pseudorandom- specific code
-                    
-                    ## Enable for UnclosedAC and Pseudorandom
-                    ## After homogenous check (if any), enabling randomise_flag 
-                    ## disables delta_diversity consideration
-                    ## since all swaps are accepted in these algorith,
-                    ## regardless of delta diversity
-                    if randomise_flag == True:
-                        # accept whatever swap (after finishng through homogenous check (if any))
-                        previous_index.add(index)
-                        previous_index.add(pointer)
-                        
-                        # Exit 'while' loop driving swap at this index iterrows()
-                        break
-        
-                    #%% If not randomised, evaluate delta diversity
-                            
-                    #%% Simulated annealing 
-                            
-                    else:
-                        if delta_diversity > 0:
-                            # Based on probability, explore alternative solutions
-                            # Probability to
-                            # reject the swap (ignore pointer swap target)
-                            # or 
-                            # accept the swap 
-        
-                            if simulated_annealing_flag == True:
-                                # debug_print("Simu anneal present", "Simu anneal present", debug_flag)
-                                probability = uniform(0,1)
-                                threshold = exp(-delta_diversity / temperature)
-                                # debug_print("probability", probability, debug_flag)
-                                # debug_print("threshold", threshold, debug_flag)
-    
-                                            
-                                # Probability to reject swap
-                                if probability < threshold:
-                                    # debug_print("delta increased, reject, revert", probability, debug_flag)
-                                    
-                                    # revert the swap to snapshots
-                                    data.at[index, 'assigned_group'] = snapshot_i
-                                    data.at[pointer, 'assigned_group'] = snapshot_j
-                                    dict_diversity_store[assign_i] = snapshot_diversity_i
-                                    dict_diversity_store[assign_j] = snapshot_diversity_j
-                                    
-                                    # Move pointer to end of deque
-                                    target_lst.append(pointer)
-                                    # if debug_flag:
-                                    #     target_lst_size = len(target_lst)
-                                    #     debug_print("deque size", target_lst_size, debug_flag)
-                                    
-                                    # Exit 'while' loop driving swap at this index iterrows()
-                                    break
-                                
-                                # Probability to accept swap
-                                else:
-                                    # debug_print("accept", probability, debug_flag)
-                                    
-                                    # accept swap 
-                                    previous_index.add(index)
-                                    previous_index.add(pointer)
-                                    
-                                    # Exit 'while' loop driving swap at this index iterrows()
-                                    break
-                                
-                            #%% Don't use simulated annealing if delta_diversity > 0
-                            # If simulated annealing disabled, always swap if increased diversity
-                            
-                            else: 
-                                # debug_print("No simulated annealing", "No simulated annealing", debug_flag)
-                                
-                                # accept swap 
-                                previous_index.add(index)
-                                previous_index.add(pointer)
-                                
-                                # Exit 'while' loop driving swap at this index iterrows()
-                                break
-                            
-                        #%% Else, given delta_diversity <= 0
-                        
-                        else:
-                            # revert the swap to snapshots
-                            data.at[index, 'assigned_group'] = snapshot_i
-                            data.at[pointer, 'assigned_group'] = snapshot_j
-                            dict_diversity_store[assign_i] = snapshot_diversity_i
-                            dict_diversity_store[assign_j] = snapshot_diversity_j
-                            # if debug_flag:
-                            #     target_lst_size = len(target_lst)
-                            #     debug_print("deque size", target_lst_size, debug_flag)
-                            
-                            # Move pointer to end of deque
-                            target_lst.append(pointer)
-                            visited_nodes[index].add(pointer)
-                            
-                            #%% Use simulated annealing
-                            # If swapping index and pointer decreased diversity 
-                            # then based on probability
-                            # try finding another solution leading to increased diversity
-                            # or 
-                            # reject the swap 
-                            
-                            if simulated_annealing_flag == True:
-                                # debug_print("Simu anneal present", "Simu anneal present", debug_flag)
-                                probability = uniform(0,1)
-                                if delta_diversity < 0:
-                                    threshold = exp(delta_diversity / temperature)
-                                    # Probability to re-try finding a swap
-                                    if probability < threshold:  
-                                        continue
-                                # reject swapping
-                                # Exit 'while' loop driving swap at this index iterrows()
-                                    else:
-                                        break
-                                # ln(exp (0)) is always probability == 0
-                                elif delta_diversity == 0:
-                                    # reject swapping
-                                    
-                                    # Exit 'while' loop driving swap at this index iterrows()
-                                    break    
-                                
-                            #%% Don't use simulated annealing if delta_diversity <= 0
-                            # If simulated annealing disabled, 
-                            # always reject if decreased or same diversity
-                            else:
-                                # debug_print("No simulated annealing", "No simulated annealing", debug_flag)
-                                # since simulated annealing disabled, reject swapping
-                                
-                                # Exit 'while' loop driving swap at this index iterrows()
-                                break    
-        
-        # Homogenous features detected in a group. Passing restart flag to restart    
-        if restart_flag == True:
-            continue
-      
-        # Break from restart loop
-        else: 
-            break
-        
-    #%% Calculate grand final diversity 
-    
-    final_diversity = 0
-    dict_diversity_store = {}
-    for group_number in grouping_lst:
-        # debug_print("group number", group_number, debug_flag)
-        subset = data.loc[data['assigned_group'] == group_number]
-        dict_diversity_store[group_number] = calculateDiversity(subset, 
-                                                                weight_modifier_dict = weight_modifier_dict)
-    
-    for value in dict_diversity_store.values():
-        final_diversity += value
-    
-    # debug_print('final_diversity', final_diversity, debug_flag)
-    
-    # Intermediary check for future debugging
-    # if debug_flag:
-    #     data.to_csv("AssignerOutputV1_0_1b.csv")
-    
-    
-    return data, initial_diversity, final_diversity, check_homogen_flag
-
-
-#%% Function to iterate assignments over specified instance counts
-
-def iterator(writerMethod, mega_num, instance_count, num_groups, num_rows, data, **kwargs):
-    weight_modifier_dict = kwargs.get('weight_modifier_dict', None)
-    cooling_schedule = kwargs.get('cooling_schedule', 0.95)
-    algorithm = kwargs.get('algorithm', 'TwoHill')
-    force_plateau_action_flag = kwargs.get('force_plateau_action_flag', None)
-    verbosity = kwargs.get('verbosity', 2)
-    mode = kwargs.get('mode', None)
-    
-    debug_print('cooling_schedule', cooling_schedule, debug_flag)
-    
-    #%% Algorithm settings
-    
-    algo_dict = {'TwoHill': (False, True, True),
-                 'SimAnneal': (False, True, True),
-                 'RandomRestart': (False, True, True),
-                 'UnclosedAC3': (True, False, False), 
-                 'Pseudorandom': (True, False, False)}
-    
-    randomise_flag = algo_dict[algorithm][0]
-    carry_over_flag = algo_dict[algorithm][1]
-    plateau_action_flag = algo_dict[algorithm][2]
-    
-    # User specification to ovewrite plateau capping
-    if force_plateau_action_flag == True:
-        plateau_action_flag = True
-    elif force_plateau_action_flag == False:
-        plateau_action_flag = False
-
-    # If weight modifiers are present, modify the weights of that feature.
-    if weight_modifier_dict is None:
-        None
-    else:
-        weight_modifier_dict    
-
-    #%% Print opening message of iterator() function
-    
-    print()
-    print("Work progress:")
-    print()
-    
-    #%% Load data
-    data = data.copy(deep=True) 
-    
-    #%% Initialise variables to store outputs from assignments
-    
-    better_solution = None
-    best_solution = None
-    current_solution = None
-    baseline_initial_diversity = None
-    initial_diversity = None
-    final_diversity = None
-    better_diversity = None
-    best_diversity = None
-    cache_final_diversity_deque = deque([0])
-    shuffle_flag = False
-    picked_solution = 0
-    elapsed = 0
-    
-    #%% Initialise deque to support plateau detection
-    cache_final_diversity_deque = [0]
-    cache_final_diversity_deque = deque(cache_final_diversity_deque)
-    
-    #%% Initialise TESTER use only flags for reporting
-    group_homogen_flag = None
-    best_diversity_flag = None
-    
-    #%% Initialise signals
-    plateau_detected_signal = None
-    
-    #%% Intialise settings to control number of instances
-    ### and for temperature for simulated annealing 
-    ### Note: for all algorithms, the number instances is controlled by 
-    ###       a common math function of temperature.
-    ###       Whether there is any simulated annealing in any algorithm, 
-    ###       that is separately controlled by the 'threshold' in the assigner() function.
-    
-    # Initialise the cooling schedule for simulated annealing
-    cooling_schedule = cooling_schedule    
-    # Define the initial temperature for simulated annealing
-    temperature = 1.0     
-    # Target temperature
-    target = cooling_schedule ** instance_count
-    # Initialise the progress tracker variable for reporting to screen
-    cache_progress = 0
-    # Initialise the solution number tracker
-    solution_number = 0
-
-    #%% Run assignment until target instances
-    
-    while temperature > target:        
-        solution_number  += 1    
-        # debug_print('solution_number ', solution_number , debug_flag)
-        
-        #%% Start stopwatch
-        
-        if solution_number == 1:
-            stopwatch = Stopwatch()
-            stopwatch.start()
-            
-        #%% Update temperature
-        
-        # Update temperature
-        temperature = temperature * cooling_schedule
-        # debug_print("temperature", temperature, debug_flag)
-        
-        #%% Update progress reporting, synced to temperature
-        if verbosity == 2:
-            print()
-            print(f"Working on Solution Number {solution_number:,} of {instance_count:,} now...")
-            
-            # Print the progress
-            progress = solution_number / instance_count * 100
-            
-            if progress < 10:   
-                print_interval_modulo = 1    
-            elif 10 <= progress < 20:
-                print_interval_modulo = 1
-            elif 20 <= progress < 50:
-                print_interval_modulo = 1
-            else:
-                print_interval_modulo = 1
-        
-        elif verbosity == 1:
-            # Print the progress
-            progress = solution_number / instance_count * 100
-            
-            if progress < 10:   
-                print_interval_modulo = 1    
-            elif 10 <= progress < 20:
-                print_interval_modulo = 5
-            elif 20 <= progress < 50:
-                print_interval_modulo = 10
-            else:
-                print_interval_modulo = 20
-                
-        stepped_progress = progress - (progress % (-print_interval_modulo))    
-    
-        if cache_progress < stepped_progress:
-            if verbosity == 2:
-                # Print progress according to print interval
-                print(f"Progress: {cache_progress:.0f}%")
-            
-            elif verbosity == 1:
-                # Print progress according to print interval
-                if cache_progress < stepped_progress:
-                    # For Solution 1, print progress without time estimate
-                    if solution_number == 1:
-                        print(f"Progress: {cache_progress:.0f}%")
-                    # For remaining solutions, print progress along with time estimate
-                    else:   
-                        print(f"Progress: {cache_progress:.0f}% (Time left: {minutes_estimate:.0f} min {seconds_estimate:.0f} s)")
-            
-            cache_progress = stepped_progress
-        
-        # debug_print("final_diversity", final_diversity, debug_flag)
-        # debug_print("temperature", temperature, debug_flag)
-        # debug_print("Progress percentage of current solution:", (1 - temperature), debug_flag)
-
-        #%% Run assignment: if this is first assignment, do this
-
-        # If solution none, this assignment output is best solution
-        # Else, take the best solution, then run the assignment again
-        if best_solution is None:
-           output_1 = assigner(num_groups, 
-                                num_rows, 
-                                data, 
-                                True, 
-                                algorithm = algorithm,
-                                weight_modifier_dict = weight_modifier_dict,
-                                temperature = temperature)
-           
-           current_solution = output_1[0].copy(deep=True)
-           better_solution = output_1[0].copy(deep=True)
-           best_solution = output_1[0].copy(deep=True)
-            
-           # Baseline initial diversity is when we start with sequential grouping
-           baseline_initial_diversity = output_1[1]
-           
-           initial_diversity = output_1[1]
-           final_diversity = output_1[2]
-           better_diversity = output_1[2]
-           best_diversity = output_1[2]
-           check_homogen_flag = output_1[3]
-           cache_final_diversity_deque.append(final_diversity)
-           picked_solution = 1   
-           # debug_print("starting calcuateDiversity(best_solution, weight_modifier_dict = weight_modifier_dict)", 
-           #             calculateDiversity(best_solution, 
-           #                                weight_modifier_dict), 
-           #             debug_flag)
-           
-           # For TESTER reporting only
-           if best_diversity > initial_diversity:
-               best_diversity_flag = 'Y'
-               
-        #%% Run assignment: if this is subsequent assignment, consider whether to 
-        ### carry over assignment output to next assigner() instance
-        
-        # If there is a solution then
-        else:
-          
-            #%% Code to cut-off a plateau and random-restart 
-            
-            ### Detect plateau before flagging maxima
-            ### if the same better_diversity score obtained 
-            ### in specified number of times immediately in sequence
-            
-            if plateau_action_flag == True:
-                if plateau_detected_signal == True:
-                    # Shuffle assignment means instead of 
-                    # starting from the better assignment
-                    # We re-try a different search space, to look for any 
-                    # higher hill-maximum areas
-                    # Set shuffle_flag to TRUE to enable shuffling
-                    if carry_over_flag  == True:
-                        shuffle_flag = True  
-                    else:
-                        shuffle_flag = False
-                        
-                # Since plateau_detected_signal != True
-                else:
-                    if carry_over_flag  == True:
-                        shuffle_flag = False  
-                    else:
-                        shuffle_flag = True
-                    
-            # Do this given plateau detection disabled:
-            else:
-                if carry_over_flag  == True:
-                    shuffle_flag = False
-                else:
-                    shuffle_flag = True
-            
-            # For alogrithms that randomise the starting assignment at all instances
-            if randomise_flag == True:
-                ### UnclosedAC3 and Pseudo-random algo: Regardless of delta_diversity 
-                ### Shuffle assignment                  
-                shuffle_flag = True
-                
-            #%% Run the next assigner()
-            
-            output_2 = assigner(num_groups, 
-                                num_rows, 
-                                better_solution, 
-                                shuffle_flag, 
-                                algorithm = algorithm,
-                                carried_over_homogen_result = check_homogen_flag, 
-                                weight_modifier_dict = weight_modifier_dict,
-                                temperature = temperature)
-            
-            current_solution = output_2[0].copy(deep=True)
-            initial_diversity = output_2[1]
-            final_diversity = output_2[2]
-            check_homogen_flag = output_2[3]
-            cache_final_diversity_deque.append(final_diversity)
-            # debug_print("initial_diversity", initial_diversity, debug_flag)
-            # debug_print("final_diversity", final_diversity, debug_flag)
-            # debug_print("better_diversity", better_diversity, debug_flag) 
-            # if debug_flag:
-            #     if final_diversity < initial_diversity:    
-            #         debug_print("final_diversity - better_diversity", final_diversity - better_diversity, debug_flag) 
-
-            #%% Code to generate plateau_detected_signal
-            ### After assigner() iteration complete, signal to 
-            ### cut-off plateau and random-restart code
-            
-            cache_deque_length = len(cache_final_diversity_deque)
-            plateau_detected_signal = False
-            
-            if cache_deque_length == num_groups: 
-                check_cache_deque = cache_final_diversity_deque.pop()
-                # debug_print("final_diversity", final_diversity, debug_flag)
-                
-                if check_cache_deque == better_diversity:
-                    best_repeats_count = 1
-                    for i in cache_final_diversity_deque:
-                        if i == better_diversity:
-                            best_repeats_count += 1
-                    if best_repeats_count == num_groups:
-                        plateau_detected_signal = True
-                        if verbosity == 2:
-                            print('Diversity score has reached plateau.')
-                
-                # return back the element because inspection completed
-                cache_final_diversity_deque.append(check_cache_deque)
-                # popleft() to keep cache_deque_length within specified size
-                cache_final_diversity_deque.popleft()
-                    
-            #%% Code to select whether an assigner() output gets carried over to next iteration. 
-            ### Also code to report flags in TESTER output
-
-            if final_diversity > better_diversity: 
-                better_solution = current_solution.copy(deep=True)
-                better_diversity = final_diversity
-                best_diversity_flag = 'Y'
-                # debug_print("if final_diversity > better_diversity", (final_diversity, better_diversity), debug_flag)
-            
-            if better_diversity > best_diversity:
-                best_solution = better_solution.copy(deep=True)
-                best_diversity = better_diversity
-                picked_solution = solution_number
-                best_diversity_flag = 'Y'
-                # debug_print("if better_diversity > best_diversity", (better_diversity, best_diversity), debug_flag)
-                # debug_print("final_diversity > initial_diversity", (final_diversity, initial_diversity), debug_flag)
-            
-            if final_diversity == better_diversity or (better_diversity == best_diversity):
-                best_diversity_flag = 'Y'
-                
-                
-            if final_diversity < best_diversity:
-                best_diversity_flag = 'N'
-    
-            # debug_print("now calcuateDiversity(best_solution, weight_modifier_dict)", 
-            #             calculateDiversity(best_solution, 
-            #                                weight_modifier_dict), 
-            #             debug_flag)
-            
-        #%% Code to stop stopwatch and report progress
-            
-        if solution_number == 1:
-            stopwatch.stop()
-            elapsed_clock = stopwatch.elapsed_time()
-        
-        if solution_number >= 1:
-            solutions_left = instance_count - solution_number
-            elapsed = solutions_left * elapsed_clock
-        
-            minutes_estimate = elapsed // 60
-            seconds_estimate = elapsed % 60
-        
-        if verbosity == 2:
-            print()
-            print(f"Solution Number {solution_number:,}'s initial diversity score was {initial_diversity}")
-            print(f"Solution Number {solution_number:,}'s final diversity score was {final_diversity}")  
-            print()
-            print(f"The baseline initial diversity score was {baseline_initial_diversity}")
-            print(f"The best solution now is Solution Number {picked_solution:,}. The best diversity score achieved was {best_diversity}")
-            
-            if solution_number == 1:
-                message_str = f": {minutes_estimate:.0f} min {seconds_estimate:.0f} s"
-                print()
-                print("Estimated time to complete" + message_str) 
-            
-            elif solution_number > 1:
-                message_str = f": {minutes_estimate:.0f} min {seconds_estimate:.0f} s"
-                print()
-                print("Time left" + message_str) 
-    
-        # debug_print("Picked solution number", picked_solution, True)
-        # debug_print("Picked best_diversity", best_diversity, True)
-
-        #%% For TESTER use only. To report whether there is a homogenous feature in a group 
-
-        # Detect prescence of homogenous feature in a group 
-        subset_homogen_dict= {}    
-        for i in range(1, num_groups + 1):
-            subset = best_solution.loc[best_solution['assigned_group'] == i]
-            subset = subset.drop(columns='assigned_group')
-            if 1 in list(subset.nunique()):
-                # debug_print("if 1 in list(subset.nunique()):", list(subset.nunique()), debug_flag)
-                subset_homogen_dict[i] = 'Y'
-       
-        if 'Y' in subset_homogen_dict.values():
-            group_homogen_flag = 'Y'
-        else:
-            group_homogen_flag = 'N'      
-        
-        #%% TESTER use only: write report to CSV
-        if mode == 'MegaTester':        
-            data_to_write = [mega_num, solution_number, initial_diversity, final_diversity, best_diversity_flag, plateau_detected_signal, group_homogen_flag]    
-            print()
-            print(f"{data_to_write} ****************************" )
-            writerMethod.writerow(data_to_write)
-        
-    #%% End iterator() and return outputs
-        
-    print("Progress: 100%")    
-  
-    best_solution = best_solution.copy(deep=True)
-    return picked_solution, best_solution, best_diversity
-
-#%% class Stopwatch 
-
-# Stopwatch program. Used in estimating compute time. Credit: Mostly AI-generated
-class Stopwatch:
-    def __init__(self):
-        self.start_time = None
-        self.end_time = None
-
-    def start(self):
-        self.start_time = perf_counter()
-
-    def stop(self):
-        self.end_time = perf_counter()
-
-    def elapsed_time(self):
-        estimator_modifier = 1.1 # slight modifier to over-estimate time. Better to over than under estimate.
-        elapsed_seconds = (self.end_time - self.start_time) * estimator_modifier
-        
-        return elapsed_seconds   
+megatester_csv_headers = ['mega_instance', 
+                          'instance_number', 
+                          'initial_diversity', 
+                          'final_diversity', 
+                          'best_diversity_flag',
+                          'plateau_detected_signal',
+                          'group_homogen_flag']
 
 #%% Iterate (sample counts of) iterator (1 full run of algorithm) 
 ### Extra: When set to MEGATESTER, writes and saves a report 
@@ -1203,6 +95,9 @@ def megaIterator(mega_instance, num_groups, data, filename_out, **kwargs):
     force_plateau_action_flag = kwargs.get('force_plateau_action_flag', True)
     verbosity = kwargs.get('verbosity', 2)
     mode = kwargs.get('mode', None)
+    partner_search = kwargs.get('partner_search', 'Deque')
+    num_workers = kwargs.get('num_workers', 1)
+    random_seed = kwargs.get('seed', None)
     
     #%% Intialise parameters
     
@@ -1262,11 +157,15 @@ def megaIterator(mega_instance, num_groups, data, filename_out, **kwargs):
         
     def messageProductionClosing(verbosity: int, best_solution):
         
+        if run_control.summary['stop_reason'] == 'stopped':
+            print()
+            print("Group assignment stopped early. The best solution so far is kept.")
+        
         if verbosity == 2:    
             print()
             print("Group assignment completed.")
             print()
-            print(f"{instance_count:,} number of solutions completed. The best solution picked is Solution Number {picked_solution:,}. The best diversity score achieved was {best_diversity:.3f}")            
+            print(f"{run_control.summary['solution_number']:,} number of solutions completed. The best solution picked is Solution Number {picked_solution:,}. The best diversity score achieved was {best_diversity:.3f}")            
             
         elif verbosity == 1:
             print()
@@ -1312,13 +211,7 @@ def megaIterator(mega_instance, num_groups, data, filename_out, **kwargs):
     #%% Define the CSV file name and headers
     # FOR MEGATESTER ONLY
     csv_file = filename_out
-    csv_headers = ['mega_instance', 
-                   'instance_number', 
-                   'initial_diversity', 
-                   'final_diversity', 
-                   'best_diversity_flag',
-                   'plateau_detected_signal',
-                   'group_homogen_flag']    
+    csv_headers = megatester_csv_headers
     
     #%% Drive functions
     
@@ -1339,6 +232,9 @@ def megaIterator(mega_instance, num_groups, data, filename_out, **kwargs):
             # Write the headers to the CSV file
             writerMethod.writerow(csv_headers)    
             
+            # Each run has its own random numbers, spawned from seed. See RandomStream
+            mega_seed_lst = RandomStream(random_seed).spawn(mega_instance)
+            
             # Run (sample counts of) times the iterator (1 full run of algorithm)
             for mega_num in range(1, mega_instance + 1): 
                 outputs = iterator(writerMethod, 
@@ -1351,29 +247,217 @@ def megaIterator(mega_instance, num_groups, data, filename_out, **kwargs):
                                    weight_modifier_dict = weight_modifier_dict,
                                    cooling_schedule = cooling_schedule, 
                                    force_plateau_action_flag = force_plateau_action_flag,
-                                   mode = mode)
+                                   mode = mode,
+                                   partner_search = partner_search, 
+                                   random_stream = RandomStream(mega_seed_lst[mega_num - 1]))
                     
                 picked_solution, best_solution, best_diversity = outputs
         
         messageTesterClosing()
     
+    # Run programme in production mode, with restarts in parallel
+    # Ctrl-C stops the search, and goes on to save the best solution so far
+    elif num_workers is None or num_workers > 1:
+        run_control = RunControl()
+        with stopOnSignals(run_control):
+            outputs = parallelIterator(instance_count, 
+                                       num_groups, 
+                                       num_rows, 
+                                       data, 
+                                       weight_modifier_dict = weight_modifier_dict, 
+                                       verbosity = verbosity,
+                                       partner_search = partner_search, 
+                                       num_workers = num_workers, 
+                                       run_control = run_control, 
+                                       seed = random_seed)
+        
+        picked_solution, best_solution, best_diversity = outputs
+                
+        messageProductionClosing(verbosity, best_solution)
+    
     else:
         # Run programme in production mode    
+        # Ctrl-C stops the search, and goes on to save the best solution so far
         writerMethod = None
-        outputs = iterator(writerMethod, 
-                           1, 
-                           instance_count, 
-                           num_groups, 
-                           num_rows, 
-                           data, 
-                           weight_modifier_dict = weight_modifier_dict, 
-                           verbosity = verbosity)
+        run_control = RunControl()
+        with stopOnSignals(run_control):
+            outputs = iterator(writerMethod, 
+                               1, 
+                               instance_count, 
+                               num_groups, 
+                               num_rows, 
+                               data, 
+                               weight_modifier_dict = weight_modifier_dict, 
+                               verbosity = verbosity,
+                               partner_search = partner_search, 
+                               run_control = run_control, 
+                               seed = random_seed)
             
         picked_solution, best_solution, best_diversity = outputs
                 
         messageProductionClosing(verbosity, best_solution)
 
 
+#%% Parallel MegaTester experiment runner
+### Runs a grid of MegaTester experiments: 
+### algorithm x group_size x sample x plateau cap, each repeated mega_instance times. 
+### Every (experiment, mega_num) cell is a full run of iterator() in its own worker process.
+###
+### Each cell writes its rows to its own CSV, in a folder next to the experiment's CSV. 
+### The experiment's CSV is put together from its cells, once all of them are done.
+### With resume_flag == True, cells already done (e.g. by an interrupted run) are not run again.
+###
+### initialiser and plateau_action are the same in every cell. Default: 'Shuffle' and 'Restart', 
+### the search before the greedy start and Kernighan-Lin refinement, so that the results compare 
+### with earlier experiments. See solve() in diverse_assign for the settings
+
+# File name of an experiment's CSV. 
+# An initialiser or plateau action other than the default is added to the name, 
+# so that cells of other settings are not taken as done
+def megaTesterFilename(algorithm, mega_instance, group_size, sample_name, force_plateau_action_flag, **kwargs):
+    initialiser = kwargs.get('initialiser', 'Shuffle')
+    plateau_action = kwargs.get('plateau_action', 'Restart')
+    
+    if force_plateau_action_flag == True:
+        plateau_status = "cap"
+    else:
+        plateau_status = "no_cap"
+    
+    setting_status = ''
+    if initialiser != 'Shuffle':
+        setting_status += '_' + initialiser
+    if plateau_action != 'Restart':
+        setting_status += '_' + plateau_action
+    
+    return algorithm + '_' + str(mega_instance) + 'iter_' + str(group_size) + 'size_' + sample_name +  '_' + plateau_status + setting_status + '.csv'
+
+# File name of a cell's CSV
+def megaTesterCellFilename(filename_out, mega_num):
+    cell_folder = os.path.splitext(filename_out)[0] + '_cells'
+    return os.path.join(cell_folder, 'mega_' + str(mega_num) + '.csv')
+
+def megaTesterWorker(input_filename, group_size, algorithm, force_plateau_action_flag, cooling_schedule, initialiser, plateau_action, mega_num, cell_filename, cell_seed):
+    data = loadCsv(input_filename)
+    num_rows = len(data)
+    num_groups = num_rows // group_size
+    _, instance_count = heuristicEstimator(num_rows, num_groups, len(data.columns))
+    
+    # Write to a temporary file first. A cell's CSV only exists once the cell is done
+    temp_filename = cell_filename + '.tmp'
+    with open(temp_filename, 'w', newline='') as file:
+        writerMethod = csv.writer(file)
+        iterator(writerMethod, 
+                 mega_num, 
+                 instance_count, 
+                 num_groups, 
+                 num_rows, 
+                 data, 
+                 algorithm = algorithm, 
+                 cooling_schedule = cooling_schedule, 
+                 force_plateau_action_flag = force_plateau_action_flag,
+                 initialiser = initialiser, 
+                 plateau_action = plateau_action, 
+                 verbosity = 0,
+                 mode = 'MegaTester', 
+                 random_stream = RandomStream(cell_seed))
+    
+    os.replace(temp_filename, cell_filename)
+    return cell_filename
+
+def megaTesterGrid(algorithm_lst, group_size_lst, sample_name_lst, force_plateau_action_lst, mega_instance, **kwargs):
+    cooling_schedule = kwargs.get('cooling_schedule', 0.95)
+    initialiser = kwargs.get('initialiser', 'Shuffle')
+    plateau_action = kwargs.get('plateau_action', 'Restart')
+    num_workers = kwargs.get('num_workers', None)
+    resume_flag = kwargs.get('resume_flag', True)
+    random_seed = kwargs.get('seed', None)
+    sample_dict = kwargs.get('sample_dict', {'1x': "sample_input_b.csv", 
+                                             '2x': "sample_input_doubled_b.csv"})
+    
+    #%% List the experiments and the cells still to run
+    
+    experiment_dict = {}
+    cell_lst = []
+    
+    # Seed of each cell: (experiment, mega_num) spawned from seed. See RandomStream
+    # Each cell keeps its seed whichever cells are already done, and whichever process runs it
+    for algorithm in algorithm_lst:
+        for sample_name in sample_name_lst:
+            for group_size in group_size_lst:
+                for force_plateau_action_flag in force_plateau_action_lst:
+                    filename_out = megaTesterFilename(algorithm, 
+                                                      mega_instance, 
+                                                      group_size, 
+                                                      sample_name, 
+                                                      force_plateau_action_flag, 
+                                                      initialiser = initialiser, 
+                                                      plateau_action = plateau_action)
+                    
+                    cell_filename_lst = [megaTesterCellFilename(filename_out, mega_num) 
+                                         for mega_num in range(1, mega_instance + 1)]
+                    experiment_num = len(experiment_dict)
+                    experiment_dict[filename_out] = cell_filename_lst
+                    os.makedirs(os.path.dirname(cell_filename_lst[0]), exist_ok = True)
+                    
+                    for mega_num, cell_filename in enumerate(cell_filename_lst, start = 1):
+                        if resume_flag == True and os.path.exists(cell_filename):
+                            continue
+                        
+                        cell_lst.append((sample_dict[sample_name], 
+                                         group_size, 
+                                         algorithm, 
+                                         force_plateau_action_flag, 
+                                         cooling_schedule, 
+                                         initialiser, 
+                                         plateau_action, 
+                                         mega_num, 
+                                         cell_filename, 
+                                         SeedSequence(random_seed, spawn_key = (experiment_num, mega_num))))
+    
+    num_cells = sum(len(cell_filename_lst) for cell_filename_lst in experiment_dict.values())
+    print()
+    print(f"MegaTester: {len(experiment_dict):,} experiments, {num_cells:,} cells. {num_cells - len(cell_lst):,} cells already done.")
+    print()
+    
+    #%% Run the cells
+    
+    failed_cell_lst = []
+    
+    if len(cell_lst) > 0:
+        with ProcessPoolExecutor(max_workers = num_workers) as executor:
+            future_dict = {executor.submit(megaTesterWorker, *cell): cell for cell in cell_lst}
+            
+            for completed_count, future in enumerate(as_completed(future_dict), start = 1):
+                cell_filename = future_dict[future][8]
+                
+                try:
+                    future.result()
+                except Exception as e:
+                    failed_cell_lst.append(cell_filename)
+                    print(f"Cell {cell_filename} failed: {e!r}")
+                    continue
+                
+                print(f"Progress: {completed_count:,} of {len(cell_lst):,} cells completed. Saved: {cell_filename}")
+    
+    #%% Put together each experiment's CSV from its cells
+    
+    for filename_out, cell_filename_lst in experiment_dict.items():
+        if not all(os.path.exists(cell_filename) for cell_filename in cell_filename_lst):
+            print(f"Not all cells of {filename_out} are done. Re-run to resume.")
+            continue
+        
+        with open(filename_out, 'w', newline='') as file:
+            writerMethod = csv.writer(file)
+            writerMethod.writerow(megatester_csv_headers)
+            
+            for cell_filename in cell_filename_lst:
+                with open(cell_filename, newline='') as cell_file:
+                    writerMethod.writerows(csv.reader(cell_file))
+        
+        print(f"Saved: {filename_out}")
+    
+    return failed_cell_lst
+
 #%% UI Screen Messages
 
 '''
@@ -1436,7 +520,7 @@ def messageCSV(activate_ui_flag: False):
                 first_try_flag = False
                 
                 if csvCheck(input_filename):
-                    data = read_csv(input_filename)
+                    data = loadCsv(input_filename)
                 else:    
                     raise ValueError() 
                 
@@ -1565,212 +649,284 @@ def messageVerbose(activate_ui_flag: False):
         print('###############################################')
         return verbosity
 
-#%% Driver code
+#%% Headless command line interface
 
 '''
 ###############################################
-DRIVER CODE
-###############################################
-'''    
+Headless command line interface. No prompts and no delays.
+Used when running from schedulers and scripts, e.g.:
+    
+    python DiverseAssign_v1_0_1b.py --input participants.csv --groups 12 --output done.csv
 
-#%% Set working folder. Compatible with IDE or PyInstaller executable
+Settings can also be given in a JSON config file (--config), with the same names as the options 
+(e.g. {"input": "participants.csv", "groups": 12, "time_budget": 60}). Options given on the 
+command line take precedence over the config file.
 
-if getattr(sys, 'frozen', False):
-    # Running as a PyInstaller executable
-    base_path = os.path.dirname(sys.executable)
-else:
-    # Running normally as a Python script
-    base_path = os.path.dirname(os.path.abspath(__file__))
+Long runs can save checkpoints (--checkpoint), and continue from the last one (--resume), 
+e.g. after a batch node is recycled. Run again with the same settings, plus --resume:
 
-os.chdir(base_path)
-os.getcwd()
+    python DiverseAssign_v1_0_1b.py --input participants.csv --groups 12 --output done.csv --checkpoint run.ckpt --resume
 
-#%% Create weights
+With --resume, a missing checkpoint file starts a new run. Hence the same command can be used 
+for the first run and every rerun. Given a time budget, the resumed run searches for up to 
+that many seconds more.
+###############################################
+'''
 
-# ## WEIGHTS FOR FUTURE USE. NOT USED IN DIVERSEASSIGN.v.1.0.1
+# Exit status codes of the headless run. Wrong options exit with argparse's status code 2
+exit_success = 0
+exit_failure = 1
+# Stopped by SIGINT (Ctrl-C) or SIGTERM. The best solution so far is saved
+exit_stopped = 3
+
+def parseArguments(argv):
+    parser = ArgumentParser(description = "Diverse-Assign: assign participants / items into diverse groups.")
+    parser.add_argument('--config', help = "JSON config file of settings")
+    parser.add_argument('--input', help = "CSV file of the participants / items")
+    parser.add_argument('--groups', type = int, help = "Number of groups to create")
+    parser.add_argument('--output', help = "CSV file to save the group assignment to")
+    parser.add_argument('--algorithm', 
+                        default = 'TwoHill', 
+                        choices = ['TwoHill', 'SimAnneal', 'RandomRestart', 'UnclosedAC3', 'Pseudorandom', 'Tabu', 'Exact'])
+    parser.add_argument('--seed', 
+                        type = int, 
+                        help = "Seed of the random number generator. Results are reproducible for a fixed seed and --workers")
+    parser.add_argument('--time-budget', type = float, help = "Seconds to search for. Default: no limit")
+    parser.add_argument('--gap-tolerance', 
+                        type = float, 
+                        help = "Stop once the diversity score is within this fraction of its upper bound (e.g. 0.001). Default: no early stop")
+    parser.add_argument('--workers', type = int, default = 1, help = "Processes running restarts in parallel")
+    parser.add_argument('--partner-search', default = 'Deque', choices = ['Deque', 'Vectorised', 'Profile'])
+    parser.add_argument('--plateau-action', 
+                        default = 'KernighanLin', 
+                        choices = ['KernighanLin', 'Restart'], 
+                        help = "On a plateau, refine with multi-swap moves before restarting, or restart. Default: 'KernighanLin'")
+    parser.add_argument('--initialiser', 
+                        default = 'Greedy', 
+                        choices = ['Greedy', 'Shuffle'], 
+                        help = "Starting assignment: 'Greedy' deals rows rarest categories first. Default: 'Greedy'")
+    parser.add_argument('--rotation-budget', 
+                        type = int, 
+                        default = 0, 
+                        help = "Random 3-cycles of rows across 3 groups tried after the swaps of each solution. Default: 0 (swaps only)")
+    parser.add_argument('--tabu-sample-size', 
+                        type = int, 
+                        help = "Rows whose swaps are searched each step of 'Tabu'. Default: square root of the number of rows, at least 4")
+    parser.add_argument('--loader', 
+                        default = 'csv', 
+                        choices = ['csv', 'pandas'], 
+                        help = "'csv' reads and writes the CSV files without pandas (faster start-up). Default: 'csv'")
+    parser.add_argument('--checkpoint', help = "File to save checkpoints of the run to")
+    parser.add_argument('--checkpoint-interval', type = float, default = 60, help = "Seconds between checkpoints. Default: 60")
+    parser.add_argument('--resume', action = 'store_true', help = "Resume the run from the checkpoint file, if there is one")
+    parser.add_argument('--summary', help = "JSON file to save a summary of the run to")
+    parser.add_argument('--verbosity', type = int, default = 0, choices = [0, 1], help = "1 to print a summary")
+    parser.add_argument('--debug', action = 'store_true', help = "Print debug tracing. Default: off, whatever debug_flag is set to")
+    
+    # Config file settings become the defaults, overwritten by the command line options
+    config_args, _ = parser.parse_known_args(argv)
+    if config_args.config is not None:
+        try:
+            with open(config_args.config) as file:
+                config_dict = json.load(file)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read config file {config_args.config}: {e}")
+            
+        config_dict = {key.replace('-', '_'): value for key, value in config_dict.items()}
+        unknown_lst = [key for key in config_dict if key not in vars(config_args) or key == 'config']
+        if len(unknown_lst) > 0:
+            parser.error(f"unknown settings in config file: {', '.join(unknown_lst)}")
+        parser.set_defaults(**config_dict)
+    
+    args = parser.parse_args(argv)
+    
+    for name in ['input', 'groups', 'output']:
+        if getattr(args, name) is None:
+            parser.error(f"--{name} is required (on the command line or in the config file)")
+    
+    if csvCheck(args.output) == False:
+        parser.error("--output must end with '.csv'")
+    
+    if args.resume == True and args.checkpoint is None:
+        parser.error("--resume needs --checkpoint")
+    
+    return args
+
+def headlessRun(argv):
+    args = parseArguments(argv)
+    
+    # Batch runs are quiet: debug tracing only with --debug
+    helpers.debug_flag = args.debug
+    
+    # The time budget starts before loading the data
+    # SIGINT (Ctrl-C) and SIGTERM stop the search, and the best solution so far is saved
+    run_control = RunControl()
+    if args.time_budget is not None:
+        run_control.deadline = time() + args.time_budget
+    
+    solve_kwargs = {'algorithm': args.algorithm, 
+                    'seed': args.seed, 
+                    'num_workers': args.workers, 
+                    'partner_search': args.partner_search, 
+                    'initialiser': args.initialiser, 
+                    'plateau_action': args.plateau_action, 
+                    'rotation_budget': args.rotation_budget, 
+                    'tabu_sample_size': args.tabu_sample_size, 
+                    'run_control': run_control, 
+                    'checkpoint_file': args.checkpoint, 
+                    'checkpoint_interval': args.checkpoint_interval, 
+                    'resume_flag': args.resume, 
+                    'gap_tolerance': args.gap_tolerance}
+    
+    try:
+        with stopOnSignals(run_control):
+            if args.loader == 'csv':
+                best_diversity = solveCsv(args.input, args.groups, args.output, **solve_kwargs)
+            
+            elif args.loader == 'pandas':
+                data = loadCsv(args.input)
+                best_solution, best_diversity = solve(data, args.groups, **solve_kwargs)
+                best_solution.to_csv(args.output, index = False)
+        
+        if args.summary is not None:
+            summary_dict = {'input': args.input, 
+                            'output': args.output, 
+                            'groups': args.groups, 
+                            'algorithm': args.algorithm, 
+                            'seed': args.seed, 
+                            **run_control.summary}
+            with open(args.summary, 'w') as file:
+                json.dump(summary_dict, file, indent = 4)
+    
+    except Exception as e:
+        print(f"Diverse-Assign failed: {e}", file = sys.stderr)
+        return exit_failure
+    
+    if args.verbosity >= 1:
+        print(f"The best diversity score achieved was {best_diversity:.3f}")
+        print(f"File saved as: '{args.output}'")
+    
+    if run_control.summary['stop_reason'] == 'stopped':
+        print("Stopped early. The best solution so far was saved.", file = sys.stderr)
+        return exit_stopped
+    
+    return exit_success
 
-# ## The effect of weights is still being studied. 
-# ## Users should study before enabling.
- 
-# ## WARNING: weight modifiers only makes sense when based on dataset.
-# ## DO NOT BASE WEIGHTS ON SUBSET. Because subset (or 'groups') shift composition during swapping.
+#%% Driver code
 
-# weight_dict = weightModfier(input_data)
+'''
+###############################################
+DRIVER CODE
+###############################################
+'''    
 
-#%% Mode switch
+# Run only as a script. Worker processes of parallelIterator() import this file without running it
+if __name__ == '__main__':
+    
+    # Needed by the process pool in a compiled PyInstaller executable
+    freeze_support()
+    
+    # Any command line options: run headless, then exit with its status code
+    if len(sys.argv) > 1:
+        sys.exit(headlessRun(sys.argv[1:]))
+    
+    #%% Set working folder. Compatible with IDE or PyInstaller executable
 
-# set below to TRUE to activate UI messages in the Diverse-Assign Production version
-activate_ui_flag = True
-# activate_ui_flag = False
+    if getattr(sys, 'frozen', False):
+        # Running as a PyInstaller executable
+        base_path = os.path.dirname(sys.executable)
+    else:
+        # Running normally as a Python script
+        base_path = os.path.dirname(os.path.abspath(__file__))
 
-#%% Normal UI <- UI used in compiled production executable or py script 
+    os.chdir(base_path)
+    os.getcwd()
 
-if activate_ui_flag == True:
+    #%% Create weights
 
-    messageWelcome(activate_ui_flag)
-    data = messageCSV(activate_ui_flag)
-    num_groups = messageNumGroup(activate_ui_flag)
-    verbosity = messageVerbose(activate_ui_flag)
+    # ## WEIGHTS FOR FUTURE USE. NOT USED IN DIVERSEASSIGN.v.1.0.1
 
-    megaIterator(1, 
-                 num_groups, 
-                 data, 
-                 None,
-                 verbosity = verbosity)
-    
-#%% MegaTester Paramters
-# Run experiment 1
+    # ## The effect of weights is still being studied. 
+    # ## Users should study before enabling.
+     
+    # ## WARNING: weight modifiers only makes sense when based on dataset.
+    # ## DO NOT BASE WEIGHTS ON SUBSET. Because subset (or 'groups') shift composition during swapping.
 
-elif activate_ui_flag == False:
-    
-    sample_name = '1x'
-    # sample_name = '2x'
-    
-    group_size =  6
-    # group_size =  12
-    
-    force_plateau_action_flag = True 
-    # force_plateau_action_flag = False
-    
-    algorithm = 'TwoHill'
-    # algorithm = 'SimAnneal'
-    # algorithm = 'RandomRestart'
-    # algorithm = 'UnclosedAC3'
-    # algorithm = 'Pseudorandom'
-    
-    mega_instance = 1
-    cooling_schedule = 0.95
-    
-    if sample_name == '1x':
-        input_data = "sample_input_b.csv"
-    elif sample_name == '2x':    
-        input_data = "sample_input_doubled_b.csv"
-    
-    input_data = read_csv(input_data)
-    # Intermediary check for future debugging
-    # if debug_flag:
-    #     data.to_csv('IndexedInputV1_0_1b.csv', index = True)
-    
-    num_rows = len(input_data)
-    num_groups = num_rows // group_size
-    
-    if force_plateau_action_flag == True:
-        plateau_status = "cap"
-    else:
-        plateau_status = "no_cap"
-    
-    filename_out = algorithm + '_' + str(mega_instance) + 'iter_' + str(group_size) + 'size_' + sample_name +  '_' + plateau_status + '.csv'
-    
-    megaIterator(mega_instance, 
-                 num_groups, 
-                 input_data, 
-                 filename_out, 
-                 algorithm = algorithm, 
-                 cooling_schedule = cooling_schedule, 
-                 force_plateau_action_flag = force_plateau_action_flag,
-                 verbosity = 2,
-                 mode = 'MegaTester')
-   
-    
-    #%% Run experiment 2
-    
-    group_size =  6
-    
-    force_plateau_action_flag = False
-    
-    if sample_name == '1x':
-        input_data = "sample_input_b.csv"
-    elif sample_name == '2x':    
-        input_data = "sample_input_doubled_b.csv"
-    
-    input_data = read_csv(input_data)
-    
-    num_rows = len(input_data)
-    num_groups = num_rows // group_size
-    
-    if force_plateau_action_flag == True:
-        plateau_status = "cap"
-    else:
-        plateau_status = "no_cap"
-    
-    filename_out = algorithm + '_' + str(mega_instance) + 'iter_' + str(group_size) + 'size_' + sample_name +  '_' + plateau_status + '.csv'
-    
-    megaIterator(mega_instance, 
-                  num_groups, 
-                  input_data, 
-                  filename_out, 
-                  algorithm = algorithm, 
-                  cooling_schedule = cooling_schedule, 
-                  force_plateau_action_flag = force_plateau_action_flag,
-                  verbosity = 2,
-                  mode = 'MegaTester')
-    
-    #%% Run experiment 3
-    
-    group_size =  12
-    
-    force_plateau_action_flag = True
-        
-    if sample_name == '1x':
-        input_data = "sample_input_b.csv"
-    elif sample_name == '2x':    
-        input_data = "sample_input_doubled_b.csv"
-    
-    input_data = read_csv(input_data)
-    
-    num_rows = len(input_data)
-    num_groups = num_rows // group_size
-    
-    if force_plateau_action_flag == True:
-        plateau_status = "cap"
-    else:
-        plateau_status = "no_cap"
-    
-    filename_out = algorithm + '_' + str(mega_instance) + 'iter_' + str(group_size) + 'size_' + sample_name +  '_' + plateau_status + '.csv'
-    
-    megaIterator(mega_instance, 
-                  num_groups, 
-                  input_data, 
-                  filename_out, 
-                  algorithm = algorithm, 
-                  cooling_schedule = cooling_schedule, 
-                  force_plateau_action_flag = force_plateau_action_flag,
-                  verbosity = 2,
-                  mode = 'MegaTester')
-       
-    #%% Run experiment 4
-    
-    group_size =  12
-    
-    force_plateau_action_flag = False
-    
-    if sample_name == '1x':
-        input_data = "sample_input_b.csv"
-    elif sample_name == '2x':    
-        input_data = "sample_input_doubled_b.csv"
-    
-    input_data = read_csv(input_data)
-    # Intermediary check for future debugging
-    # if debug_flag:
-    #     data.to_csv('IndexedInputV1_0_1b.csv', index = True)
-    
-    num_rows = len(input_data)
-    num_groups = num_rows // group_size
-    
-    if force_plateau_action_flag == True:
-        plateau_status = "cap"
-    else:
-        plateau_status = "no_cap"
+    # weight_dict = weightModfier(input_data)
+
+    #%% Mode switch
+
+    # set below to TRUE to activate UI messages in the Diverse-Assign Production version
+    activate_ui_flag = True
+    # activate_ui_flag = False
     
-    filename_out = algorithm + '_' + str(mega_instance) + 'iter_' + str(group_size) + 'size_' + sample_name +  '_' + plateau_status + '.csv'
+    # Number of processes running restarts in parallel, in production. 1 to run restarts sequentially, 
+    # as the library does. Results depend on the number of workers (see parallelIterator()), 
+    # hence one per CPU gives other results on other machines, for the same seed
+    num_workers = 1
+    # num_workers = os.cpu_count()
     
-    megaIterator(mega_instance, 
-                  num_groups, 
-                  input_data, 
-                  filename_out, 
-                  algorithm = algorithm, 
-                  cooling_schedule = cooling_schedule, 
-                  force_plateau_action_flag = force_plateau_action_flag,
-                  verbosity = 2,
-                  mode = 'MegaTester')
+    # Number of processes running cells in parallel, in MegaTester. 
+    # Each cell has its own seed, hence the results do not depend on it
+    megatester_num_workers = os.cpu_count()
     
+    # Seed of the random numbers. The same seed and num_workers give the same results. None: a fresh seed each time
+    random_seed = None
+    # random_seed = 2024
+
+    #%% Normal UI <- UI used in compiled production executable or py script 
+
+    if activate_ui_flag == True:
+
+        messageWelcome(activate_ui_flag)
+        data = messageCSV(activate_ui_flag)
+        num_groups = messageNumGroup(activate_ui_flag)
+        verbosity = messageVerbose(activate_ui_flag)
+
+        megaIterator(1, 
+                     num_groups, 
+                     data, 
+                     None,
+                     verbosity = verbosity, 
+                     num_workers = num_workers, 
+                     seed = random_seed)
+        
+    #%% MegaTester Paramters
+    # Run experiments 1 to 4: group sizes 6 and 12, with and without plateau cap
+    
+    elif activate_ui_flag == False:
+        
+        sample_name_lst = ['1x']
+        # sample_name_lst = ['2x']
+        # sample_name_lst = ['1x', '2x']
+        
+        group_size_lst = [6, 12]
+        
+        force_plateau_action_lst = [True, False]
+        
+        algorithm_lst = ['TwoHill']
+        # algorithm_lst = ['TwoHill', 'SimAnneal', 'RandomRestart', 'UnclosedAC3', 'Pseudorandom']
+        
+        mega_instance = 1
+        cooling_schedule = 0.95
+        
+        # Starting assignment and plateau action of every cell. See megaTesterGrid()
+        initialiser = 'Shuffle'
+        # initialiser = 'Greedy'
+        plateau_action = 'Restart'
+        # plateau_action = 'KernighanLin'
+        
+        # Set to FALSE to re-run cells already done
+        resume_flag = True
+        
+        megaTesterGrid(algorithm_lst, 
+                       group_size_lst, 
+                       sample_name_lst, 
+                       force_plateau_action_lst, 
+                       mega_instance, 
+                       cooling_schedule = cooling_schedule, 
+                       initialiser = initialiser, 
+                       plateau_action = plateau_action, 
+                       num_workers = megatester_num_workers, 
+                       resume_flag = resume_flag, 
+                       seed = random_seed)
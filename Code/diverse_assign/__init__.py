@@ -0,0 +1,202 @@
+'''
+###############################################
+diverse_assign package
+
+Scoring, heuristics and search of Diverse-Assign, without the UI.
+Importing the package has no side effects: no prompts, no printing, no change of working folder.
+pandas is only imported once a DataFrame is passed in.
+
+    from diverse_assign import solve
+    best_solution, best_diversity = solve(data, 12)
+    
+    # CSV file in, CSV file out, without pandas
+    from diverse_assign import solveCsv
+    best_diversity = solveCsv('participants.csv', 12, 'done.csv')
+
+###############################################
+'''
+
+#%% Packages
+
+from time import time
+
+from .helpers import debug_print, csvCheck
+from .scoring import (weightModfier, 
+                      calculateDiversity, 
+                      encodeData, 
+                      weightArray, 
+                      calculateDiversityEncoded, 
+                      diversityUpperBound, 
+                      optimalityGap)
+from .state import AssignmentState
+from .heuristics import (heuristicEstimator, 
+                         heuristicDominanceDetector, 
+                         heuristicDominanceDetectorEncoded, 
+                         heuristicExactTreeSize)
+from .search import assigner, iterator, parallelIterator
+from .loader import readCsvEncoded, writeCsvAssigned
+from .control import RunControl, stopOnSignals
+from .rng import RandomStream
+from .exact import exactSolver
+from .checkpoint import saveCheckpoint, loadCheckpoint
+
+#%% solve() function. Assigns the rows of data into num_groups diverse groups.
+# 
+# Optional settings:
+#     algorithm: 'TwoHill' (default), 'SimAnneal', 'RandomRestart', 'UnclosedAC3', 'Pseudorandom', 'Tabu' or 'Exact'
+#     exact_limit: instances with at most this many assignments are solved exactly, 
+#         whatever the algorithm. Default: 10 ** 9. None: never. See exact.py
+#     seed: seed of the random numbers (an int). Reproducible for a fixed seed and worker count: 
+#         the same seed, settings and num_workers give the same best solution, unless stopped early 
+#         (time budget, deadline, stop, gap_tolerance). Another num_workers splits the instances 
+#         into other restarts, each with its own seed, hence gives other results. See RandomStream
+#     time_budget: seconds to search for. Default: no limit
+#     deadline: time() timestamp to stop searching at. Default: no limit
+#         Given a time budget or deadline, the search keeps improving until then (anytime mode), 
+#         and returns the best solution so far. See iterator()
+#     run_control: handle to stop the search early, e.g. from another thread. 
+#         Holds the summary of the run once done. See RunControl
+#     gap_tolerance: stop once the best solution is within this fraction of the upper bound 
+#         on the diversity score (e.g. 0.001). 0 stops at a provably best solution. 
+#         Default: no early stop. See diversityUpperBound()
+#     num_workers: processes running restarts in parallel. Default: 1, i.e. no parallel restarts. 
+#         None: one per CPU, hence results differ between machines, whatever the seed
+#     checkpoint_file: file to save checkpoints of the run to. Default: no checkpoints. See checkpoint.py
+#     checkpoint_interval: seconds between checkpoints. Default: 60
+#     resume_flag: whether to resume the run from checkpoint_file, if there is one. Default: False
+#         The same settings (and the same number of workers) must be given to resume. 
+#         A time budget starts afresh: the resumed run searches for up to time_budget seconds more
+#     partner_search: 'Deque' (default), 'Vectorised' or 'Profile'
+#         Only 'Vectorised' keeps the best swap of each row with each group in a cache (see assigner()), 
+#         and skips the rows with no improving swap. 'Deque' (the default) and 'Profile' do not use the cache. 
+#         Used by every algorithm but 'Pseudorandom', which picks among every swap
+#     plateau_action: on a plateau, 'KernighanLin' (default) refines the better assignment with multi-swap moves 
+#         before a restart is needed (see kernighanLinRefiner()). 'Restart': restart straight away
+#     initialiser: starting assignment of each restart. 'Greedy' (default): rows dealt to the groups, 
+#         rarest categories first (see AssignmentState.dealRarestFirst()). 'Shuffle': shuffled sequential grouping
+#     rotation_budget: random 3-cycles of rows across 3 groups tried after the swaps of each solution. 
+#         Default: 0, i.e. swaps only. See assigner()
+#     tabu_sample_size: rows whose swaps are searched each step of 'Tabu'. 
+#         Default: the square root of the number of rows, at least 4. See assigner()
+#     weight_modifier_dict, cooling_schedule: as iterator()
+#
+# Returns:
+#     best_solution: copy of data, with the assigned_group column (1-based)
+#     best_diversity: Aggregate Diversity Score (ADS) of best_solution
+
+def solve(data, num_groups, **kwargs):
+    # The time budget starts on calling solve()
+    start_time = time()
+    
+    group_labels, best_diversity = solveEncoded(encodeData(data), 
+                                                data.columns, 
+                                                num_groups, 
+                                                start_time = start_time, 
+                                                **kwargs)
+    
+    best_solution = data.assign(assigned_group = group_labels)
+    
+    return best_solution, best_diversity
+
+#%% solveCsv() function. As solve(), from a CSV file to a CSV file, without pandas. See loader.py
+# Returns best_diversity
+
+def solveCsv(input_filename, num_groups, output_filename, **kwargs):
+    start_time = time()
+    
+    column_lst, row_lst, encoded_data = readCsvEncoded(input_filename)
+    group_labels, best_diversity = solveEncoded(encoded_data, 
+                                                column_lst, 
+                                                num_groups, 
+                                                start_time = start_time, 
+                                                **kwargs)
+    
+    writeCsvAssigned(output_filename, column_lst, row_lst, group_labels)
+    
+    return best_diversity
+
+#%% solveEncoded() function. As solve(), on encoded data (see encodeData()).
+# Returns the assigned group of each row (1-based), and best_diversity
+
+def solveEncoded(encoded_data, column_lst, num_groups, **kwargs):
+    algorithm = kwargs.get('algorithm', 'TwoHill')
+    random_seed = kwargs.get('seed', None)
+    time_budget = kwargs.get('time_budget', None)
+    deadline = kwargs.get('deadline', None)
+    run_control = kwargs.get('run_control', None)
+    start_time = kwargs.get('start_time', None)
+    num_workers = kwargs.get('num_workers', 1)
+    partner_search = kwargs.get('partner_search', 'Deque')
+    weight_modifier_dict = kwargs.get('weight_modifier_dict', None)
+    cooling_schedule = kwargs.get('cooling_schedule', 0.95)
+    checkpoint_file = kwargs.get('checkpoint_file', None)
+    checkpoint_interval = kwargs.get('checkpoint_interval', 60)
+    resume_flag = kwargs.get('resume_flag', False)
+    gap_tolerance = kwargs.get('gap_tolerance', None)
+    exact_limit = kwargs.get('exact_limit', 10 ** 9)
+    initialiser = kwargs.get('initialiser', 'Greedy')
+    plateau_action = kwargs.get('plateau_action', 'KernighanLin')
+    rotation_budget = kwargs.get('rotation_budget', 0)
+    tabu_sample_size = kwargs.get('tabu_sample_size', None)
+    
+    if start_time is None:
+        start_time = time()
+    
+    if run_control is None:
+        run_control = RunControl()
+    
+    # The earliest of the deadlines, and the end of the time budget
+    deadline_lst = [time_deadline for time_deadline in (deadline, run_control.deadline) if time_deadline is not None]
+    if time_budget is not None:
+        deadline_lst.append(start_time + time_budget)
+    if len(deadline_lst) > 0:
+        run_control.deadline = min(deadline_lst)
+    
+    num_rows, num_cols = encoded_data[0].shape
+    if num_groups < 2 or num_groups >= num_rows:
+        raise ValueError(f"Number of groups must be between 2 and {num_rows - 1}, for {num_rows} participants / items.")
+    
+    # Random numbers of the search. No seed: a fresh seed from the operating system
+    random_stream = RandomStream(random_seed)
+    
+    exhaust_count, instance_count = heuristicEstimator(num_rows, num_groups, num_cols)
+    weight_arr = weightArray(column_lst, weight_modifier_dict)
+    
+    search_kwargs = {'algorithm': algorithm, 
+                     'weight_modifier_dict': weight_modifier_dict, 
+                     'cooling_schedule': cooling_schedule, 
+                     'verbosity': 0, 
+                     'partner_search': partner_search, 
+                     'initialiser': initialiser, 
+                     'plateau_action': plateau_action, 
+                     'rotation_budget': rotation_budget, 
+                     'tabu_sample_size': tabu_sample_size, 
+                     'run_control': run_control, 
+                     'random_stream': random_stream, 
+                     'encoded_data': encoded_data, 
+                     'weight_arr': weight_arr, 
+                     'checkpoint_file': checkpoint_file, 
+                     'checkpoint_interval': checkpoint_interval, 
+                     'resume_flag': resume_flag, 
+                     'gap_tolerance': gap_tolerance, 
+                     'exact_limit': exact_limit}
+    
+    if num_workers is None or num_workers > 1:
+        outputs = parallelIterator(instance_count, 
+                                   num_groups, 
+                                   num_rows, 
+                                   None, 
+                                   num_workers = num_workers, 
+                                   **search_kwargs)
+    else:
+        outputs = iterator(None, 
+                           1, 
+                           instance_count, 
+                           num_groups, 
+                           num_rows, 
+                           None, 
+                           **search_kwargs)
+    
+    picked_solution, group_labels, best_diversity = outputs
+    
+    return group_labels, best_diversity
@@ -0,0 +1,61 @@
+#%% Packages
+
+import os
+import pickle
+from zlib import crc32
+
+from numpy import ascontiguousarray, min_scalar_type
+
+#%% Checkpoints of iterator(). Saves the state of a run to a file, to resume it later,
+# e.g. after a batch node is recycled.
+#
+# A checkpoint holds the bookkeeping of iterator() at the start of a solution:
+# better and best assignments, diversity scores, temperature, solution number,
+# the plateau deque, and the state of the random numbers (see RandomStream).
+# Hence a resumed run makes the same swaps as a run that was never stopped.
+#
+# Assignments are kept as group indexes only. The count tables are rebuilt on loading.
+# The checkpoint also keeps the settings of the run. Resuming with other settings or data fails.
+
+checkpoint_version = 3
+
+#%% dataChecksum() function. Checksum of the code matrix, to tell whether a checkpoint is of the same data
+
+def dataChecksum(encoded_data):
+    code_matrix = encoded_data[0]
+    
+    return crc32(ascontiguousarray(code_matrix).tobytes(), crc32(str(code_matrix.shape).encode()))
+
+#%% compactLabels() function. Group indexes in the smallest integer type that fits
+
+def compactLabels(group_index_arr, num_groups):
+    return group_index_arr.astype(min_scalar_type(num_groups))
+
+#%% saveCheckpoint() function. Saves checkpoint_dict to file_path.
+# Written to a temporary file first, so that a run killed while saving keeps its last checkpoint
+
+def saveCheckpoint(file_path, checkpoint_dict):
+    temporary_path = f"{file_path}.tmp"
+    
+    with open(temporary_path, 'wb') as file:
+        pickle.dump({'version': checkpoint_version, **checkpoint_dict}, file, protocol = pickle.HIGHEST_PROTOCOL)
+        file.flush()
+        os.fsync(file.fileno())
+    
+    os.replace(temporary_path, file_path)
+
+#%% loadCheckpoint() function. Loads a checkpoint saved by saveCheckpoint().
+# settings_dict: settings of the run being resumed. Must match the settings in the checkpoint
+
+def loadCheckpoint(file_path, settings_dict):
+    with open(file_path, 'rb') as file:
+        checkpoint_dict = pickle.load(file)
+    
+    if checkpoint_dict.get('version') != checkpoint_version:
+        raise ValueError(f"Checkpoint {file_path} was saved by another version of Diverse-Assign.")
+    
+    for key, value in settings_dict.items():
+        if checkpoint_dict['settings'].get(key) != value:
+            raise ValueError(f"Checkpoint {file_path} was saved with {key} = {checkpoint_dict['settings'].get(key)}, not {value}.")
+    
+    return checkpoint_dict
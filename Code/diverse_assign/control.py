@@ -0,0 +1,71 @@
+#%% Packages
+
+import signal
+from contextlib import contextmanager
+from time import time
+
+#%% class RunControl. Handle to stop a search early.
+# Given to iterator(), parallelIterator() or solve() as run_control. 
+# The search stops at the next swap boundary once stopped() is True, 
+# and returns the best solution so far:
+#     - stop() was called, e.g. by another thread or a signal handler (see stopOnSignals())
+#     - the deadline (a time() timestamp) has passed
+#     - stop_event (a multiprocessing Event) is set. Used by the workers of parallelIterator()
+#
+# Once the search ends, summary holds a summary of the run (see iterator()), 
+# including stop_reason: 'completed', 'deadline', 'stopped', 
+# or 'gap' (close enough to the upper bound, see gap_tolerance in iterator()).
+
+class RunControl:
+    def __init__(self, **kwargs):
+        self.deadline = kwargs.get('deadline', None)
+        self.stop_event = kwargs.get('stop_event', None)
+        self.stop_flag = False
+        self.summary = None
+    
+    def stop(self):
+        self.stop_flag = True
+        if self.stop_event is not None:
+            self.stop_event.set()
+    
+    def stopRequested(self):
+        if self.stop_flag == False and self.stop_event is not None and self.stop_event.is_set():
+            self.stop_flag = True
+        return self.stop_flag
+    
+    def pastDeadline(self):
+        return self.deadline is not None and time() >= self.deadline
+    
+    def stopped(self):
+        return self.stopRequested() or self.pastDeadline()
+    
+    def stopReason(self):
+        if self.stopRequested():
+            return 'stopped'
+        elif self.pastDeadline():
+            return 'deadline'
+        else:
+            return 'completed'
+
+#%% stopOnSignals() context manager. SIGINT (Ctrl-C) and SIGTERM stop the search gracefully.
+# The first signal calls run_control.stop(). A second SIGINT quits straight away (KeyboardInterrupt).
+# The previous signal handlers are put back on exit. Only works in the main thread.
+#
+#     with stopOnSignals(run_control):
+#         outputs = iterator(..., run_control = run_control)
+
+@contextmanager
+def stopOnSignals(run_control):
+    def handler(signal_number, frame):
+        if run_control.stop_flag == True and signal_number == signal.SIGINT:
+            raise KeyboardInterrupt
+        run_control.stop()
+    
+    signal_lst = [signal.SIGINT, signal.SIGTERM]
+    previous_handler_dict = {signal_number: signal.signal(signal_number, handler) 
+                             for signal_number in signal_lst}
+    try:
+        yield run_control
+    finally:
+        for signal_number, previous_handler in previous_handler_dict.items():
+            signal.signal(signal_number, previous_handler)
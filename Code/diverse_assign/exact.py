@@ -0,0 +1,286 @@
+#%% Packages
+
+from numpy import arange, zeros, tile, bincount, cumsum, sort, argsort, minimum, take_along_axis, add
+from numpy import log as log_np
+from time import time
+
+from .scoring import encodeData, weightArray, xlogxTable, categoryOffsets, diversityUpperBound, optimalityGap
+from .state import AssignmentState
+from .heuristics import heuristicExactTreeSize
+from .control import RunControl
+
+#%% Exact branch-and-bound search for small instances.
+# Rows are put into groups one at a time (depth-first), and a partial assignment is dropped
+# once its upper bound is no better than the best assignment found so far.
+# Hence the assignment returned is the best possible (highest Aggregate Diversity Score).
+#
+# Upper bound of a partial assignment: as diversityUpperBound(), with the rows still to place
+# spread over the groups as evenly as possible ("water-filling" of each category,
+# on top of the counts already in the groups). See partialUpperBound()
+#
+# Symmetry breaking, so that each assignment is only visited once:
+#     - Groups of the same size are interchangeable. A row only goes into the first
+#       empty group of each size
+#     - Rows with identical codes (a profile, see profileEncoder()) are interchangeable.
+#       They are placed one after another, into groups in increasing order
+# Rows of rare categories are placed first, which tightens the bounds early.
+#
+# Note: maximises the diversity score only. The no-homogenous-column check of assigner() is not used.
+
+#%% partialUpperBound() function. Upper bounds of a stack of partial assignments.
+# count_stack: count tables of the partial assignments (see buildCountTable()). Shape: assignments x groups x categories
+# remaining_count: count of each category in the rows still to place
+# Returns the upper bound of each partial assignment
+
+def partialUpperBound(count_stack, remaining_count, bound_settings):
+    (offset_arr, weight_arr, xlogx_table,
+     sum_log_size, max_size, category_bound_arr, invariant_diversity) = bound_settings
+    num_groups = count_stack.shape[1]
+    
+    # Categories of each group in ascending count. Filling the first m groups up to the
+    # count of group m costs cost_stack[:, m - 1] rows
+    sorted_stack = sort(count_stack, axis = 1)
+    cumulative_stack = cumsum(sorted_stack, axis = 1)
+    cost_stack = arange(1, num_groups + 1)[None, :, None] * sorted_stack - cumulative_stack
+    
+    # Number of groups filled by the remaining rows, and their counts once filled:
+    # level + 1 rows in extra groups, level rows in the others
+    fill_count = (cost_stack <= remaining_count).sum(axis = 1)
+    fill_total = take_along_axis(cumulative_stack, fill_count[:, None, :] - 1, axis = 1)[:, 0, :] + remaining_count
+    level, extra = divmod(fill_total, fill_count)
+    
+    xlogx_cumulative = cumsum(xlogx_table[sorted_stack], axis = 1)
+    unfilled_xlogx = xlogx_cumulative[:, -1, :] - take_along_axis(xlogx_cumulative, fill_count[:, None, :] - 1, axis = 1)[:, 0, :]
+    filled_xlogx = (fill_count - extra) * xlogx_table[level] + extra * xlogx_table[level + 1]
+    
+    sum_xlogx = add.reduceat(unfilled_xlogx + filled_xlogx, offset_arr, axis = 1)
+    bound_table = minimum(sum_log_size - sum_xlogx / max_size, category_bound_arr)
+    
+    return bound_table @ weight_arr + invariant_diversity
+
+#%% exactSolver() function. Branch-and-bound search for the best assignment.
+# Settings:
+#     weight_arr: weight of each column (see weightArray())
+#     run_control: stops the search early. See RunControl
+#     node_limit: most partial assignments to visit. Default: no limit
+#
+# Returns:
+#     group_index_arr: group of each row (0-based)
+#     best_diversity: Aggregate Diversity Score (ADS) of the assignment
+#     optimal_flag: whether the assignment is proven the best possible
+#                   (False if stopped, or out of nodes, before the search was done)
+#     node_count: partial assignments visited
+
+def exactSolver(encoded_data, num_groups, **kwargs):
+    weight_arr = kwargs.get('weight_arr', None)
+    run_control = kwargs.get('run_control', None)
+    node_limit = kwargs.get('node_limit', None)
+    
+    if run_control is None:
+        run_control = RunControl()
+    
+    num_rows = encoded_data[0].shape[0]
+    
+    # Sequential grouping, as iterator(). Sets the group sizes, and leaves out invariant columns
+    state = AssignmentState(encoded_data,
+                            num_groups,
+                            tile(arange(num_groups), num_rows // num_groups + 1)[:num_rows],
+                            weight_arr = weight_arr)
+    
+    flat_code_matrix = state.flat_code_matrix
+    num_categories = state.num_categories
+    num_categories_total = int(num_categories.sum())
+    group_size_arr = state.group_size_arr
+    offset_arr = categoryOffsets(num_categories)
+    xlogx_table = xlogxTable(num_rows + 1)
+    
+    bound_settings = (offset_arr,
+                      state.weight_arr,
+                      xlogx_table,
+                      float(log_np(group_size_arr).sum()),
+                      int(group_size_arr.max()),
+                      log_np(minimum(group_size_arr[None, :], num_categories[:, None])).sum(axis = 1),
+                      state.invariant_weight * float(log_np(group_size_arr).sum()))
+    
+    # Every column left out: every assignment scores the same
+    if num_categories_total == 0:
+        return state.group_index_arr.copy(), state.totalDiversity(), True, 0
+    
+    #%% Order of the rows: profiles of rare categories first, rows of a profile together
+    
+    population_count = bincount(flat_code_matrix.ravel(), minlength = num_categories_total)
+    profile_rarity_arr = (1 / population_count[state.profile_flat_code_matrix]).sum(axis = 1)
+    
+    row_order_lst = []
+    profile_order_lst = []
+    for profile_t in argsort(-profile_rarity_arr, kind = 'stable'):
+        row_order_lst.extend(state.profile_member_lst[profile_t].tolist())
+        profile_order_lst.extend([profile_t] * len(state.profile_member_lst[profile_t]))
+    
+    #%% Depth-first search
+    
+    count_table = zeros((num_groups, num_categories_total), dtype = 'intp')
+    size_arr = zeros(num_groups, dtype = 'intp')
+    remaining_count = population_count.copy()
+    assigned_arr = zeros(num_rows, dtype = 'intp')
+    
+    root_bound = float(partialUpperBound(count_table[None], remaining_count, bound_settings)[0])
+    search_dict = {'best_diversity': float('-inf'),
+                   'best_group_index_arr': None,
+                   'node_count': 0,
+                   'done_flag': False}
+    
+    def leafDiversity():
+        sum_xlogx = add.reduceat(xlogx_table[count_table], offset_arr, axis = 1)
+        swi_table = (xlogx_table[size_arr][:, None] - sum_xlogx) / size_arr[:, None]
+        return float((swi_table @ state.weight_arr).sum()) + bound_settings[6]
+    
+    def branch(depth, previous_group):
+        search_dict['node_count'] += 1
+        if search_dict['node_count'] % 256 == 0 and run_control.stopped():
+            search_dict['done_flag'] = True
+        if node_limit is not None and search_dict['node_count'] >= node_limit:
+            search_dict['done_flag'] = True
+        if search_dict['done_flag'] == True:
+            return
+        
+        if depth == num_rows:
+            diversity = leafDiversity()
+            if diversity > search_dict['best_diversity']:
+                search_dict['best_diversity'] = diversity
+                search_dict['best_group_index_arr'] = assigned_arr.copy()
+                # Nothing can beat the bound of the root
+                if optimalityGap(diversity, root_bound) == 0:
+                    search_dict['done_flag'] = True
+            return
+        
+        row = row_order_lst[depth]
+        codes = flat_code_matrix[row]
+        
+        # Groups the row can go into: not full, not before the group of the previous row 
+        # of the same profile, and only the first empty group of each size. 
+        # Groups of the same size are side by side, and are filled in order
+        group_lst = []
+        for group in range(num_groups):
+            if size_arr[group] == group_size_arr[group]:
+                continue
+            if depth > 0 and profile_order_lst[depth - 1] == profile_order_lst[depth] and group < previous_group:
+                continue
+            if group > 0 and size_arr[group] == 0 and size_arr[group - 1] == 0 and group_size_arr[group - 1] == group_size_arr[group]:
+                continue
+            group_lst.append(group)
+        
+        # Upper bound of each child, best first
+        group_arr = zeros(len(group_lst), dtype = 'intp')
+        group_arr[:] = group_lst
+        count_stack = count_table[None].repeat(len(group_arr), axis = 0)
+        count_stack[arange(len(group_arr))[:, None], group_arr[:, None], codes[None, :]] += 1
+        remaining_count[codes] -= 1
+        bound_arr = partialUpperBound(count_stack, remaining_count, bound_settings)
+        
+        for pick in argsort(-bound_arr, kind = 'stable'):
+            if bound_arr[pick] <= search_dict['best_diversity'] or optimalityGap(search_dict['best_diversity'], bound_arr[pick]) == 0:
+                break
+            
+            group = group_arr[pick]
+            count_table[group, codes] += 1
+            size_arr[group] += 1
+            assigned_arr[row] = group
+            
+            branch(depth + 1, group)
+            
+            count_table[group, codes] -= 1
+            size_arr[group] -= 1
+            
+            if search_dict['done_flag'] == True:
+                break
+        
+        remaining_count[codes] += 1
+    
+    branch(0, 0)
+    
+    optimal_flag = (search_dict['done_flag'] == False
+                    or optimalityGap(search_dict['best_diversity'], root_bound) == 0)
+    
+    # Stopped before the first assignment: keep the sequential grouping
+    if search_dict['best_group_index_arr'] is None:
+        return state.group_index_arr.copy(), state.totalDiversity(), False, search_dict['node_count']
+    
+    state.reassign(search_dict['best_group_index_arr'])
+    
+    return state.group_index_arr.copy(), state.totalDiversity(), optimal_flag, search_dict['node_count']
+
+#%% exactSelector() function. Whether to solve an instance exactly, instead of searching.
+# True if the number of assignments (see heuristicExactTreeSize()) is at most exact_limit.
+# exact_limit None: never
+
+def exactSelector(num_rows, num_groups, exact_limit):
+    if exact_limit is None:
+        return False
+    
+    return heuristicExactTreeSize(num_rows, num_groups) <= exact_limit
+
+#%% exactIterator() function. Runs exactSolver() in place of iterator(), with the same outputs.
+# Used by iterator() and parallelIterator() for small instances. See exactSelector()
+
+def exactIterator(num_groups, num_rows, data, **kwargs):
+    weight_modifier_dict = kwargs.get('weight_modifier_dict', None)
+    verbosity = kwargs.get('verbosity', 2)
+    encoded_data = kwargs.get('encoded_data', None)
+    weight_arr = kwargs.get('weight_arr', None)
+    run_control = kwargs.get('run_control', None)
+    node_limit = kwargs.get('node_limit', None)
+    
+    if run_control is None:
+        run_control = RunControl()
+    
+    start_time = time()
+    
+    if encoded_data is None:
+        encoded_data = encodeData(data)
+        weight_arr = weightArray(data.columns, weight_modifier_dict)
+    
+    if verbosity >= 1:
+        print()
+        print("Work progress: small enough to find the best assignment exactly...")
+    
+    baseline_solution = AssignmentState(encoded_data,
+                                        num_groups,
+                                        tile(arange(num_groups), num_rows // num_groups + 1)[:num_rows],
+                                        weight_arr = weight_arr)
+    
+    outputs = exactSolver(encoded_data,
+                          num_groups,
+                          weight_arr = weight_arr,
+                          run_control = run_control,
+                          node_limit = node_limit)
+    group_index_arr, best_diversity, optimal_flag, node_count = outputs
+    
+    upper_bound = diversityUpperBound(encoded_data[0], 
+                                      encoded_data[1], 
+                                      baseline_solution.group_size_arr, 
+                                      weight_arr = weight_arr)
+    
+    run_control.summary = {'stop_reason': run_control.stopReason(),
+                           'solution_number': 1,
+                           'picked_solution': 1,
+                           'baseline_initial_diversity': baseline_solution.totalDiversity(),
+                           'best_diversity': best_diversity,
+                           'upper_bound': upper_bound,
+                           'optimality_gap': optimalityGap(best_diversity, upper_bound),
+                           'elapsed_seconds': time() - start_time,
+                           'optimal': optimal_flag,
+                           'node_count': node_count}
+    
+    if verbosity >= 1:
+        if optimal_flag == True:
+            print(f"The best possible diversity score is {best_diversity:.3f}")
+        else:
+            print("Stopped early. Keeping the best solution so far.")
+        print("Progress: 100%")
+    
+    if data is None:
+        return 1, group_index_arr + 1, best_diversity
+    
+    best_solution = data.assign(assigned_group = group_index_arr + 1)
+    return 1, best_solution, best_diversity
@@ -0,0 +1,21 @@
+#%% Packages
+
+import os
+
+#%% debug_flag: option to print tracing
+# Off in the package. Scripts may switch it on (e.g. helpers.debug_flag = True)
+
+debug_flag = False
+
+#%% debug_print() function
+
+# The function debug_print(message, variable, bool): prints a variable for debug tracing
+def debug_print(message: str, variable, debug_flag: bool):
+    if debug_flag == True:
+        print(f"debug tracing : {message} : {variable}")
+
+#%% csvCheck() function. Check whether file is CSV
+
+def csvCheck(file_path):
+    _, file_extension = os.path.splitext(file_path)
+    return file_extension.lower() == ".csv"
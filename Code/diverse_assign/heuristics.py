@@ -0,0 +1,147 @@
+#%% Packages
+
+from math import log, ceil, comb, factorial
+
+from .scoring import categoryOffsets
+
+#%% Function determines number of instances to run.
+# Heuristic used to determine number of instances 
+# Heuristic is based on the simulated annealing cooling rate
+# and a target annealing probability 
+# based on a reasonable minimum delta diversity to be detected.
+
+def heuristicEstimator(num_rows, num_groups, num_cols, **kwargs):
+    cooling_schedule = kwargs.get('cooling_schedule', 0.95)
+    exhaust_count = comb(num_rows, num_rows // num_groups)
+    
+    # Standard parameter obtained from experiments.
+    # Standard parameter has 5 groups and 6 columns or features
+    # Standard parameter is the scale of known sensitivity response to known ADS
+    standard_ads_size = 5 * 6
+    
+    # Scale of data's ADS
+    data_ads_size = num_groups * num_cols
+    
+    # Relative scale of data's ADS to defined paramater
+    relative_ads_size = data_ads_size / standard_ads_size
+    
+    # Scaling delta diversity sensitivity to relative scale
+    given_delta_diversity = -0.001 / (relative_ads_size)
+    
+    # Target annealing probability at the final simulated annealing iteration
+    target_probability = 0.03 
+    
+    # Heuristic to determine number of instances
+    power_value = log(target_probability)
+    target_temperature = given_delta_diversity / power_value
+    instance_count = log(target_temperature, cooling_schedule)
+    instance_count = ceil(instance_count) # see below note
+    ## The number of instances and target temperature will autoscale with: 
+    ## - target probability
+    ## - relative ADS scale
+    ## - target delta diversity sensitivity
+    ## The instances count refers to the number of iterations for simulated annealing 
+    ## deteremined by the temperature which depends on the target annealing probability
+    ## Standard parameter is the desired ratio of delta diversity to grand sum ADS
+    ## Cooling schedule is fixed at 0.95
+    ## Why scaling: grand sum ADS scales and delta diveristy scales with num_group and num_cols.
+    ## Hence, scaling is required for constant sentivity performance. 
+    
+    # Exhaust_count: Number of assignment combinations if explored exhaustivel
+    # Below is for rare situaitons when the exhaustive number is smaller than the simulated annealing
+    # In this situation, heuristic will prefer using the exhaustive number of iterations.
+    if instance_count > exhaust_count:
+        instance_count = exhaust_count
+    
+    return exhaust_count, instance_count
+    
+#%% heuristicExactTreeSize() function. Number of distinct assignments of num_rows rows 
+### into num_groups groups, with the group sizes of sequential grouping.
+### Groups of the same size are interchangeable, hence counted once.
+### Estimates the size of the search tree of exactSolver(), before rows with identical codes 
+### and pruning cut it down. Used to pick exactSolver() for small instances. See exactSelector()
+
+def heuristicExactTreeSize(num_rows, num_groups):
+    small_size, large_count = divmod(num_rows, num_groups)
+    small_count = num_groups - large_count
+    
+    tree_size = factorial(num_rows)
+    tree_size //= factorial(small_size + 1) ** large_count * factorial(large_count)
+    tree_size //= factorial(small_size) ** small_count * factorial(small_count)
+    
+    return tree_size
+    
+#%% heuristicDominanceDetector() function is a heuristic to relax 
+### the no-homogenous-feature-in-any-group constraint.
+### Heuristic will enable relax if an element in the feature is too dominant
+### hence impossible to split the groups without seeing a homogenous feature
+### If too dominant, returns check_homogen_flag = FALSE
+### Missing values count as a category, as in encodeData()
+
+def heuristicDominanceDetector(data, num_groups):
+    
+    dominanceHeursitic = lambda row_total_count, attribute_count_n, num_groups: \
+        ((row_total_count - attribute_count_n) // num_groups) <= 0
+    
+    data = data.copy(deep=True)
+    column_lst = data.columns
+    row_total_count = len(data)
+    
+    dominant_flag = False
+    while dominant_flag == False:
+        
+        for column in column_lst:
+            column_attribute_count = data.groupby(column, dropna = False).size()
+            column_attribute_len = len(column_attribute_count)
+    
+            # Skips columns which have all unique rows
+            if column_attribute_len != row_total_count:
+            
+                for attribute_row in range(column_attribute_len):   
+                    attribute_count_n = column_attribute_count.iloc[attribute_row]
+                    
+                    # Dominance heuristic
+                    if dominanceHeursitic(row_total_count, 
+                                          attribute_count_n, 
+                                          num_groups):
+                        dominant_flag = True
+                        break
+                if dominant_flag == True:
+                    break
+            if dominant_flag == True:
+                break           
+        break
+    
+    if dominant_flag == True:
+        check_homogen_flag = False
+        return check_homogen_flag 
+    else:
+        check_homogen_flag = True
+        return check_homogen_flag
+
+#%% heuristicDominanceDetectorEncoded() function. 
+### Same heuristic as heuristicDominanceDetector(), 
+### on the population category counts of the encoded data (e.g. summed up from a count table)
+### instead of the DataFrame.
+
+def heuristicDominanceDetectorEncoded(population_count, num_categories, num_rows, num_groups):
+    
+    dominanceHeursitic = lambda row_total_count, attribute_count_n, num_groups: \
+        ((row_total_count - attribute_count_n) // num_groups) <= 0
+    
+    offset_arr = categoryOffsets(num_categories)
+    
+    for column_number, column_attribute_len in enumerate(num_categories):
+        # Skips columns which have all unique rows
+        if column_attribute_len == num_rows:
+            continue
+        
+        offset = offset_arr[column_number]
+        column_attribute_count = population_count[offset:offset + column_attribute_len]
+        
+        if dominanceHeursitic(num_rows, column_attribute_count, num_groups).any():
+            check_homogen_flag = False
+            return check_homogen_flag
+    
+    check_homogen_flag = True
+    return check_homogen_flag
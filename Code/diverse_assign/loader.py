@@ -0,0 +1,105 @@
+#%% Packages
+
+import os
+import csv
+
+from .scoring import codeMatrix
+
+#%% Lightweight CSV loader. Reads and writes CSV files with the csv module, without pandas.
+# For short jobs on small rosters, where importing pandas takes most of the run time.
+#
+# The categories are those of pandas.read_csv() and encodeData(), so that a file scores the same
+# whichever loader reads it:
+#     - missing values (the default NA spellings of pandas.read_csv(), e.g. "", "NA", "nan", "NULL") 
+#       are one category
+#     - a column whose other values are all numbers is read as numbers: "1", "1.0" and "1e0" are 1 category
+#     - a column whose other values are all "True" or "False" (any case pandas accepts) is read as booleans
+#     - in any other column, every value is its own text: "1" and "1.0" are 2 categories, as in pandas
+# Integers beyond 2 ** 53 are compared as floats.
+# The rows are written back unchanged, with the assigned_group column added.
+
+# Missing values of pandas.read_csv() (keep_default_na = True)
+na_value_set = {'', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', 
+                '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'}
+
+bool_value_dict = {'True': True, 'TRUE': True, 'true': True, 
+                   'False': False, 'FALSE': False, 'false': False}
+
+#%% parseValue() function. Number of a CSV value, or None if it is not a number
+# As pandas.read_csv(): no digit-group underscores, no surrounding text
+
+def parseValue(value):
+    if '_' in value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+#%% columnCategories() function. Category of each value of a column, as pandas.read_csv() would read it.
+# Returns the key of each value (None if missing), and the sorted categories, missing last, as encodeData()
+
+def columnCategories(column_values):
+    present_lst = [value for value in column_values if value not in na_value_set]
+    
+    if len(present_lst) > 0 and all(value in bool_value_dict for value in present_lst):
+        parse_dict = bool_value_dict
+    else:
+        parse_dict = {value: parseValue(value) for value in set(present_lst)}
+        if any(number is None for number in parse_dict.values()):
+            # Text column: every value is its own category
+            parse_dict = {value: value for value in parse_dict}
+    
+    key_lst = [None if value in na_value_set else parse_dict[value] for value in column_values]
+    
+    categories = sorted(set(key for key in key_lst if key is not None))
+    if len(categories) < len(set(key_lst)):
+        categories.append(None)
+    
+    return key_lst, categories
+
+#%% readCsvEncoded() function. Reads a CSV file straight into the integer code matrix.
+# Returns:
+#     column_lst: column names (the header row)
+#     row_lst: rows of the file, as lists of text
+#     encoded_data: as encodeData()
+
+def readCsvEncoded(file_path):
+    with open(file_path, newline = '', encoding = 'utf-8-sig') as file:
+        reader = csv.reader(file)
+        column_lst = next(reader, [])
+        row_lst = [row for row in reader if len(row) > 0]
+    
+    num_cols = len(column_lst)
+    for row_number, row in enumerate(row_lst, start = 2):
+        if len(row) != num_cols:
+            raise ValueError(f"Line {row_number} of {file_path} has {len(row)} values, instead of {num_cols}.")
+    
+    # Values of each column
+    if len(row_lst) > 0:
+        column_values_lst = zip(*row_lst)
+    else:
+        column_values_lst = [() for _ in column_lst]
+    
+    codes_lst = []
+    category_lst = []
+    for column_values in column_values_lst:
+        key_lst, categories = columnCategories(column_values)
+        code_dict = {category: code for code, category in enumerate(categories)}
+        codes_lst.append([code_dict[key] for key in key_lst])
+        category_lst.append(categories)
+    
+    encoded_data = codeMatrix(codes_lst, category_lst, len(row_lst))
+    
+    return column_lst, row_lst, encoded_data
+
+#%% writeCsvAssigned() function. Writes the rows, with their assigned group, into a CSV file
+
+def writeCsvAssigned(file_path, column_lst, row_lst, group_labels):
+    with open(file_path, 'w', newline = '', encoding = 'utf-8') as file:
+        # Line endings as pandas.DataFrame.to_csv()
+        writerMethod = csv.writer(file, lineterminator = os.linesep)
+        writerMethod.writerow(list(column_lst) + ['assigned_group'])
+        
+        for row, assigned_group in zip(row_lst, group_labels):
+            writerMethod.writerow(row + [int(assigned_group)])
@@ -0,0 +1,142 @@
+#%% Packages
+
+from numpy import arange, empty, tile
+from numpy import log as log_np
+from numpy.random import default_rng, SeedSequence
+
+#%% class RandomStream. Random numbers of the search, from a NumPy Generator.
+# Given to assigner(), iterator() and parallelIterator() as random_stream.
+# Replaces the random module, one call per decision, with numbers drawn in blocks:
+#     - uniform(), randrange(): from a block of block_size uniforms
+#     - logUniform(): from a block of log(uniform). Simulated annealing accepts a change
+#       in diversity delta < 0 if uniform < exp(delta / temperature), i.e. if
+#       logUniform() < delta / temperature. Each decision is then one comparison, without exp()
+#     - permutation(), shuffle(): permutations of the same length are drawn
+#       block_size // length at a time (at least 1)
+#
+# The same seed (an int, or a numpy SeedSequence) gives the same numbers.
+# Default: a fresh seed from the operating system.
+# spawn(): independent seeds for other streams, e.g. one per restart of parallelIterator(). 
+# Spawned in the same order from the same seed, they are the same seeds
+# getState() and setState(): state of the stream, for checkpoints (see checkpoint.py). 
+# Each block keeps the generator state it was drawn from. The state of the stream is then 
+# the generator state, and the state and position of each block, without the blocks: 
+# setState() draws the blocks again
+
+class RandomStream:
+    def __init__(self, seed = None, **kwargs):
+        self.block_size = kwargs.get('block_size', 4096)
+        
+        if isinstance(seed, SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = SeedSequence(seed)
+        self.generator = default_rng(self.seed_sequence)
+        
+        self.uniform_arr = empty(0)
+        self.uniform_state = None
+        self.uniform_position = 0
+        self.log_uniform_arr = empty(0)
+        self.log_uniform_state = None
+        self.log_uniform_position = 0
+        self.permutation_dict = {}
+    
+    # num_seeds child SeedSequences, each the seed of an independent RandomStream
+    def spawn(self, num_seeds):
+        return self.seed_sequence.spawn(num_seeds)
+    
+    # Blocks of random numbers, each drawn from the generator state given
+    def uniformBlock(self, generator_state):
+        self.generator.bit_generator.state = generator_state
+        return self.generator.random(self.block_size)
+    
+    def logUniformBlock(self, generator_state):
+        self.generator.bit_generator.state = generator_state
+        return log_np(1.0 - self.generator.random(self.block_size))
+    
+    def permutationBlock(self, generator_state, n):
+        self.generator.bit_generator.state = generator_state
+        num_permutations = max(1, self.block_size // max(n, 1))
+        return self.generator.permuted(tile(arange(n), (num_permutations, 1)), axis = 1)
+    
+    # Uniform in [0, 1)
+    def uniform(self):
+        if self.uniform_position == len(self.uniform_arr):
+            self.uniform_state = self.generator.bit_generator.state
+            self.uniform_arr = self.uniformBlock(self.uniform_state)
+            self.uniform_position = 0
+        
+        self.uniform_position += 1
+        return float(self.uniform_arr[self.uniform_position - 1])
+    
+    # log of a uniform in (0, 1]
+    def logUniform(self):
+        if self.log_uniform_position == len(self.log_uniform_arr):
+            self.log_uniform_state = self.generator.bit_generator.state
+            self.log_uniform_arr = self.logUniformBlock(self.log_uniform_state)
+            self.log_uniform_position = 0
+        
+        self.log_uniform_position += 1
+        return float(self.log_uniform_arr[self.log_uniform_position - 1])
+    
+    # Integer in [0, n)
+    def randrange(self, n):
+        return min(int(self.uniform() * n), n - 1)
+    
+    # k different integers in [0, n), in random order. For small k
+    def sample(self, n, k):
+        if 2 * k > n:
+            return self.permutation(n)[:k].tolist()
+        
+        pick_lst = []
+        while len(pick_lst) < k:
+            pick = self.randrange(n)
+            if pick not in pick_lst:
+                pick_lst.append(pick)
+        return pick_lst
+    
+    # Random permutation of 0 to n - 1
+    def permutation(self, n):
+        permutation_table, permutation_state, position = self.permutation_dict.get(n, (None, None, 0))
+        
+        if permutation_table is None or position == len(permutation_table):
+            permutation_state = self.generator.bit_generator.state
+            permutation_table = self.permutationBlock(permutation_state, n)
+            position = 0
+        
+        self.permutation_dict[n] = (permutation_table, permutation_state, position + 1)
+        return permutation_table[position].copy()
+    
+    # Shuffle a list or array in place
+    def shuffle(self, item_lst):
+        shuffled_lst = [item_lst[pick] for pick in self.permutation(len(item_lst))]
+        item_lst[:] = shuffled_lst
+    
+    def getState(self):
+        return {'generator': self.generator.bit_generator.state,
+                'uniform_state': self.uniform_state,
+                'uniform_position': self.uniform_position,
+                'log_uniform_state': self.log_uniform_state,
+                'log_uniform_position': self.log_uniform_position,
+                'permutation_dict': {n: (permutation_state, position) 
+                                     for n, (permutation_table, permutation_state, position) in self.permutation_dict.items()}}
+    
+    def setState(self, state_dict):
+        self.uniform_state = state_dict['uniform_state']
+        self.uniform_position = state_dict['uniform_position']
+        if self.uniform_state is None:
+            self.uniform_arr = empty(0)
+        else:
+            self.uniform_arr = self.uniformBlock(self.uniform_state)
+        
+        self.log_uniform_state = state_dict['log_uniform_state']
+        self.log_uniform_position = state_dict['log_uniform_position']
+        if self.log_uniform_state is None:
+            self.log_uniform_arr = empty(0)
+        else:
+            self.log_uniform_arr = self.logUniformBlock(self.log_uniform_state)
+        
+        self.permutation_dict = {n: (self.permutationBlock(permutation_state, n), permutation_state, position) 
+                                 for n, (permutation_state, position) in state_dict['permutation_dict'].items()}
+        
+        self.generator.bit_generator.state = state_dict['generator']
@@ -0,0 +1,669 @@
+#%% Packages
+
+from numpy import arange, array, empty, zeros, ones, bincount, cumsum, add, argsort, split, unique, flatnonzero, minimum, uint8, uint16, uint32
+from numpy import log as log_np
+from math import log
+
+#%% weightModfier() function. 
+# Goal: generates weights to balance the influence of each column on the 
+# grand sum diversity.
+#
+# Weights will scale the column Shannon-Weiner Index in proportion of the 
+# Aggregate Diversity Score (ADS).
+#
+# Weights will scale to the max proportion.
+#
+# However, it is unclear if this is the actual effect. Needs further study.
+#
+# This is because the sum of the Shannon-Weiner Index 
+# is not the same as that of the whole population.
+#
+# Maximising the Shannon-Weiner Index in a group means 
+# minimising the dominance of any category within a feature in that group.
+# It is a small sample size, sensitive to dominance.
+# In contrast, the population is a larger than a sample. 
+# It is much less sensitive to dominance.
+
+### FOR FUTURE USE. NOT USED IN DIVERSEASSIGN.v.1.0.1
+
+def weightModfier(data):
+    # Obtain Shannon-Weiner Index for each column.
+    obtain = calculateDiversity(data, return_shannon_weiner_index = True)
+    ads, swi_dict = obtain[0], obtain[1]
+        
+    # largest proportion of swi in each column of the dataset ADS
+    max_proportion = max(swi_dict.values()) / ads
+    # debug_print('max(swi_dict.values()), ads, max_proportion', (max(swi_dict.values()), ads, max_proportion), debug_flag)
+  
+    # Initialise dict to calculate and store weight for each column
+    weight_column_dict = {}
+    for column, swi in swi_dict.items():
+        if swi == 0: 
+            weight_column_dict[column] = 0
+        else:
+            weight = max_proportion / (swi_dict[column] / ads)
+            weight_column_dict[column] = weight
+            
+    return weight_column_dict
+
+#%% calculateDiversity() function. To calculate a diversity of a dataset.
+# Weights balance the influence of all columns on the Aggregate Diversity Score (ADS)
+# Missing values are counted as their own category, as in encodeData()
+
+def calculateDiversity(data, **kwargs):
+    return_shannon_weiner_index = kwargs.get('return_shannon_weiner_index', False)
+    weight_modifier_dict = kwargs.get('weight_modifier_dict', None)
+    shannonEntropyFormula = lambda p_i: -p_i * log(p_i)
+    # If return_shannon_weiner_index is True, 
+    # store and return the Shannon Weiner Index of each column
+    if return_shannon_weiner_index is True:
+        return_swi_flag = True
+        
+        # Intialise dict to store Shannon Weiner Index of each column
+        swi_dict = {}
+        
+    else:
+        return_swi_flag = False
+    
+    # If weight modifiers are present, retrieve the dataset weights.
+    if weight_modifier_dict is None:
+        weight_modifier_dict = {}
+    else:
+        weight_modifier_dict = weight_modifier_dict
+    
+    column_lst = data.columns
+    row_total_count = len(data)
+    total_count_N = row_total_count
+
+    # Calculate Aggregate Diversity Score (ads) of dataset.
+    ads = 0
+    
+    for column in column_lst:
+        column_attribute_count = data.groupby(column, dropna = False).size()
+        column_attribute_len =  len(column_attribute_count)
+        
+        shannon_weiner_index = 0   
+        # shorten Shannon-Weiner Index calculation for columns which have all unique rows
+        if column_attribute_len == row_total_count:
+            p_i = 1 / total_count_N
+            h = shannonEntropyFormula(p_i)
+            h = h  * row_total_count
+            shannon_weiner_index += h
+            
+        elif column_attribute_len != row_total_count:
+            # shorten Shannon-Weiner Index calculation for homogenous column 
+            if column_attribute_len == 1:
+                shannon_weiner_index = 0
+            # calculate Shannon-Weiner Index for non-homogenous column 
+            else:
+                for attribute_row in range(column_attribute_len):
+                    attribute_count_n = column_attribute_count.iloc[attribute_row]
+                    p_i = attribute_count_n / total_count_N
+                    h = shannonEntropyFormula(p_i)
+                    # debug_print("attribute_count_n", attribute_count_n, debug_flag)
+                    # debug_print("total_count_N", total_count_N, debug_flag)
+                    # debug_print("p_i", p_i, debug_flag)
+                    # debug_print("h", h, debug_flag)
+                    shannon_weiner_index += h
+                
+        # debug_print("shannon_weiner_index", shannon_weiner_index, debug_flag)
+        shannon_weiner_index = shannon_weiner_index * weight_modifier_dict.get(column, 1)
+                
+        if return_swi_flag is True:
+            swi_dict[column] = shannon_weiner_index
+        
+        ads += shannon_weiner_index
+    
+    if return_swi_flag is True:
+        # debug_print('column, swi_dict', (column, swi_dict), debug_flag)
+        return ads, swi_dict
+        
+    else:
+        return ads
+    
+#%% encodeData() function. One-time encoding of a dataset into an integer code matrix.
+# Each column's categories are replaced by integer codes 0, 1, 2, ... 
+# The code matrix has one row per row of data and one column per feature.
+# The smallest unsigned integer type that fits every column is used 
+# (uint8 up to 256 categories, uint16 up to 65,536 categories).
+#
+# Missing values are kept as their own category.
+#
+# Returns:
+#     code_matrix: num_rows x num_cols integer code matrix
+#     num_categories: number of categories in each column
+#     category_lst: list of the category labels of each column, indexed by code
+
+def encodeData(data):
+    # pandas is only imported when data is a DataFrame. See loader.py for CSV files without pandas
+    from pandas import factorize
+    
+    column_lst = data.columns
+    num_rows = len(data)
+    
+    codes_lst = []
+    category_lst = []
+    for column in column_lst:
+        codes, categories = factorize(data[column], sort = True, use_na_sentinel = False)
+        codes_lst.append(codes)
+        category_lst.append(list(categories))
+    
+    return codeMatrix(codes_lst, category_lst, num_rows)
+
+#%% codeMatrix() function. Packs the codes of each column into the integer code matrix.
+# Uses the smallest unsigned integer type that fits the most categories in a column.
+# Shared by encodeData() and the CSV loader (see loader.py)
+
+def codeMatrix(codes_lst, category_lst, num_rows):
+    num_cols = len(codes_lst)
+    num_categories = [len(categories) for categories in category_lst]
+    max_categories = max(num_categories, default = 0)
+    
+    if max_categories <= 2 ** 8:
+        dtype = uint8
+    elif max_categories <= 2 ** 16:
+        dtype = uint16
+    else:
+        dtype = uint32
+    
+    code_matrix = empty((num_rows, num_cols), dtype = dtype)
+    for column_number, codes in enumerate(codes_lst):
+        code_matrix[:, column_number] = codes
+        
+    num_categories = array(num_categories, dtype = 'intp')
+    
+    return code_matrix, num_categories, category_lst
+
+#%% weightArray() function. Lines up the weight modifiers with the columns of the code matrix.
+
+def weightArray(column_lst, weight_modifier_dict):
+    if weight_modifier_dict is None:
+        weight_modifier_dict = {}
+    
+    weight_arr = empty(len(column_lst))
+    for column_number, column in enumerate(column_lst):
+        weight_arr[column_number] = weight_modifier_dict.get(column, 1)
+        
+    return weight_arr
+
+#%% xlogxTable() function. Precomputed c * log(c) lookup table.
+# Every count seen in a group is a small integer, bounded by the size of the largest group.
+# Hence c * log(c) of every count is looked up, instead of calculated.
+#
+# With the table, the Shannon-Weiner Index of a column of a group with n rows is
+#     -sum(p_i * log(p_i)) = log(n) - sum(c * log(c)) / n
+#                          = (n * log(n) - sum(c * log(c))) / n
+# where c is the count of each category. 
+# The last form keeps a homogenous column at exactly 0.
+
+def xlogxTable(max_count):
+    count_arr = arange(1, max_count + 1, dtype = float)
+    xlogx_table = zeros(max_count + 1)
+    xlogx_table[1:] = count_arr * log_np(count_arr)
+    return xlogx_table
+
+#%% calculateDiversityEncoded() function. NumPy scoring path of calculateDiversity().
+# Calculates the Aggregate Diversity Score (ADS) of a subset of the code matrix.
+# Gives the same score as calculateDiversity() on the same rows, missing values included.
+#
+# Every column is counted in one np.bincount() call:
+# codes of each column are shifted by an offset, so that 
+# the categories of all columns sit side by side in one count vector.
+# The counts are then scored with the c * log(c) table (see xlogxTable()).
+
+def calculateDiversityEncoded(code_matrix, num_categories, **kwargs):
+    return_shannon_weiner_index = kwargs.get('return_shannon_weiner_index', False)
+    weight_arr = kwargs.get('weight_arr', None)
+    xlogx_table = kwargs.get('xlogx_table', None)
+    
+    row_total_count, num_cols = code_matrix.shape
+    
+    if row_total_count == 0 or num_cols == 0:
+        swi_arr = zeros(num_cols)
+        
+    else:
+        # Table must cover the count of a category taking up every row
+        if xlogx_table is None or len(xlogx_table) <= row_total_count:
+            xlogx_table = xlogxTable(row_total_count)
+            
+        offset_arr = categoryOffsets(num_categories)
+        
+        attribute_count = bincount((code_matrix + offset_arr).ravel(), 
+                                   minlength = int(num_categories.sum()))
+        
+        # Sum up c * log(c) of the categories of each column
+        sum_xlogx = add.reduceat(xlogx_table[attribute_count], offset_arr)
+        swi_arr = (xlogx_table[row_total_count] - sum_xlogx) / row_total_count
+        
+    if weight_arr is not None:
+        swi_arr = swi_arr * weight_arr
+    
+    ads = float(swi_arr.sum())
+    
+    if return_shannon_weiner_index is True:
+        return ads, swi_arr
+    else:
+        return ads
+    
+#%% categoryOffsets() function. 
+# Offset of each column's categories when the categories of all columns 
+# are laid side by side in one count vector.
+# A code matrix plus the offsets gives the "flat" codes of the rows.
+
+def categoryOffsets(num_categories):
+    offset_arr = zeros(len(num_categories), dtype = 'intp')
+    offset_arr[1:] = cumsum(num_categories)[:-1]
+    return offset_arr
+
+#%% Count table functions. Maintained group x feature x category counts.
+# The count table has one row per group. 
+# Each row holds the category counts of every feature of that group, 
+# laid out side by side using the flat codes (see categoryOffsets()).
+#
+# A swap of row i (in group a) and row j (in group b) only changes 
+# the counts of the categories where row i and row j differ.
+# Hence the change in diversity of a swap is found by touching only those counts,
+# instead of re-calculating the diversity of both groups.
+#
+# Note: group_index_arr and group numbers here are 0-based 
+# (assigned_group - 1).
+
+def buildCountTable(flat_code_matrix, group_index_arr, num_groups, num_categories):
+    num_categories_total = int(num_categories.sum())
+    cell_arr = group_index_arr[:, None] * num_categories_total + flat_code_matrix
+    count_table = bincount(cell_arr.ravel(), minlength = num_groups * num_categories_total)
+    count_table = count_table.reshape(num_groups, num_categories_total)
+    
+    return count_table
+
+# Change in diversity of group a and group b, if row i (in group a) and row j (in group b) swap.
+# flat_codes_i and flat_codes_j are the flat codes of row i and row j.
+# xlogx_lst is the c * log(c) table as a list (see xlogxTable()).
+#
+# Group size n does not change in a swap, so the log(n) term cancels out.
+# Change in diversity of a column is -(change in sum(c * log(c))) / n
+def swapDeltaDiversity(count_table, group_size_arr, flat_codes_i, flat_codes_j, group_a, group_b, weight_arr, xlogx_lst):
+    count_a = count_table[group_a]
+    count_b = count_table[group_b]
+    size_a = group_size_arr[group_a]
+    size_b = group_size_arr[group_b]
+    
+    delta_xlogx_a = 0.0
+    delta_xlogx_b = 0.0
+    for column_number, (code_i, code_j) in enumerate(zip(flat_codes_i, flat_codes_j)):
+        # Same category: swap does not change this column
+        if code_i == code_j:
+            continue
+        
+        # Group a loses category code_i, gains category code_j
+        count_ai = count_a[code_i]
+        count_aj = count_a[code_j]
+        delta_a = (xlogx_lst[count_ai - 1] - xlogx_lst[count_ai]
+                   + xlogx_lst[count_aj + 1] - xlogx_lst[count_aj])
+        
+        # Group b loses category code_j, gains category code_i
+        count_bj = count_b[code_j]
+        count_bi = count_b[code_i]
+        delta_b = (xlogx_lst[count_bj - 1] - xlogx_lst[count_bj]
+                   + xlogx_lst[count_bi + 1] - xlogx_lst[count_bi])
+        
+        weight = weight_arr[column_number]
+        delta_xlogx_a += delta_a * weight
+        delta_xlogx_b += delta_b * weight
+        
+    return -delta_xlogx_a / size_a, -delta_xlogx_b / size_b
+
+# Apply the swap of row i (in group a) and row j (in group b) to the count table
+def swapCountTable(count_table, flat_codes_i, flat_codes_j, group_a, group_b):
+    count_table[group_a, flat_codes_i] -= 1
+    count_table[group_a, flat_codes_j] += 1
+    count_table[group_b, flat_codes_j] -= 1
+    count_table[group_b, flat_codes_i] += 1
+
+# Change in weighted sum(c * log(c)) of a group that loses a row of flat_codes_lose, 
+# and gains a row of flat_codes_gain. count_g is the group's row of the count table
+def exchangeDeltaXlogx(count_g, flat_codes_lose, flat_codes_gain, weight_arr, xlogx_lst):
+    delta_xlogx = 0.0
+    for column_number, (code_lose, code_gain) in enumerate(zip(flat_codes_lose, flat_codes_gain)):
+        # Same category: this column does not change
+        if code_lose == code_gain:
+            continue
+        
+        count_lose = count_g[code_lose]
+        count_gain = count_g[code_gain]
+        delta_xlogx += (xlogx_lst[count_lose - 1] - xlogx_lst[count_lose]
+                        + xlogx_lst[count_gain + 1] - xlogx_lst[count_gain]) * weight_arr[column_number]
+    
+    return delta_xlogx
+
+# Change in diversity of a rotation of 3 rows across 3 groups: 
+# row i (in group a) moves to group b, row j (in group b) to group c, row k (in group c) to group a.
+# Each group loses one row and gains another, hence keeps its size. 
+# Returns the change in diversity of all 3 groups
+def rotationDeltaDiversity(count_table, group_size_arr, flat_codes_i, flat_codes_j, flat_codes_k, group_a, group_b, group_c, weight_arr, xlogx_lst):
+    delta_xlogx_a = exchangeDeltaXlogx(count_table[group_a], flat_codes_i, flat_codes_k, weight_arr, xlogx_lst)
+    delta_xlogx_b = exchangeDeltaXlogx(count_table[group_b], flat_codes_j, flat_codes_i, weight_arr, xlogx_lst)
+    delta_xlogx_c = exchangeDeltaXlogx(count_table[group_c], flat_codes_k, flat_codes_j, weight_arr, xlogx_lst)
+    
+    return (-delta_xlogx_a / group_size_arr[group_a] 
+            - delta_xlogx_b / group_size_arr[group_b] 
+            - delta_xlogx_c / group_size_arr[group_c])
+
+#%% Distinct table functions. Maintained group x feature distinct-category counts.
+# The distinct table holds the number of categories present in each column of each group.
+# A column is homogenous in a group, if its distinct count is 1.
+# Maintained alongside the count table, so that the no-homogenous-feature constraint 
+# is checked in O(number of columns), without materialising the groups.
+
+def buildDistinctTable(count_table, num_categories):
+    num_groups = len(count_table)
+    if len(num_categories) == 0:
+        return zeros((num_groups, 0), dtype = 'intp')
+    
+    distinct_table = add.reduceat(count_table > 0, categoryOffsets(num_categories), axis = 1)
+    
+    return distinct_table
+
+# Whether swapping row i (in group a) and row j (in group b) 
+# makes any column homogenous in either group
+def swapHomogenCheck(count_table, distinct_table, flat_codes_i, flat_codes_j, group_a, group_b):
+    count_a = count_table[group_a]
+    count_b = count_table[group_b]
+    distinct_a = distinct_table[group_a]
+    distinct_b = distinct_table[group_b]
+    
+    for column_number, (code_i, code_j) in enumerate(zip(flat_codes_i, flat_codes_j)):
+        # Same category: swap does not change this column
+        if code_i == code_j:
+            continue
+        
+        # Group a loses category code_i, gains category code_j
+        distinct_count_a = distinct_a[column_number] - (count_a[code_i] == 1) + (count_a[code_j] == 0)
+        if distinct_count_a == 1:
+            return True
+        
+        # Group b loses category code_j, gains category code_i
+        distinct_count_b = distinct_b[column_number] - (count_b[code_j] == 1) + (count_b[code_i] == 0)
+        if distinct_count_b == 1:
+            return True
+        
+    return False
+
+# Whether a group that loses a row of flat_codes_lose, and gains a row of flat_codes_gain, 
+# has a homogenous column afterwards
+def exchangeHomogenCheck(count_g, distinct_g, flat_codes_lose, flat_codes_gain):
+    for column_number, (code_lose, code_gain) in enumerate(zip(flat_codes_lose, flat_codes_gain)):
+        # Same category: this column does not change
+        if code_lose == code_gain:
+            continue
+        
+        distinct_count = distinct_g[column_number] - (count_g[code_lose] == 1) + (count_g[code_gain] == 0)
+        if distinct_count == 1:
+            return True
+    
+    return False
+
+# Whether the rotation of row i (in group a), row j (in group b) and row k (in group c) 
+# makes any column homogenous in any of the 3 groups. See rotationDeltaDiversity()
+def rotationHomogenCheck(count_table, distinct_table, flat_codes_i, flat_codes_j, flat_codes_k, group_a, group_b, group_c):
+    return (exchangeHomogenCheck(count_table[group_a], distinct_table[group_a], flat_codes_i, flat_codes_k) 
+            or exchangeHomogenCheck(count_table[group_b], distinct_table[group_b], flat_codes_j, flat_codes_i) 
+            or exchangeHomogenCheck(count_table[group_c], distinct_table[group_c], flat_codes_k, flat_codes_j))
+
+# Apply the swap of row i (in group a) and row j (in group b) to the distinct table.
+# To be called after swapCountTable()
+def swapDistinctTable(count_table, distinct_table, flat_codes_i, flat_codes_j, group_a, group_b):
+    differ_arr = flat_codes_i != flat_codes_j
+    
+    # Category lost (count now 0) or gained (count now 1) by each group
+    distinct_table[group_a] += (differ_arr & (count_table[group_a, flat_codes_j] == 1)) 
+    distinct_table[group_a] -= (differ_arr & (count_table[group_a, flat_codes_i] == 0))
+    distinct_table[group_b] += (differ_arr & (count_table[group_b, flat_codes_i] == 1))
+    distinct_table[group_b] -= (differ_arr & (count_table[group_b, flat_codes_j] == 0))
+
+#%% partnerDeltaDiversity() function. Vectorised swapDeltaDiversity().
+# Change in diversity of swapping row i with every row in every other group, in one NumPy operation.
+# group_flag_arr: only the rows in the groups flagged True (not the group of row i). Default: every other group
+#
+# Returns:
+#     candidate_arr: the rows in every other group
+#     delta_arr: change in diversity of swapping row i with each row in candidate_arr
+#     homogen_arr: whether the swap makes any column homogenous in either group
+
+def partnerDeltaDiversity(count_table, group_size_arr, flat_code_matrix, group_index_arr, row_i, weight_arr, xlogx_table, group_flag_arr = None):
+    group_a = group_index_arr[row_i]
+    
+    if group_flag_arr is None:
+        candidate_arr = flatnonzero(group_index_arr != group_a)
+    else:
+        candidate_arr = flatnonzero(group_flag_arr[group_index_arr] & (group_index_arr != group_a))
+    
+    delta_arr, homogen_arr = exchangeDeltaDiversity(count_table, 
+                                                    group_size_arr, 
+                                                    flat_code_matrix[row_i], 
+                                                    group_a, 
+                                                    flat_code_matrix[candidate_arr], 
+                                                    group_index_arr[candidate_arr], 
+                                                    weight_arr, 
+                                                    xlogx_table)
+    
+    return candidate_arr, delta_arr, homogen_arr
+
+#%% exchangeDeltaDiversity() function. 
+# Change in diversity of swapping codes_i (in group a) 
+# with each row of codes_j (in the matching group of group_b_arr), in one NumPy operation.
+# Used by partnerDeltaDiversity() (rows) and profilePartnerDeltaDiversity() (profiles).
+#
+# A swap makes a column homogenous in group a, if the category gained by group a 
+# then takes up every row of group a. Likewise for group b.
+
+def exchangeDeltaDiversity(count_table, group_size_arr, codes_i, group_a, codes_j, group_b_arr, weight_arr, xlogx_table):
+    size_a = group_size_arr[group_a]
+    size_b_arr = group_size_arr[group_b_arr]
+    
+    # Only columns where the categories differ are changed by a swap
+    differ_arr = codes_j != codes_i
+    
+    # Group a loses category codes_i, gains category codes_j
+    count_a = count_table[group_a]
+    count_ai = count_a[codes_i]
+    count_aj = count_a[codes_j]
+    delta_xlogx_a = (xlogx_table[count_ai - 1] - xlogx_table[count_ai] 
+                     + xlogx_table[count_aj + 1] - xlogx_table[count_aj])
+    
+    # Group b loses category codes_j, gains category codes_i
+    count_bj = count_table[group_b_arr[:, None], codes_j]
+    count_bi = count_table[group_b_arr[:, None], codes_i]
+    delta_xlogx_b = (xlogx_table[count_bj - 1] - xlogx_table[count_bj] 
+                     + xlogx_table[count_bi + 1] - xlogx_table[count_bi])
+    
+    delta_arr = (-((delta_xlogx_a * differ_arr) @ weight_arr) / size_a 
+                 - ((delta_xlogx_b * differ_arr) @ weight_arr) / size_b_arr)
+    
+    homogen_arr = (differ_arr & ((count_aj + 1 == size_a) 
+                                 | (count_bi + 1 == size_b_arr[:, None]))).any(axis = 1)
+    
+    return delta_arr, homogen_arr
+
+#%% pairDeltaDiversity() function. Change in diversity of every swap between 2 groups, in one NumPy operation.
+# Change in diversity of swapping each row of codes_a (in group a) with each row of codes_b (in group b).
+# Used by the Kernighan-Lin refinement of 2 groups. See kernighanLinPass()
+#
+# The change in sum(c * log(c)) of a column of group a splits into a part from the category lost (row of a) 
+# and a part from the category gained (row of b). Both only count if the 2 categories differ.
+#
+# Returns:
+#     delta_table: change in diversity. Shape: rows of codes_a x rows of codes_b
+#     homogen_table: whether the swap makes any column homogenous in either group
+
+def pairDeltaDiversity(count_table, group_size_arr, codes_a, group_a, codes_b, group_b, weight_arr, xlogx_table):
+    size_a = group_size_arr[group_a]
+    size_b = group_size_arr[group_b]
+    count_a = count_table[group_a]
+    count_b = count_table[group_b]
+    
+    # Only columns where the categories differ are changed by a swap
+    differ_stack = codes_a[:, None, :] != codes_b[None, :, :]
+    
+    # Group a loses the category of its row, gains the category of the row of b
+    lose_a = xlogx_table[count_a[codes_a] - 1] - xlogx_table[count_a[codes_a]]
+    gain_a = xlogx_table[count_a[codes_b] + 1] - xlogx_table[count_a[codes_b]]
+    # Group b loses the category of its row, gains the category of the row of a
+    lose_b = xlogx_table[count_b[codes_b] - 1] - xlogx_table[count_b[codes_b]]
+    gain_b = xlogx_table[count_b[codes_a] + 1] - xlogx_table[count_b[codes_a]]
+    
+    delta_table = (-(((lose_a[:, None, :] + gain_a[None, :, :]) * differ_stack) @ weight_arr) / size_a 
+                   - (((gain_b[:, None, :] + lose_b[None, :, :]) * differ_stack) @ weight_arr) / size_b)
+    
+    homogen_table = (differ_stack & ((count_a[codes_b] + 1 == size_a)[None, :, :] 
+                                     | (count_b[codes_a] + 1 == size_b)[:, None, :])).any(axis = 2)
+    
+    return delta_table, homogen_table
+
+#%% pairGainEstimate() function. Separable estimate of the change in diversity of the swaps between 2 groups, 
+# as the D values of Kernighan-Lin: the parts of pairDeltaDiversity() from each row alone, 
+# as if the 2 rows of a swap differed in every column. 
+# The swap of row i of codes_a (in group a) with row j of codes_b (in group b) 
+# is estimated at gain_a_arr[i] + gain_b_arr[j]. 
+# Used to pick the candidate rows of each step of kernighanLinPass(), in O(rows x columns)
+
+def pairGainEstimate(count_table, group_size_arr, codes_a, group_a, codes_b, group_b, weight_arr, xlogx_table):
+    size_a = group_size_arr[group_a]
+    size_b = group_size_arr[group_b]
+    count_a = count_table[group_a]
+    count_b = count_table[group_b]
+    
+    # Row of a: group a loses its category, group b gains it
+    lose_a = xlogx_table[count_a[codes_a] - 1] - xlogx_table[count_a[codes_a]]
+    gain_b = xlogx_table[count_b[codes_a] + 1] - xlogx_table[count_b[codes_a]]
+    # Row of b: group b loses its category, group a gains it
+    lose_b = xlogx_table[count_b[codes_b] - 1] - xlogx_table[count_b[codes_b]]
+    gain_a = xlogx_table[count_a[codes_b] + 1] - xlogx_table[count_a[codes_b]]
+    
+    gain_a_arr = -(lose_a @ weight_arr) / size_a - (gain_b @ weight_arr) / size_b
+    gain_b_arr = -(gain_a @ weight_arr) / size_a - (lose_b @ weight_arr) / size_b
+    
+    return gain_a_arr, gain_b_arr
+
+#%% Profile functions. Search over distinct feature profiles with multiplicities.
+# Rows with identical codes in every column (a "profile") are interchangeable:
+# swapping 2 rows of the same profile changes nothing.
+# Hence the search can be run over "how many rows of profile t go to group g"
+# (the profile table, profiles x groups), instead of over the rows.
+# The rows are dealt back into the groups from the profile table at the end. See AssignmentState.expandProfiles()
+
+# Returns:
+#     profile_index_arr: profile of each row
+#     profile_flat_code_matrix: flat codes of each profile
+#     profile_member_lst: rows of each profile
+def profileEncoder(flat_code_matrix):
+    profile_flat_code_matrix, profile_index_arr = unique(flat_code_matrix, axis = 0, return_inverse = True)
+    profile_index_arr = profile_index_arr.ravel()
+    
+    profile_count = bincount(profile_index_arr, minlength = len(profile_flat_code_matrix))
+    member_arr = argsort(profile_index_arr, kind = 'stable')
+    profile_member_lst = split(member_arr, cumsum(profile_count)[:-1])
+    
+    return profile_index_arr, profile_flat_code_matrix, profile_member_lst
+
+def buildProfileTable(profile_index_arr, group_index_arr, num_profiles, num_groups):
+    cell_arr = profile_index_arr * num_groups + group_index_arr
+    profile_table = bincount(cell_arr, minlength = num_profiles * num_groups)
+    
+    return profile_table.reshape(num_profiles, num_groups)
+
+# Change in diversity of swapping a row of profile t (in group a) with a row of 
+# every other profile in every other group. Vectorised over the occupied cells of the profile table.
+#
+# Returns:
+#     candidate_profile_arr, candidate_group_arr: profile and group of each candidate cell
+#     delta_arr, homogen_arr: as partnerDeltaDiversity()
+def profilePartnerDeltaDiversity(count_table, group_size_arr, profile_flat_code_matrix, profile_table, profile_t, group_a, weight_arr, xlogx_table):
+    occupied_table = profile_table > 0
+    occupied_table[profile_t, :] = False
+    occupied_table[:, group_a] = False
+    candidate_profile_arr, candidate_group_arr = occupied_table.nonzero()
+    
+    delta_arr, homogen_arr = exchangeDeltaDiversity(count_table, 
+                                                    group_size_arr, 
+                                                    profile_flat_code_matrix[profile_t], 
+                                                    group_a, 
+                                                    profile_flat_code_matrix[candidate_profile_arr], 
+                                                    candidate_group_arr, 
+                                                    weight_arr, 
+                                                    xlogx_table)
+    
+    return candidate_profile_arr, candidate_group_arr, delta_arr, homogen_arr
+
+#%% invariantColumnDetector() function. Pre-search analysis of columns that swaps cannot change.
+# A column's contribution to the diversity of a group is fixed by the group size alone, if the column is:
+#     - all-unique (e.g. 'S/n', 'Name'): every row its own category. 
+#       Shannon-Weiner Index of a group of n rows is always log(n)
+#     - homogenous: a single category. 
+#       Shannon-Weiner Index is always 0
+# These columns are removed from the search. 
+# The all-unique columns' constant is added back into the diversity scores.
+#
+# Returns:
+#     keep_arr: columns kept in the search
+#     unique_arr: all-unique columns
+#     constant_arr: homogenous columns
+
+def invariantColumnDetector(num_categories, num_rows):
+    unique_arr = num_categories == num_rows
+    constant_arr = (num_categories == 1) & ~unique_arr
+    keep_arr = ~(unique_arr | constant_arr)
+    
+    return keep_arr, unique_arr, constant_arr
+
+#%% diversityUpperBound() function. Upper bound on the Aggregate Diversity Score (ADS) of any assignment.
+# In every column, the counts of a category in the groups add up to its count in the whole dataset.
+# Since c * log(c) is convex, sum(c * log(c)) over the groups is smallest when the category is 
+# spread as evenly as possible across the groups: q or q + 1 rows in each group, 
+# for q = count in the whole dataset // number of groups.
+# Leaving out that each group's counts must also add up to the group size, each column scores at most
+#     sum of log(n) over the groups - sum(c * log(c) of the even spread) / size of the largest group
+# A group's column also can't score more than log(number of categories), nor log(n).
+# The smaller of the 2 bounds of each column is taken.
+#
+# Reached when the groups are the same size, and every category can be spread evenly at once.
+# Hence an assignment scoring the bound is the best possible. See optimality_gap in iterator()
+# Calculated once, in O(number of rows * number of columns).
+
+def diversityUpperBound(code_matrix, num_categories, group_size_arr, **kwargs):
+    weight_arr = kwargs.get('weight_arr', None)
+    
+    num_rows, num_cols = code_matrix.shape
+    num_groups = len(group_size_arr)
+    
+    if weight_arr is None:
+        weight_arr = ones(num_cols)
+    
+    if num_rows == 0 or num_cols == 0:
+        return 0.0
+    
+    xlogx_table = xlogxTable(num_rows)
+    offset_arr = categoryOffsets(num_categories)
+    population_count = bincount((code_matrix + offset_arr).ravel(), 
+                                minlength = int(num_categories.sum()))
+    
+    # Even spread of each category: q + 1 rows in r groups, q rows in the other groups
+    q_arr, r_arr = divmod(population_count, num_groups)
+    spread_xlogx = r_arr * xlogx_table[q_arr + 1] + (num_groups - r_arr) * xlogx_table[q_arr]
+    sum_xlogx = add.reduceat(spread_xlogx, offset_arr)
+    
+    size_arr = group_size_arr[group_size_arr > 0]
+    spread_bound_arr = log_np(size_arr).sum() - sum_xlogx / size_arr.max()
+    category_bound_arr = log_np(minimum(size_arr[None, :], num_categories[:, None])).sum(axis = 1)
+    
+    return float(minimum(spread_bound_arr, category_bound_arr) @ weight_arr)
+
+#%% optimalityGap() function. How far a diversity score is below the upper bound, 
+# as a fraction of the upper bound. 0 means the score is the best possible.
+# Differences from floating point rounding count as 0
+
+def optimalityGap(diversity, upper_bound):
+    if upper_bound - diversity <= 1e-12 * max(abs(upper_bound), 1):
+        return 0.0
+    
+    return (upper_bound - diversity) / upper_bound
@@ -0,0 +1,1806 @@
+#%% Packages
+
+import os
+from numpy import tile, arange, array, ndarray, argmax, argsort, zeros, ones, where, inf, flatnonzero, sort
+from math import ceil, isqrt
+from collections import deque 
+from time import perf_counter, time
+import signal
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import Event
+from multiprocessing.shared_memory import SharedMemory
+
+from . import helpers
+from .helpers import debug_print
+from .scoring import encodeData, weightArray, diversityUpperBound, optimalityGap
+from .state import AssignmentState
+from .heuristics import heuristicDominanceDetectorEncoded
+from .control import RunControl
+from .rng import RandomStream
+from .checkpoint import dataChecksum, compactLabels, saveCheckpoint, loadCheckpoint
+from .exact import exactSelector, exactIterator
+
+#%% assigner() function to assign and swap groups
+
+#%% pickSwap() function. Picks a swap from a vector of changes in diversity.
+#     - UnclosedAC3 and Pseudorandom: any swap
+#     - Simulated annealing: the swap with the largest increase in diversity, if any, 
+#       rejected by probability exp(-delta_diversity / temperature), as in the deque partner search. 
+#       A swap that lowers the diversity is never picked
+#     - Otherwise: the swap with the largest increase in diversity, if any
+# Returns the position of the swap in delta_arr, or None for no swap
+
+def pickSwap(delta_arr, randomise_flag, simulated_annealing_flag, temperature, random_stream):
+    if len(delta_arr) == 0:
+        return None
+    
+    if randomise_flag == True:
+        # accept whatever swap
+        return random_stream.randrange(len(delta_arr))
+        
+    elif simulated_annealing_flag == True:
+        pick = int(argmax(delta_arr))
+        if delta_arr[pick] <= 0:
+            return None
+        
+        # Probability to reject the swap. Compared in logs: probability < exp(-delta_diversity / temperature)
+        if random_stream.logUniform() < -delta_arr[pick] / temperature:
+            return None
+        return pick
+        
+    else:
+        pick = int(argmax(delta_arr))
+        if delta_arr[pick] <= 0:
+            return None
+        return pick
+
+#%% Kernighan-Lin refinement. Escapes a plateau where every single swap lowers the diversity, 
+# but a sequence of swaps raises it.
+# kernighanLinPass(): for 2 groups, makes the best swap of rows not yet swapped, 
+# even if it lowers the diversity, until every row of the smaller group is swapped. 
+# Then keeps the swaps up to the point of the highest total change (the best prefix), and undoes the rest.
+# Each step only pairs the candidate_limit unswapped rows of each group with the best estimated change 
+# (see pairGainEstimate()), hence costs O(rows x columns + candidate_limit ** 2 x columns), 
+# instead of the whole cross product of the 2 groups. 
+# Stops at the next step once stopped, and keeps the best prefix so far.
+# Returns the change in diversity kept (never negative)
+
+def kernighanLinPass(solution, group_a, group_b, check_homogen_flag, run_control, candidate_limit):
+    # Rows in row number order, so that ties are broken the same whatever the swaps made before 
+    # (the order of member_lst follows them, see AssignmentState.memberAt())
+    rows_a = sort(solution.member_lst[group_a])
+    rows_b = sort(solution.member_lst[group_b])
+    unswapped_a = ones(len(rows_a), dtype = bool)
+    unswapped_b = ones(len(rows_b), dtype = bool)
+    
+    swap_lst = []
+    total_delta = 0.0
+    best_total_delta = 0.0
+    best_swap_count = 0
+    
+    for _ in range(min(len(rows_a), len(rows_b))):
+        # Stop when stopped. The swaps after the best prefix are undone below
+        if run_control.stopped():
+            break
+        
+        candidate_a = rows_a[unswapped_a]
+        candidate_b = rows_b[unswapped_b]
+        
+        # Keep the rows with the best estimated change, in row number order
+        if len(candidate_a) > candidate_limit or len(candidate_b) > candidate_limit:
+            gain_a_arr, gain_b_arr = solution.pairGain(candidate_a, group_a, candidate_b, group_b)
+            candidate_a = candidate_a[sort(argsort(-gain_a_arr, kind = 'stable')[:candidate_limit])]
+            candidate_b = candidate_b[sort(argsort(-gain_b_arr, kind = 'stable')[:candidate_limit])]
+        
+        delta_table, homogen_table = solution.pairDelta(candidate_a, group_a, candidate_b, group_b)
+        
+        if check_homogen_flag == True:
+            delta_table = where(homogen_table, -inf, delta_table)
+        
+        pick = int(argmax(delta_table))
+        pick_a, pick_b = divmod(pick, len(candidate_b))
+        if delta_table[pick_a, pick_b] == -inf:
+            break
+        
+        row_i = candidate_a[pick_a]
+        row_j = candidate_b[pick_b]
+        solution.swap(row_i, row_j)
+        swap_lst.append((row_i, row_j))
+        unswapped_a[flatnonzero(rows_a == row_i)] = False
+        unswapped_b[flatnonzero(rows_b == row_j)] = False
+        
+        total_delta += delta_table[pick_a, pick_b]
+        if total_delta > best_total_delta + 1e-12:
+            best_total_delta = total_delta
+            best_swap_count = len(swap_lst)
+    
+    # Undo the swaps after the best prefix
+    for row_i, row_j in reversed(swap_lst[best_swap_count:]):
+        solution.swap(row_i, row_j)
+    
+    return float(best_total_delta)
+
+# kernighanLinRefiner(): kernighanLinPass() over every pair of groups, in random order. 
+# Refines the solution in place. Returns the change in diversity
+# candidate_limit: rows of each group paired at each step of a pass. Default: 32
+
+def kernighanLinRefiner(solution, check_homogen_flag, run_control, random_stream, **kwargs):
+    candidate_limit = kwargs.get('candidate_limit', 32)
+    
+    pair_lst = [(group_a, group_b) 
+                for group_a in range(solution.num_groups) 
+                for group_b in range(group_a + 1, solution.num_groups)]
+    random_stream.shuffle(pair_lst)
+    
+    total_delta = 0.0
+    for group_a, group_b in pair_lst:
+        if run_control.stopped():
+            break
+        total_delta += kernighanLinPass(solution, group_a, group_b, check_homogen_flag, run_control, candidate_limit)
+    
+    return total_delta
+
+def assigner(num_groups, num_rows, solution, shuffle_flag, **kwargs):
+    weight_modifier_dict = kwargs.get('weight_modifier_dict', None)
+    carried_over_homogen_result = kwargs.get('carried_over_homogen_result', None)
+    algorithm = kwargs.get('algorithm', 'TwoHill')
+    temperature = kwargs.get('temperature', 1.0)
+    mode = kwargs.get('mode', None)
+    partner_search = kwargs.get('partner_search', 'Deque')
+    deadline = kwargs.get('deadline', None)
+    run_control = kwargs.get('run_control', None)
+    initialiser = kwargs.get('initialiser', 'Greedy')
+    tabu_tenure = kwargs.get('tabu_tenure', max(1, min(num_rows // 4, 10)))
+    tabu_sample_size = kwargs.get('tabu_sample_size', None)
+    rotation_budget = kwargs.get('rotation_budget', 0)
+    gain_cache_limit = kwargs.get('gain_cache_limit', 10 ** 7)
+    random_stream = kwargs.get('random_stream', None)
+    
+    # Stops the search at the deadline, or when asked to stop. See RunControl
+    if run_control is None:
+        run_control = RunControl(deadline = deadline)
+    
+    # Random numbers of the search. See RandomStream
+    if random_stream is None:
+        random_stream = RandomStream()
+    
+    #%% Algorithm settings
+    algo_dict = {'TwoHill': (True, True, False),
+                 'SimAnneal': (True, True, False),
+                 'RandomRestart': (False, True, False),
+                 'UnclosedAC3': (False, True, False), 
+                 'Pseudorandom': (False, False, True), 
+                 'Tabu': (False, True, False)}
+    if helpers.debug_flag:
+        print()
+        debug_print('algorithm', algorithm, helpers.debug_flag)
+    
+    simulated_annealing_flag = algo_dict[algorithm][0]
+    homogen_flag = algo_dict[algorithm][1]
+    randomise_flag = algo_dict[algorithm][2]
+    
+    # If weight modifiers are present, modify the weights of that feature.
+    if weight_modifier_dict is None:
+        None
+    else:
+        weight_modifier_dict
+    
+    #%% Load solution
+    
+    # Work on a copy. The solution passed in is left unchanged 
+    solution = solution.copy()
+    
+    #%% Initialise variables and load them
+    
+    # Detect homogenity
+    if homogen_flag == True:
+        # Check whether there is a result loaded carried over from previous instance
+        if carried_over_homogen_result is not None:
+            check_homogen_flag = carried_over_homogen_result
+            
+        # Else no result from previous instance
+        # A homogenous column left out of the search (see invariantColumnDetector())
+        # is dominant and homogenous throughout dataset. Hence don't check
+        elif solution.constant_column_flag == True:
+            check_homogen_flag = False
+            
+        # Check whether to relax no-homogenous-columns in any group 
+        # if no relax, check_homogen_flag = TRUE
+        else:
+            population_count = solution.count_table.sum(axis = 0)
+            check_homogen_flag = heuristicDominanceDetectorEncoded(population_count, 
+                                                                   solution.num_categories, 
+                                                                   num_rows, 
+                                                                   num_groups)
+        
+            # If above TRUE, check whether there 
+            # are no homogenous columns in the entire dataset
+            if check_homogen_flag == False:
+        
+                if 1 in solution.num_categories:
+                    check_homogen_flag = False
+                    
+                    if mode == 'MegaTester':
+                        debug_print('list(data.nunique() == 1)', 
+                                    list(solution.num_categories == 1), 
+                                    helpers.debug_flag)    
+                else:
+                    check_homogen_flag = True
+    
+    # Instead, don't check
+    elif homogen_flag == False:
+        check_homogen_flag = False
+        
+    # Generate sequence of groups.
+    # Used to tell programme which rows to swap groups to increase diversity
+    # Each element in sequence represents a group index (0-based)
+    grouping_lst = arange(num_groups)
+    
+    # If shuffle_flag == TRUE: Initialise the initial assignment with sequential grouping
+    if shuffle_flag == True:
+        assignment = tile(grouping_lst, num_rows // num_groups + 1)[:num_rows] 
+        solution.reassign(assignment)
+    
+    # Hidden Else: start off the initial assignment from the given assignment from previous solution
+    
+    initial_diversity = solution.totalDiversity()
+    # debug_print("initial diversity", initial_diversity , helpers.debug_flag)
+    
+    
+    # If shuffle_flag == TRUE and initialiser == 'Greedy': 
+    # Deal the rows to the groups, rarest categories first, from a shuffled order of the rows. 
+    # A new, already diverse, starting assignment in one pass. See AssignmentState.dealRarestFirst()
+    # The deal does not look at homogenous columns. Hence, if check_homogen_flag == True, 
+    # swap rows out of them (see AssignmentState.repairHomogen()). 
+    # If no swap is left, reshuffle as 'Shuffle' below, up to num_rows times. 
+    # Else keep the repaired deal: the check of homogenous columns is a heuristic 
+    # (see heuristicDominanceDetectorEncoded()), and some column may be homogenous in every assignment
+    if shuffle_flag == True and initialiser == 'Greedy':
+        solution.dealRarestFirst(random_stream.permutation(num_rows))
+        if randomise_flag == False and check_homogen_flag == True and solution.repairHomogen() == True:
+            dealt_arr = solution.group_index_arr.copy()
+            assignment = dealt_arr.copy()
+            for _ in range(num_rows):
+                if run_control.stopped():
+                    break
+                random_stream.shuffle(assignment)
+                solution.reassign(assignment)
+                if not solution.homogenGroups().any():
+                    break
+            
+            if solution.homogenGroups().any():
+                solution.reassign(dealt_arr)
+    
+    # If shuffle_flag == TRUE and initialiser == 'Shuffle': 
+    # Shuffle the initial assignment to start exploring 
+    # new local search space (or 'tree')
+    elif shuffle_flag == True:
+        shuffled_grouping_lst = random_stream.permutation(num_groups)
+        assignment = tile(shuffled_grouping_lst, num_rows // num_groups + 1)[:num_rows] 
+        solution.reassign(assignment)
+        if randomise_flag == False and check_homogen_flag == True:
+            # Identify homogenous features in groups before swap
+            # If homogenous, reshuffle, to get a non-homogenous features in groups
+            # Give up when stopped
+            while solution.homogenGroups().any() and not run_control.stopped():
+                random_stream.shuffle(assignment)
+                solution.reassign(assignment)
+    # Intermediary check for future debugging
+    # if helpers.debug_flag:
+    #     print(solution.groupLabels())
+        
+    #%% Vectorised and profile partner search
+    ## Vectorised partner search: for each row, the change in diversity of swapping with every row 
+    ## in every other group is calculated in one go. See partnerDeltaDiversity()
+    ## The swap is then picked from that vector of changes in diversity. See pickSwap()
+    ## Swaps that make a column homogenous in either group are removed beforehand, 
+    ## if check_homogen_flag == True. Hence no restart is needed.
+    ## Greedy swaps and simulated annealing (both propose the best swap, see pickSwap()) use the gain cache of the solution: 
+    ## the best change in diversity of swapping each row with each group, kept across assigner() calls. 
+    ## Only the groups changed since (the row's own group, or the partner group) are searched again, 
+    ## and a row with no improving swap in any group is not looked at ("don't look"). 
+    ## Near convergence, most rows are skipped. Kept if rows x groups is at most gain_cache_limit. 
+    ## The swaps picked, and the random numbers drawn, are the same as without the cache. 
+    ## Randomising ('Pseudorandom') picks among every swap, hence does not use the cache. 
+    ## The vectorised partner search and tabu search keep the cache: the deque partner search scores one partner at a time
+    
+    ## Profile partner search: as the vectorised partner search, over the profile table. 
+    ## Rows of the same profile are interchangeable, hence only "how many rows of profile t
+    ## go to group g" is searched. Each occupied (profile, group) cell is visited once,
+    ## and its rows swapped with rows of other profiles in other groups.
+    ## The rows are dealt to the groups at the end. See AssignmentState.expandProfiles()
+    
+    #%% Tabu search
+    ## Each step takes the best swap of a random sample of tabu_sample_size rows, even if it lowers the diversity, 
+    ## so that the search can walk off a local maximum. The swaps of each row are found 
+    ## as the vectorised partner search (see partnerDeltaDiversity()), whatever the partner_search.
+    ## Rows swapped in the last tabu_tenure steps are tabu: not swapped again, 
+    ## unless the swap gives a new best assignment (aspiration).
+    ## The best assignment seen is kept. Runs until every row has been sampled about twice 
+    ## (2 * num_rows // tabu_sample_size steps, at least 2 * tabu_tenure), 
+    ## or until 2 * tabu_tenure steps in a row give no new best: every tabu row has been let go twice.
+    ## Uses the gain cache (see the vectorised partner search): the cached best gain of each group 
+    ## bounds the tabu and aspiration swaps with that group, hence only the groups that can beat 
+    ## the best swap of the step so far are searched. The swaps picked are the same as without the cache. 
+    ## Default tabu_sample_size: the square root of num_rows (at least 4), so that larger problems 
+    ## see more of their swaps each step. About two vectorised partner search passes, fewer with the cache. 
+    ## num_rows: every swap is seen each step
+    
+    if algorithm == 'Tabu':
+        if tabu_sample_size is None:
+            tabu_sample_size = max(4, isqrt(num_rows))
+        sample_size = min(num_rows, tabu_sample_size)
+        tabu_until_arr = zeros(num_rows, dtype = 'intp')
+        current_diversity = solution.totalDiversity()
+        best_diversity = current_diversity
+        best_group_index_arr = solution.group_index_arr.copy()
+        stall_count = 0
+        num_steps = max(2 * tabu_tenure, 2 * num_rows // sample_size)
+        
+        gain_cache_flag = num_rows * num_groups <= gain_cache_limit
+        if gain_cache_flag == True and solution.gain_table is None:
+            solution.enableGainCache()
+        
+        for step in range(1, num_steps + 1):
+            # Stop when stopped. The best assignment is put back below
+            if run_control.stopped() or stall_count >= 2 * tabu_tenure:
+                break
+            
+            best_move = None
+            for index in random_stream.sample(num_rows, sample_size):
+                # Search only the groups whose best swap beats the best swap so far: a tabu row 
+                # only swaps for a new best. Groups tied with the best swap so far can't replace it
+                if gain_cache_flag == True:
+                    gain_arr = solution.partnerGains(index, check_homogen_flag)
+                    search_flag_arr = gain_arr > -inf
+                    if tabu_until_arr[index] >= step:
+                        search_flag_arr &= current_diversity + gain_arr > best_diversity + 1e-12
+                    if best_move is not None:
+                        search_flag_arr &= gain_arr > best_move[0]
+                    if not search_flag_arr.any():
+                        continue
+                    
+                    candidate_arr, delta_arr, homogen_arr = solution.partnerDelta(index, search_flag_arr)
+                else:
+                    candidate_arr, delta_arr, homogen_arr = solution.partnerDelta(index)
+                
+                allowed_arr = (tabu_until_arr[candidate_arr] < step) & (tabu_until_arr[index] < step)
+                allowed_arr |= current_diversity + delta_arr > best_diversity + 1e-12
+                if check_homogen_flag == True:
+                    allowed_arr &= ~homogen_arr
+                if not allowed_arr.any():
+                    continue
+                
+                pick = int(argmax(where(allowed_arr, delta_arr, -inf)))
+                if best_move is None or delta_arr[pick] > best_move[0]:
+                    best_move = (delta_arr[pick], index, int(candidate_arr[pick]))
+            
+            if best_move is None:
+                stall_count += 1
+                continue
+            
+            delta_diversity, index, pointer = best_move
+            solution.swap(index, pointer)
+            current_diversity += delta_diversity
+            tabu_until_arr[index] = step + tabu_tenure
+            tabu_until_arr[pointer] = step + tabu_tenure
+            
+            if current_diversity > best_diversity + 1e-12:
+                best_diversity = current_diversity
+                best_group_index_arr = solution.group_index_arr.copy()
+                stall_count = 0
+            else:
+                stall_count += 1
+        
+        if (solution.group_index_arr != best_group_index_arr).any():
+            solution.reassign(best_group_index_arr)
+    
+    elif partner_search == 'Profile':
+        # Generate a random sequence of occupied (profile, group) cells to visit
+        cell_lst = list(zip(*solution.profile_table.nonzero()))
+        random_stream.shuffle(cell_lst)
+        
+        for profile_t, group_a in cell_lst:
+            # Stop when stopped. The solution is complete after every swap
+            if run_control.stopped():
+                break
+            
+            # Each row of the cell may be swapped out, one at a time, 
+            # until no swap is picked
+            for _ in range(solution.profile_table[profile_t, group_a]):
+                (candidate_profile_arr, 
+                 candidate_group_arr, 
+                 delta_arr, 
+                 homogen_arr) = solution.profilePartnerDelta(profile_t, group_a)
+                
+                if check_homogen_flag == True:
+                    candidate_profile_arr = candidate_profile_arr[~homogen_arr]
+                    candidate_group_arr = candidate_group_arr[~homogen_arr]
+                    delta_arr = delta_arr[~homogen_arr]
+                
+                pick = pickSwap(delta_arr, randomise_flag, simulated_annealing_flag, temperature, random_stream)
+                if pick is None:
+                    break
+                
+                # Swap group assignments of a row of each profile
+                solution.swapProfiles(profile_t, 
+                                      group_a, 
+                                      candidate_profile_arr[pick], 
+                                      candidate_group_arr[pick])
+        
+        solution.expandProfiles()
+    
+    elif partner_search == 'Vectorised':
+        group_index_arr = solution.group_index_arr
+        
+        gain_cache_flag = (randomise_flag == False 
+                           and num_rows * num_groups <= gain_cache_limit)
+        if gain_cache_flag == True and solution.gain_table is None:
+            solution.enableGainCache()
+        
+        # Generate a random sequence of rows to visit
+        target_lst = random_stream.permutation(num_rows).tolist()
+        
+        # Initialise a set tracker. If index has already been swapped, skip it
+        previous_index = set()
+        
+        for index in target_lst:
+            # Stop when stopped. The solution is complete after every swap
+            if run_control.stopped():
+                break
+            
+            if index in previous_index:
+                continue
+            
+            # Search the rows of the groups of the best cached swap only. See AssignmentState.partnerGains()
+            # All groups tied for the best swap are searched, so that the first row of the best swaps 
+            # is picked, as without the cache
+            if gain_cache_flag == True:
+                gain_arr = solution.partnerGains(index, check_homogen_flag)
+                best_gain = gain_arr.max()
+                
+                # Don't look: no swap of this row raises the diversity
+                if best_gain <= 0:
+                    continue
+                
+                candidate_arr, delta_arr, homogen_arr = solution.partnerDelta(index, gain_arr == best_gain)
+            else:
+                candidate_arr, delta_arr, homogen_arr = solution.partnerDelta(index)
+            
+            if check_homogen_flag == True:
+                candidate_arr = candidate_arr[~homogen_arr]
+                delta_arr = delta_arr[~homogen_arr]
+                
+            pick = pickSwap(delta_arr, randomise_flag, simulated_annealing_flag, temperature, random_stream)
+            if pick is None:
+                continue
+                
+            pointer = int(candidate_arr[pick])
+            
+            # Swap group assignments
+            solution.swap(index, pointer)
+            
+            previous_index.add(index)
+            previous_index.add(pointer)
+        
+    else:
+        
+        #%% Unclosed AC3 algorithm: Initialise variables for this algorithm
+        
+        # Constraint for Unclosed AC3 algorithm: No homogenous column in entire dataset 
+        # Detects whether data has a homogenous column
+        # If there is a 
+        ### For pseudo-random only algorithm, homogen_flag == False
+        ### Assume there is a column homogenous throughout dataset
+        ### Hence bypass the "no homogoenous column constraint" check
+        ### Effectively turns off constraint propagation.
+        
+        # Initialise a set tracker, using set. Used in 'for' loop over the rows. 
+        # If index has already been swapped, this variable is used to identify the index to skip.
+        previous_index = set()
+    
+        # Initialise a dict: create hashmap to track visited neighbour solution 
+        visited_nodes = {}
+    
+        # Initialise a dict: create hashmap to track whether a potential swap 
+        # has looped back to having any column in either groups homogenous
+        homogen_nodes = {}
+    
+        # Generate a random sequence of indices to pop. 
+        target_lst = random_stream.permutation(num_rows).tolist()
+        
+        # Use deque() for the sequence to pop.   
+        target_lst = deque(target_lst)
+ 
+        # Deque size
+        target_lst_size = len(target_lst)   
+    
+        # Make a back-up of current assignments
+        backup_group_index_arr = solution.group_index_arr.copy()
+        group_index_arr = solution.group_index_arr
+        profile_index_arr = solution.profile_index_arr
+    
+        #%% Unclosed AC3 algorithm
+        ## Note: Regardless whether constraints are in place, this algorithm will
+        ##       drive the swapping of group assignments
+    
+        while True:
+            # Group assignment, iterating over the rows. 
+            # This 'for' loop drives the swaps. 
+            # If check_homogen_flag == True, constraint is propagated
+        
+            # Initialise restart flag. Used with homogenous features detected in a group
+            restart_flag = False
+        
+            for index in range(num_rows):
+                # debug_print("index undergoing assignment", index, helpers.debug_flag)
+                
+                # Stop when stopped. The solution is complete after every swap
+                if run_control.stopped():
+                    break
+            
+                # 'assign_i' is the group of index iterrows()
+                assign_i = group_index_arr[index]
+            
+                # Create index iterrows() as key in visited_nodes hashmap
+                # Tracks index target_lst visited by index iterrows()
+                visited_nodes[index] = set()
+            
+                #%% Constraint propagation.
+            
+                # Create index iterrows() as key in homogen_nodes hashmap
+                # Tracks index target_lst visited by index iterrows() that
+                # resulted in homogenous rows
+                homogen_nodes[index] = set()
+            
+                #%% Swap
+            
+                # This 'while' loop drives the swapping and constraint propagation
+                while target_lst_size > 1:
+                    
+                    # Begin restart, because restart flag detected
+                    if restart_flag == True:
+                        break
+                
+                    # Update deque size
+                    target_lst_size = len(target_lst)
+                    # debug_print("deque size", target_lst_size, helpers.debug_flag)
+                
+                    # pointer is the index target_lst to swap with index iterrows()
+                    pointer = target_lst.popleft()
+                
+                    # If the index target_lst has already swapped, skip swapping
+                    if index in previous_index: 
+                        # debug_print("previous_index", previous_index, helpers.debug_flag)
+                    
+                        # Exit 'while' loop driving swap at this index iterrows()
+                        break
+                
+                    # If the deque pointer has already been visited, stop swapping
+                    # Because this means we have cycled through the deque and couldn't make a swap
+                    visited_check = visited_nodes.get(index, None)
+                    # debug_print("visited_check", visited_check, helpers.debug_flag)
+                
+                    if visited_check is not None: 
+                        if pointer in visited_check:
+                            # debug_print("index", index, helpers.debug_flag)
+                            # debug_print("pointer", pointer, helpers.debug_flag)
+                            # debug_print("visited_check", visited_check, helpers.debug_flag)
+                            # debug_print("target_lst_size visited", target_lst_size, helpers.debug_flag)
+                        
+                            # Exit 'while' loop driving swap at this index iterrows()
+                            break
+                        else:
+                            # Move pointer to end of deque
+                            target_lst.append(pointer)
+                            visited_nodes[index].add(pointer)
+        
+                    # 'assign_j' is the group of index target_lst
+                    assign_j = group_index_arr[pointer]
+                
+                    # Prevent self-swapping or row swapping within the same group 
+                    # Then move the pointer's value to the end of the deque
+                    # Then re-try using the first element in the deque as the new pointer
+                    if pointer == index or assign_i == assign_j:
+                        previous_index.add(index)
+                        previous_index.add(pointer)
+                    
+                        # Move pointer to end of deque
+                        target_lst.append(pointer)
+                        visited_nodes[index].add(pointer)
+                    
+                        # Re-try 'while' loop driving swap at this index iterrows()
+                        # Try to find another swap
+                        continue
+                    
+                    # Swapping 2 rows of the same profile changes nothing. 
+                    # Move the pointer's value to the end of the deque, and try another swap
+                    elif profile_index_arr[index] == profile_index_arr[pointer]:
+                        target_lst.append(pointer)
+                        visited_nodes[index].add(pointer)
+                        continue
+    
+                    else:    
+                        # debug_print("assign_i", assign_i, helpers.debug_flag)
+                        # debug_print("assign_j", assign_j, helpers.debug_flag)
+                    
+                        # Change in diversity of the 2 groups if the 2 rows are swapped. 
+                        # Only the categories that change are looked up in the count table
+                    
+                        delta_diversity_i, delta_diversity_j = solution.swapDelta(index, pointer)
+                    
+                        # Prevent groups with homogenous columns from forming
+                        # (if dataset has no homogenous columns).
+                        # If dataset has no homogenous columns
+                        # and 
+                        # if dataset makes any column in either groups 
+                        # to be homogenous
+                        # re-try another swap.
+                        ### check_homogen_flag == False will effectively turns off 
+                        ### constraint propagation 
+                    
+                        #%% Constraint propagation.
+                    
+                        # If the deque pointer has looped back to 
+                        # creating homogenous columns, stop swapping.
+                        # Because this means all of the remaining elements of the deque
+                        # will create homogenous columns for this index iterrows()
+                        homogen_check = homogen_nodes.get(index, None)
+                        # debug_print("homogen_check", homogen_check, helpers.debug_flag)
+                                
+                        if homogen_check is not None: 
+                            if pointer in homogen_check:
+                                # debug_print("index", index, helpers.debug_flag)
+                                # debug_print("pointer", pointer, helpers.debug_flag)
+                                # debug_print("homogen_check", homogen_check, helpers.debug_flag)
+                                # debug_print("target_lst_size visited", target_lst_size, helpers.debug_flag)
+                            
+                                # Homogenous features detected in a group. Begin restart process
+                                # Revert all assginments to backup and restart assignments
+                                solution.reassign(backup_group_index_arr)
+                                group_index_arr = solution.group_index_arr
+                                target_lst = deque(random_stream.permutation(num_rows).tolist())
+                                restart_flag = True
+                                continue
+                    
+                        if check_homogen_flag == True:
+                        
+                            # Identify homogenous columns the swap would create, 
+                            # from the distinct category counts of the 2 groups
+                            if solution.swapHomogen(index, pointer):
+                                # Move pointer to end of deque
+                                target_lst.append(pointer)
+                                homogen_nodes[index].add(pointer)
+                                # debug_print("homogen found: index:", index, helpers.debug_flag)
+                                # debug_print("homogen found: pointer:", pointer, helpers.debug_flag)
+                                # debug_print("homogen_check:", homogen_check, helpers.debug_flag)
+                                # debug_print("homogen_nodes:", homogen_nodes, helpers.debug_flag)
+                            
+                                # Re-try 'while' loop driving swap at this index iterrows()
+                                # Try to find another swap
+                                continue
+                    
+                        elif check_homogen_flag == False:
+                            pass # do nothing
+                    
+                        #%% Proceeding on with the swap
+                        
+                        # Swap group assignments. 
+                        # Swapping the 2 rows again reverts the swap
+                        solution.swap(index, pointer)
+                    
+                        # Calculate the change in diversity
+                        delta_diversity = delta_diversity_i + delta_diversity_j
+                        # debug_print("delta_diversity", delta_diversity, helpers.debug_flag)
+                    
+                        #%% UnclosedAC- and Pseudorandom- specific code
+                    
+                        ## Enable for UnclosedAC and Pseudorandom
+                        ## After homogenous check (if any), enabling randomise_flag 
+                        ## disables delta_diversity consideration
+                        ## since all swaps are accepted in these algorith,
+                        ## regardless of delta diversity
+                        if randomise_flag == True:
+                            # accept whatever swap (after finishng through homogenous check (if any))
+                            previous_index.add(index)
+                            previous_index.add(pointer)
+                        
+                            # Exit 'while' loop driving swap at this index iterrows()
+                            break
+        
+                        #%% If not randomised, evaluate delta diversity
+                            
+                        #%% Simulated annealing 
+                            
+                        else:
+                            if delta_diversity > 0:
+                                # Based on probability, explore alternative solutions
+                                # Probability to
+                                # reject the swap (ignore pointer swap target)
+                                # or 
+                                # accept the swap 
+        
+                                if simulated_annealing_flag == True:
+                                    # debug_print("Simu anneal present", "Simu anneal present", helpers.debug_flag)
+                                    # Compared in logs: probability < exp(-delta_diversity / temperature). 
+                                    # See RandomStream.logUniform()
+                                    log_probability = random_stream.logUniform()
+                                    log_threshold = -delta_diversity / temperature
+                                    # debug_print("probability", probability, helpers.debug_flag)
+                                    # debug_print("threshold", threshold, helpers.debug_flag)
+    
+                                            
+                                    # Probability to reject swap
+                                    if log_probability < log_threshold:
+                                        # debug_print("delta increased, reject, revert", probability, helpers.debug_flag)
+                                    
+                                        # revert the swap
+                                        solution.swap(index, pointer)
+                                    
+                                        # Move pointer to end of deque
+                                        target_lst.append(pointer)
+                                        # if helpers.debug_flag:
+                                        #     target_lst_size = len(target_lst)
+                                        #     debug_print("deque size", target_lst_size, helpers.debug_flag)
+                                    
+                                        # Exit 'while' loop driving swap at this index iterrows()
+                                        break
+                                
+                                    # Probability to accept swap
+                                    else:
+                                        # debug_print("accept", probability, helpers.debug_flag)
+                                    
+                                        # accept swap 
+                                        previous_index.add(index)
+                                        previous_index.add(pointer)
+                                    
+                                        # Exit 'while' loop driving swap at this index iterrows()
+                                        break
+                                
+                                #%% Don't use simulated annealing if delta_diversity > 0
+                                # If simulated annealing disabled, always swap if increased diversity
+                            
+                                else: 
+                                    # debug_print("No simulated annealing", "No simulated annealing", helpers.debug_flag)
+                                
+                                    # accept swap 
+                                    previous_index.add(index)
+                                    previous_index.add(pointer)
+                                
+                                    # Exit 'while' loop driving swap at this index iterrows()
+                                    break
+                            
+                            #%% Else, given delta_diversity <= 0
+                        
+                            else:
+                                # revert the swap
+                                solution.swap(index, pointer)
+                                # if helpers.debug_flag:
+                                #     target_lst_size = len(target_lst)
+                                #     debug_print("deque size", target_lst_size, helpers.debug_flag)
+                            
+                                # Move pointer to end of deque
+                                target_lst.append(pointer)
+                                visited_nodes[index].add(pointer)
+                            
+                                #%% Use simulated annealing
+                                # If swapping index and pointer decreased diversity 
+                                # then based on probability
+                                # try finding another solution leading to increased diversity
+                                # or 
+                                # reject the swap 
+                            
+                                if simulated_annealing_flag == True:
+                                    # debug_print("Simu anneal present", "Simu anneal present", helpers.debug_flag)
+                                    # Compared in logs: probability < exp(delta_diversity / temperature)
+                                    log_probability = random_stream.logUniform()
+                                    if delta_diversity < 0:
+                                        log_threshold = delta_diversity / temperature
+                                        # Probability to re-try finding a swap
+                                        if log_probability < log_threshold:  
+                                            continue
+                                    # reject swapping
+                                    # Exit 'while' loop driving swap at this index iterrows()
+                                        else:
+                                            break
+                                    # ln(exp (0)) is always probability == 0
+                                    elif delta_diversity == 0:
+                                        # reject swapping
+                                    
+                                        # Exit 'while' loop driving swap at this index iterrows()
+                                        break    
+                                
+                                #%% Don't use simulated annealing if delta_diversity <= 0
+                                # If simulated annealing disabled, 
+                                # always reject if decreased or same diversity
+                                else:
+                                    # debug_print("No simulated annealing", "No simulated annealing", helpers.debug_flag)
+                                    # since simulated annealing disabled, reject swapping
+                                
+                                    # Exit 'while' loop driving swap at this index iterrows()
+                                    break    
+        
+            # Homogenous features detected in a group. Passing restart flag to restart    
+            if restart_flag == True:
+                continue
+      
+            # Break from restart loop
+            else: 
+                break
+        
+    #%% Rotation moves
+    ## 3-cycles of rows across 3 different groups: row i (group a) moves to group b, 
+    ## row j (group b) to group c, and row k (group c) to group a. Group sizes are kept. 
+    ## A rotation can raise the diversity where each of its 2 swaps lowers it, 
+    ## hence reaches assignments that the swaps above stop short of.
+    ## rotation_budget random rotations are tried, once the swaps are done. 
+    ## Each is accepted as a swap of the vectorised partner search is (see pickSwap()), 
+    ## and left out if it makes a column homogenous, if check_homogen_flag == True.
+    ## Change in diversity in O(number of columns). See rotationDeltaDiversity()
+    
+    if num_groups >= 3:
+        for _ in range(rotation_budget):
+            if run_control.stopped():
+                break
+            
+            group_a, group_b, group_c = random_stream.sample(num_groups, 3)
+            row_i = solution.memberAt(group_a, random_stream.randrange(solution.group_size_arr[group_a]))
+            row_j = solution.memberAt(group_b, random_stream.randrange(solution.group_size_arr[group_b]))
+            row_k = solution.memberAt(group_c, random_stream.randrange(solution.group_size_arr[group_c]))
+            
+            if check_homogen_flag == True and solution.rotationHomogen(row_i, row_j, row_k):
+                continue
+            
+            delta_arr = array([solution.rotationDelta(row_i, row_j, row_k)])
+            if pickSwap(delta_arr, randomise_flag, simulated_annealing_flag, temperature, random_stream) is not None:
+                solution.rotate(row_i, row_j, row_k)
+    
+    #%% Calculate grand final diversity 
+    
+    final_diversity = solution.totalDiversity()
+    
+    # debug_print('final_diversity', final_diversity, helpers.debug_flag)
+    
+    # Intermediary check for future debugging
+    # if helpers.debug_flag:
+    #     print(solution.groupLabels())
+    
+    
+    return solution, initial_diversity, final_diversity, check_homogen_flag
+
+
+#%% Function to iterate assignments over specified instance counts
+
+def iterator(writerMethod, mega_num, instance_count, num_groups, num_rows, data, **kwargs):
+    weight_modifier_dict = kwargs.get('weight_modifier_dict', None)
+    cooling_schedule = kwargs.get('cooling_schedule', 0.95)
+    algorithm = kwargs.get('algorithm', 'TwoHill')
+    force_plateau_action_flag = kwargs.get('force_plateau_action_flag', None)
+    verbosity = kwargs.get('verbosity', 2)
+    mode = kwargs.get('mode', None)
+    partner_search = kwargs.get('partner_search', 'Deque')
+    encoded_data = kwargs.get('encoded_data', None)
+    weight_arr = kwargs.get('weight_arr', None)
+    deadline = kwargs.get('deadline', None)
+    run_control = kwargs.get('run_control', None)
+    checkpoint_file = kwargs.get('checkpoint_file', None)
+    checkpoint_interval = kwargs.get('checkpoint_interval', 60)
+    resume_flag = kwargs.get('resume_flag', False)
+    gap_tolerance = kwargs.get('gap_tolerance', None)
+    exact_limit = kwargs.get('exact_limit', 10 ** 9)
+    exact_node_limit = kwargs.get('exact_node_limit', 10 ** 5)
+    initialiser = kwargs.get('initialiser', 'Greedy')
+    plateau_action = kwargs.get('plateau_action', 'KernighanLin')
+    rotation_budget = kwargs.get('rotation_budget', 0)
+    tabu_sample_size = kwargs.get('tabu_sample_size', None)
+    random_seed = kwargs.get('seed', None)
+    random_stream = kwargs.get('random_stream', None)
+    start_labels = kwargs.get('start_labels', None)
+    
+    # Stops the search at the deadline, or when asked to stop. See RunControl
+    if run_control is None:
+        run_control = RunControl(deadline = deadline)
+    deadline = run_control.deadline
+    
+    # Random numbers of the search, from seed unless a stream is given. See RandomStream
+    if random_stream is None:
+        random_stream = RandomStream(random_seed)
+    
+    debug_print('cooling_schedule', cooling_schedule, helpers.debug_flag)
+    
+    #%% Small instances: find the best assignment exactly, instead of searching. See exact.py
+    ### Picked when there are at most exact_limit assignments (see exactSelector()), 
+    ### or by algorithm = 'Exact'. Not in MegaTester, which tests the search algorithms.
+    ### If picked by size, and not done within exact_node_limit nodes, the search runs instead, 
+    ### starting from the best assignment the exact search found (see start_labels)
+    
+    if algorithm == 'Exact' or (mode != 'MegaTester' and exactSelector(num_rows, num_groups, exact_limit)):
+        outputs = exactIterator(num_groups, 
+                                num_rows, 
+                                data, 
+                                weight_modifier_dict = weight_modifier_dict, 
+                                verbosity = verbosity, 
+                                encoded_data = encoded_data, 
+                                weight_arr = weight_arr, 
+                                run_control = run_control, 
+                                node_limit = None if algorithm == 'Exact' else exact_node_limit)
+        
+        if algorithm == 'Exact' or run_control.summary['optimal'] == True or run_control.stopped():
+            return outputs
+        
+        exact_labels = outputs[1] if data is None else outputs[1]['assigned_group'].to_numpy()
+        start_labels = exact_labels - 1
+    
+    #%% Algorithm settings
+    
+    algo_dict = {'TwoHill': (False, True, True),
+                 'SimAnneal': (False, True, True),
+                 'RandomRestart': (False, True, True),
+                 'UnclosedAC3': (True, False, False), 
+                 'Pseudorandom': (True, False, False), 
+                 'Tabu': (False, True, True)}
+    
+    randomise_flag = algo_dict[algorithm][0]
+    carry_over_flag = algo_dict[algorithm][1]
+    plateau_action_flag = algo_dict[algorithm][2]
+    
+    # User specification to ovewrite plateau capping
+    if force_plateau_action_flag == True:
+        plateau_action_flag = True
+    elif force_plateau_action_flag == False:
+        plateau_action_flag = False
+    
+    # If weight modifiers are present, modify the weights of that feature.
+    if weight_modifier_dict is None:
+        None
+    else:
+        weight_modifier_dict    
+    
+    #%% Print opening message of iterator() function
+    
+    if verbosity >= 1:
+        print()
+        print("Work progress:")
+        print()
+    
+    #%% Load data
+    
+    # One-time encoding of data into the integer code matrix. 
+    # The search runs on AssignmentState. The data is only used again to save the best solution
+    # Workers of parallelIterator() are passed the encoded data instead
+    if encoded_data is None:
+        encoded_data = encodeData(data)
+        weight_arr = weightArray(data.columns, weight_modifier_dict)
+    
+    starting_solution = AssignmentState(encoded_data, 
+                                        num_groups, 
+                                        tile(arange(num_groups), num_rows // num_groups + 1)[:num_rows], 
+                                        weight_arr = weight_arr, 
+                                        profile_flag = (partner_search == 'Profile'))
+    
+    # Upper bound on the diversity score of any assignment. See diversityUpperBound()
+    # Given gap_tolerance, the run stops once the best solution is within 
+    # that fraction of the upper bound (see optimalityGap()). 0 stops at a provably best solution
+    upper_bound = diversityUpperBound(encoded_data[0], 
+                                      encoded_data[1], 
+                                      starting_solution.group_size_arr, 
+                                      weight_arr = weight_arr)
+    gap_reached_flag = False
+    
+    # Given start_labels (group of each row, 0-based), the first solution starts from that assignment, 
+    # instead of a new one, and the run never ends with a worse best solution
+    if start_labels is None:
+        first_solution = starting_solution
+    else:
+        first_solution = starting_solution.copy()
+        first_solution.reassign(start_labels)
+    
+    #%% Initialise variables to store outputs from assignments
+    
+    better_solution = None
+    best_solution = None
+    current_solution = None
+    baseline_initial_diversity = None
+    initial_diversity = None
+    final_diversity = None
+    better_diversity = None
+    best_diversity = None
+    cache_final_diversity_deque = deque([0])
+    shuffle_flag = False
+    picked_solution = 0
+    elapsed = 0
+    
+    #%% Initialise deque to support plateau detection
+    cache_final_diversity_deque = [0]
+    cache_final_diversity_deque = deque(cache_final_diversity_deque)
+    
+    #%% Initialise TESTER use only flags for reporting
+    group_homogen_flag = None
+    best_diversity_flag = None
+    
+    #%% Initialise signals
+    plateau_detected_signal = None
+    
+    #%% Intialise settings to control number of instances
+    ### and for temperature for simulated annealing 
+    ### Note: for all algorithms, the number instances is controlled by 
+    ###       a common math function of temperature.
+    ###       Whether there is any simulated annealing in any algorithm, 
+    ###       that is separately controlled by the 'threshold' in the assigner() function.
+    
+    # Initialise the cooling schedule for simulated annealing
+    cooling_schedule = cooling_schedule    
+    # Define the initial temperature for simulated annealing
+    temperature = 1.0     
+    # Target temperature
+    target = cooling_schedule ** instance_count
+    # Initialise the progress tracker variable for reporting to screen
+    cache_progress = 0
+    # Initialise the solution number tracker
+    solution_number = 0
+    
+    # Anytime mode, given a deadline (a time() timestamp): 
+    # run until the deadline, with the cooling schedule scaled to the time budget
+    start_time = time()
+    
+    #%% Checkpoints, to resume the run later. See checkpoint.py
+    ### Given a checkpoint file, the state at the start of a solution is saved 
+    ### every checkpoint_interval seconds, and once the run ends.
+    ### Given resume_flag, the run resumes from the checkpoint file, if there is one
+    
+    if checkpoint_file is not None:
+        settings_dict = {'num_rows': num_rows, 
+                         'num_groups': num_groups, 
+                         'instance_count': instance_count, 
+                         'cooling_schedule': cooling_schedule, 
+                         'algorithm': algorithm, 
+                         'force_plateau_action_flag': force_plateau_action_flag, 
+                         'partner_search': partner_search, 
+                         'initialiser': initialiser, 
+                         'plateau_action': plateau_action, 
+                         'rotation_budget': rotation_budget, 
+                         'tabu_sample_size': tabu_sample_size, 
+                         'data_checksum': dataChecksum(encoded_data)}
+        
+        def checkpointState():
+            if better_solution is None:
+                better_labels, best_labels = None, None
+            else:
+                better_labels = compactLabels(better_solution.group_index_arr, num_groups)
+                best_labels = compactLabels(best_solution.group_index_arr, num_groups)
+            
+            return {'settings': settings_dict, 
+                    'better_labels': better_labels, 
+                    'best_labels': best_labels, 
+                    'baseline_initial_diversity': baseline_initial_diversity, 
+                    'initial_diversity': initial_diversity, 
+                    'final_diversity': final_diversity, 
+                    'better_diversity': better_diversity, 
+                    'best_diversity': best_diversity, 
+                    'check_homogen_flag': check_homogen_flag, 
+                    'picked_solution': picked_solution, 
+                    'best_diversity_flag': best_diversity_flag, 
+                    'plateau_detected_signal': plateau_detected_signal, 
+                    'cache_final_diversity_deque': list(cache_final_diversity_deque), 
+                    'temperature': temperature, 
+                    'solution_number': solution_number, 
+                    'cache_progress': cache_progress, 
+                    'elapsed_clock': elapsed_clock, 
+                    'elapsed_seconds': time() - start_time, 
+                    'random_state': random_stream.getState()}
+        
+        check_homogen_flag = None
+        elapsed_clock = None
+        checkpoint_dict = None
+        checkpoint_time = time()
+        
+        if resume_flag == True and os.path.exists(checkpoint_file):
+            checkpoint_dict = loadCheckpoint(checkpoint_file, settings_dict)
+            
+            if checkpoint_dict['best_labels'] is not None:
+                better_solution = starting_solution.copy()
+                better_solution.reassign(checkpoint_dict['better_labels'])
+                best_solution = starting_solution.copy()
+                best_solution.reassign(checkpoint_dict['best_labels'])
+            
+            baseline_initial_diversity = checkpoint_dict['baseline_initial_diversity']
+            initial_diversity = checkpoint_dict['initial_diversity']
+            final_diversity = checkpoint_dict['final_diversity']
+            better_diversity = checkpoint_dict['better_diversity']
+            best_diversity = checkpoint_dict['best_diversity']
+            check_homogen_flag = checkpoint_dict['check_homogen_flag']
+            picked_solution = checkpoint_dict['picked_solution']
+            best_diversity_flag = checkpoint_dict['best_diversity_flag']
+            plateau_detected_signal = checkpoint_dict['plateau_detected_signal']
+            cache_final_diversity_deque = deque(checkpoint_dict['cache_final_diversity_deque'])
+            temperature = checkpoint_dict['temperature']
+            solution_number = checkpoint_dict['solution_number']
+            cache_progress = checkpoint_dict['cache_progress']
+            elapsed_clock = checkpoint_dict['elapsed_clock']
+            random_stream.setState(checkpoint_dict['random_state'])
+            
+            # Time spent before the checkpoint counts in elapsed_seconds of the summary, 
+            # and in the cooling of anytime mode (the run cools down from where it stopped). 
+            # Not in the deadline: that is the deadline of this run, e.g. a new time budget from now
+            start_time = time() - checkpoint_dict['elapsed_seconds']
+            
+            if elapsed_clock is not None:
+                elapsed = (instance_count - solution_number) * elapsed_clock
+                minutes_estimate = elapsed // 60
+                seconds_estimate = elapsed % 60
+            
+            if verbosity >= 1:
+                print(f"Resuming from Solution Number {solution_number + 1:,}.")
+    
+    if deadline is not None:
+        budget_seconds = max(deadline - start_time, 1e-9)
+    
+    #%% Run assignment until target instances (or until the deadline)
+    
+    while temperature > target:        
+        # Stop at the deadline or when asked to, once there is a solution. 
+        # The best solution so far is returned
+        if best_solution is not None and run_control.stopped():
+            break
+        
+        # Stop once the best solution is close enough to the upper bound
+        if best_solution is not None and gap_tolerance is not None:
+            if optimalityGap(best_diversity, upper_bound) <= gap_tolerance:
+                gap_reached_flag = True
+                break
+        
+        # Keep the state at the start of this solution, and save it now and then
+        if checkpoint_file is not None:
+            checkpoint_dict = checkpointState()
+            if time() - checkpoint_time >= checkpoint_interval:
+                saveCheckpoint(checkpoint_file, checkpoint_dict)
+                checkpoint_time = time()
+        
+        solution_number  += 1    
+        # debug_print('solution_number ', solution_number , helpers.debug_flag)
+        
+        #%% Start stopwatch
+        
+        if solution_number == 1:
+            stopwatch = Stopwatch()
+            stopwatch.start()
+            
+        #%% Update temperature
+        
+        # Update temperature
+        if deadline is None:
+            temperature = temperature * cooling_schedule
+            progress = solution_number / instance_count * 100
+            
+        # Anytime mode: the temperature reaches the target temperature at the deadline
+        else:
+            budget_fraction = min((time() - start_time) / budget_seconds, 1.0)
+            temperature = target ** budget_fraction
+            progress = budget_fraction * 100
+        # debug_print("temperature", temperature, helpers.debug_flag)
+        
+        #%% Update progress reporting, synced to temperature
+        if verbosity == 2:
+            print()
+            if deadline is None:
+                print(f"Working on Solution Number {solution_number:,} of {instance_count:,} now...")
+            else:
+                print(f"Working on Solution Number {solution_number:,} now...")
+            
+            # Print the progress
+            if progress < 10:   
+                print_interval_modulo = 1    
+            elif 10 <= progress < 20:
+                print_interval_modulo = 1
+            elif 20 <= progress < 50:
+                print_interval_modulo = 1
+            else:
+                print_interval_modulo = 1
+        
+        elif verbosity == 1:
+            # Print the progress
+            if progress < 10:   
+                print_interval_modulo = 1    
+            elif 10 <= progress < 20:
+                print_interval_modulo = 5
+            elif 20 <= progress < 50:
+                print_interval_modulo = 10
+            else:
+                print_interval_modulo = 20
+        
+        # No progress reporting
+        else:
+            print_interval_modulo = 100
+                
+        stepped_progress = progress - (progress % (-print_interval_modulo))    
+    
+        if cache_progress < stepped_progress:
+            if verbosity == 2:
+                # Print progress according to print interval
+                print(f"Progress: {cache_progress:.0f}%")
+            
+            elif verbosity == 1:
+                # Print progress according to print interval
+                if cache_progress < stepped_progress:
+                    # For Solution 1, print progress without time estimate
+                    if solution_number == 1:
+                        print(f"Progress: {cache_progress:.0f}%")
+                    # For remaining solutions, print progress along with time estimate
+                    else:   
+                        print(f"Progress: {cache_progress:.0f}% (Time left: {minutes_estimate:.0f} min {seconds_estimate:.0f} s)")
+            
+            cache_progress = stepped_progress
+        
+        # debug_print("final_diversity", final_diversity, helpers.debug_flag)
+        # debug_print("temperature", temperature, helpers.debug_flag)
+        # debug_print("Progress percentage of current solution:", (1 - temperature), helpers.debug_flag)
+        
+        #%% Run assignment: if this is first assignment, do this
+        
+        # If solution none, this assignment output is best solution
+        # Else, take the best solution, then run the assignment again
+        if best_solution is None:
+           output_1 = assigner(num_groups, 
+                                num_rows, 
+                                first_solution, 
+                                start_labels is None, 
+                                algorithm = algorithm,
+                                weight_modifier_dict = weight_modifier_dict,
+                                temperature = temperature,
+                                partner_search = partner_search,
+                                run_control = run_control, 
+                                initialiser = initialiser, 
+                                rotation_budget = rotation_budget, 
+                                tabu_sample_size = tabu_sample_size, 
+                                random_stream = random_stream)
+           
+           # assigner() returns a new AssignmentState, which is never changed afterwards. 
+           # Hence current, better and best solutions can share it without copies
+           current_solution = output_1[0]
+           better_solution = output_1[0]
+           best_solution = output_1[0]
+            
+           # Baseline initial diversity is when we start with sequential grouping
+           baseline_initial_diversity = starting_solution.totalDiversity()
+           
+           initial_diversity = output_1[1]
+           final_diversity = output_1[2]
+           better_diversity = output_1[2]
+           best_diversity = output_1[2]
+           check_homogen_flag = output_1[3]
+           cache_final_diversity_deque.append(final_diversity)
+           picked_solution = 1   
+           
+           # Keep the given start, if the first solution ended lower
+           if start_labels is not None and first_solution.totalDiversity() > best_diversity:
+               best_solution = first_solution
+               best_diversity = first_solution.totalDiversity()
+           # debug_print("starting calcuateDiversity(best_solution, weight_modifier_dict = weight_modifier_dict)", 
+           #             calculateDiversity(best_solution, 
+           #                                weight_modifier_dict), 
+           #             helpers.debug_flag)
+           
+           # For TESTER reporting only
+           if best_diversity > initial_diversity:
+               best_diversity_flag = 'Y'
+               
+        #%% Run assignment: if this is subsequent assignment, consider whether to 
+        ### carry over assignment output to next assigner() instance
+        
+        # If there is a solution then
+        else:
+          
+            #%% Code to cut-off a plateau and random-restart 
+            
+            ### Detect plateau before flagging maxima
+            ### if the same better_diversity score obtained 
+            ### in specified number of times immediately in sequence
+            
+            if plateau_action_flag == True:
+                if plateau_detected_signal == True:
+                    # Shuffle assignment means instead of 
+                    # starting from the better assignment
+                    # We re-try a different search space, to look for any 
+                    # higher hill-maximum areas
+                    # Set shuffle_flag to TRUE to enable shuffling
+                    if carry_over_flag  == True:
+                        shuffle_flag = True  
+                        
+                        # plateau_action == 'KernighanLin': first try to refine the better assignment 
+                        # with multi-swap moves. Only shuffle if that finds no improvement. See kernighanLinRefiner()
+                        if plateau_action == 'KernighanLin':
+                            refined_solution = better_solution.copy()
+                            if kernighanLinRefiner(refined_solution, check_homogen_flag, run_control, random_stream) > 0:
+                                better_solution = refined_solution
+                                better_diversity = refined_solution.totalDiversity()
+                                shuffle_flag = False
+                                if verbosity == 2:
+                                    print('Plateau left by Kernighan-Lin refinement.')
+                    else:
+                        shuffle_flag = False
+                        
+                # Since plateau_detected_signal != True
+                else:
+                    if carry_over_flag  == True:
+                        shuffle_flag = False  
+                    else:
+                        shuffle_flag = True
+                    
+            # Do this given plateau detection disabled:
+            else:
+                if carry_over_flag  == True:
+                    shuffle_flag = False
+                else:
+                    shuffle_flag = True
+            
+            # For alogrithms that randomise the starting assignment at all instances
+            if randomise_flag == True:
+                ### UnclosedAC3 and Pseudo-random algo: Regardless of delta_diversity 
+                ### Shuffle assignment                  
+                shuffle_flag = True
+                
+            #%% Run the next assigner()
+            
+            output_2 = assigner(num_groups, 
+                                num_rows, 
+                                better_solution, 
+                                shuffle_flag, 
+                                algorithm = algorithm,
+                                carried_over_homogen_result = check_homogen_flag, 
+                                weight_modifier_dict = weight_modifier_dict,
+                                temperature = temperature,
+                                partner_search = partner_search,
+                                run_control = run_control, 
+                                initialiser = initialiser, 
+                                rotation_budget = rotation_budget, 
+                                tabu_sample_size = tabu_sample_size, 
+                                random_stream = random_stream)
+            
+            current_solution = output_2[0]
+            initial_diversity = output_2[1]
+            final_diversity = output_2[2]
+            check_homogen_flag = output_2[3]
+            cache_final_diversity_deque.append(final_diversity)
+            # debug_print("initial_diversity", initial_diversity, helpers.debug_flag)
+            # debug_print("final_diversity", final_diversity, helpers.debug_flag)
+            # debug_print("better_diversity", better_diversity, helpers.debug_flag) 
+            # if helpers.debug_flag:
+            #     if final_diversity < initial_diversity:    
+            #         debug_print("final_diversity - better_diversity", final_diversity - better_diversity, helpers.debug_flag) 
+            
+            #%% Code to generate plateau_detected_signal
+            ### After assigner() iteration complete, signal to 
+            ### cut-off plateau and random-restart code
+            
+            cache_deque_length = len(cache_final_diversity_deque)
+            plateau_detected_signal = False
+            
+            if cache_deque_length == num_groups: 
+                check_cache_deque = cache_final_diversity_deque.pop()
+                # debug_print("final_diversity", final_diversity, helpers.debug_flag)
+                
+                if check_cache_deque == better_diversity:
+                    best_repeats_count = 1
+                    for i in cache_final_diversity_deque:
+                        if i == better_diversity:
+                            best_repeats_count += 1
+                    if best_repeats_count == num_groups:
+                        plateau_detected_signal = True
+                        if verbosity == 2:
+                            print('Diversity score has reached plateau.')
+                
+                # return back the element because inspection completed
+                cache_final_diversity_deque.append(check_cache_deque)
+                # popleft() to keep cache_deque_length within specified size
+                cache_final_diversity_deque.popleft()
+                    
+            #%% Code to select whether an assigner() output gets carried over to next iteration. 
+            ### Also code to report flags in TESTER output
+            
+            if final_diversity > better_diversity: 
+                better_solution = current_solution
+                better_diversity = final_diversity
+                best_diversity_flag = 'Y'
+                # debug_print("if final_diversity > better_diversity", (final_diversity, better_diversity), helpers.debug_flag)
+            
+            if better_diversity > best_diversity:
+                best_solution = better_solution
+                best_diversity = better_diversity
+                picked_solution = solution_number
+                best_diversity_flag = 'Y'
+                # debug_print("if better_diversity > best_diversity", (better_diversity, best_diversity), helpers.debug_flag)
+                # debug_print("final_diversity > initial_diversity", (final_diversity, initial_diversity), helpers.debug_flag)
+            
+            if final_diversity == better_diversity or (better_diversity == best_diversity):
+                best_diversity_flag = 'Y'
+                
+                
+            if final_diversity < best_diversity:
+                best_diversity_flag = 'N'
+    
+            # debug_print("now calcuateDiversity(best_solution, weight_modifier_dict)", 
+            #             calculateDiversity(best_solution, 
+            #                                weight_modifier_dict), 
+            #             helpers.debug_flag)
+            
+        #%% Code to stop stopwatch and report progress
+            
+        if solution_number == 1:
+            stopwatch.stop()
+            elapsed_clock = stopwatch.elapsed_time()
+        
+        if solution_number >= 1:
+            solutions_left = instance_count - solution_number
+            elapsed = solutions_left * elapsed_clock
+            
+            # Anytime mode: the time left is known
+            if deadline is not None:
+                elapsed = max(deadline - time(), 0)
+        
+            minutes_estimate = elapsed // 60
+            seconds_estimate = elapsed % 60
+        
+        if verbosity == 2:
+            print()
+            print(f"Solution Number {solution_number:,}'s initial diversity score was {initial_diversity}")
+            print(f"Solution Number {solution_number:,}'s final diversity score was {final_diversity}")  
+            print()
+            print(f"The baseline initial diversity score was {baseline_initial_diversity}")
+            print(f"The best solution now is Solution Number {picked_solution:,}. The best diversity score achieved was {best_diversity}")
+            print(f"The upper bound on the diversity score is {upper_bound}")
+            
+            if solution_number == 1:
+                message_str = f": {minutes_estimate:.0f} min {seconds_estimate:.0f} s"
+                print()
+                print("Estimated time to complete" + message_str) 
+            
+            elif solution_number > 1:
+                message_str = f": {minutes_estimate:.0f} min {seconds_estimate:.0f} s"
+                print()
+                print("Time left" + message_str) 
+    
+        # debug_print("Picked solution number", picked_solution, True)
+        # debug_print("Picked best_diversity", best_diversity, True)
+        
+        #%% For TESTER use only. To report whether there is a homogenous feature in a group 
+        
+        # Detect prescence of homogenous feature in a group 
+        if best_solution.homogenGroups().any():
+            group_homogen_flag = 'Y'
+        else:
+            group_homogen_flag = 'N'      
+        
+        #%% TESTER use only: write report to CSV
+        if mode == 'MegaTester':        
+            data_to_write = [mega_num, solution_number, initial_diversity, final_diversity, best_diversity_flag, plateau_detected_signal, group_homogen_flag]    
+            if verbosity >= 1:
+                print()
+                print(f"{data_to_write} ****************************" )
+            writerMethod.writerow(data_to_write)
+        
+    #%% Save the last checkpoint
+    ### A stop may cut the last solution short. Hence a stopped run resumes 
+    ### from the start of its last solution, which is then run in full
+    
+    if checkpoint_file is not None:
+        if checkpoint_dict is None or run_control.stopped() == False:
+            checkpoint_dict = checkpointState()
+        saveCheckpoint(checkpoint_file, checkpoint_dict)
+    
+    #%% End iterator() and return outputs
+    
+    if gap_reached_flag == True:
+        stop_reason = 'gap'
+    else:
+        stop_reason = run_control.stopReason()
+    
+    run_control.summary = {'stop_reason': stop_reason, 
+                           'solution_number': solution_number, 
+                           'picked_solution': picked_solution, 
+                           'baseline_initial_diversity': baseline_initial_diversity, 
+                           'best_diversity': best_diversity, 
+                           'upper_bound': upper_bound, 
+                           'optimality_gap': optimalityGap(best_diversity, upper_bound), 
+                           'elapsed_seconds': time() - start_time}
+    
+    if verbosity >= 1:
+        if run_control.summary['stop_reason'] == 'stopped':
+            print("Stopped early. Keeping the best solution so far.")
+        elif run_control.summary['stop_reason'] == 'gap':
+            print(f"Stopped early. The best diversity score is within {run_control.summary['optimality_gap']:.2%} of the upper bound ({upper_bound:.3f}).")
+        print("Progress: 100%")    
+    
+    # Without data (workers of parallelIterator(), or data loaded by loader.py), 
+    # return the best solution's assignments only
+    if data is None:
+        return picked_solution, best_solution.groupLabels(), best_diversity
+  
+    # Save the best solution's assignments into a copy of the data
+    best_solution = data.assign(assigned_group = best_solution.groupLabels())
+    return picked_solution, best_solution, best_diversity
+
+#%% class Stopwatch 
+
+# Stopwatch program. Used in estimating compute time. Credit: Mostly AI-generated
+class Stopwatch:
+    def __init__(self):
+        self.start_time = None
+        self.end_time = None
+    
+    def start(self):
+        self.start_time = perf_counter()
+    
+    def stop(self):
+        self.end_time = perf_counter()
+    
+    def elapsed_time(self):
+        estimator_modifier = 1.1 # slight modifier to over-estimate time. Better to over than under estimate.
+        elapsed_seconds = (self.end_time - self.start_time) * estimator_modifier
+        
+        return elapsed_seconds   
+
+#%% Parallel multi-start of iterator()
+# Runs independent restarts of iterator() (each with its own seed and shuffles) 
+# over a process pool, and picks the best solution of all restarts.
+# Each restart keeps the best, better and current solution bookkeeping of iterator().
+#
+# The instances are split evenly between the restarts. The cooling schedule of each restart 
+# is sped up, so that each restart still cools down to the same target temperature.
+#
+# Each restart has its own random numbers, from a seed spawned from the run's seed (see RandomStream.spawn()). 
+# Hence the run is reproducible for a fixed seed and worker count: the restarts make the same swaps 
+# whichever process runs them, and whenever, and the run picks the same best solution each time. 
+# Unless stopped early (stop, deadline, or another restart within gap_tolerance), as the restarts then stop mid-way.
+# The number of restarts follows num_workers, and so do the instances and seed of each restart. 
+# Hence 1 and 3 workers give different results for the same seed.
+#
+# The encoded data is put into shared memory once, instead of being pickled to each process.
+# The workers stop together, through a shared stop event, when the run is stopped. See RunControl
+# Given a checkpoint file, restart n saves its checkpoints to '<checkpoint_file>.n'. See checkpoint.py
+
+# Encoded data of a worker process. Set by parallelWorkerInitialiser()
+worker_shared_memory = None
+worker_encoded_data = None
+worker_weight_arr = None
+worker_stop_event = None
+
+def parallelWorkerInitialiser(shared_memory_name, shape, dtype, num_categories, weight_arr, stop_event, debug_flag):
+    global worker_shared_memory, worker_encoded_data, worker_weight_arr, worker_stop_event
+    
+    # Trace as the main process does. A spawned worker imports the main script afresh, 
+    # which may set its own debug_flag
+    helpers.debug_flag = debug_flag
+    
+    # Ctrl-C reaches every process. Leave it to the main process, which stops the workers 
+    # through the stop event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    worker_stop_event = stop_event
+    
+    # Keep a reference to the shared memory, as long as the code matrix is in use
+    worker_shared_memory = SharedMemory(name = shared_memory_name)
+    code_matrix = ndarray(shape, dtype = dtype, buffer = worker_shared_memory.buf)
+    
+    worker_encoded_data = (code_matrix, num_categories, None)
+    worker_weight_arr = weight_arr
+
+def parallelWorker(restart_num, restart_seed, instance_count, num_groups, num_rows, deadline, iterator_kwargs):
+    random_stream = RandomStream(restart_seed)
+    
+    # Each restart keeps its own checkpoint file
+    if iterator_kwargs.get('checkpoint_file', None) is not None:
+        iterator_kwargs = {**iterator_kwargs, 'checkpoint_file': f"{iterator_kwargs['checkpoint_file']}.{restart_num}"}
+    
+    run_control = RunControl(deadline = deadline, stop_event = worker_stop_event)
+    outputs = iterator(None, 
+                       restart_num, 
+                       instance_count, 
+                       num_groups, 
+                       num_rows, 
+                       None, 
+                       encoded_data = worker_encoded_data, 
+                       weight_arr = worker_weight_arr, 
+                       verbosity = 0, 
+                       run_control = run_control, 
+                       random_stream = random_stream, 
+                       **iterator_kwargs)
+    
+    return outputs, run_control.summary
+
+def parallelIterator(instance_count, num_groups, num_rows, data, **kwargs):
+    weight_modifier_dict = kwargs.get('weight_modifier_dict', None)
+    cooling_schedule = kwargs.get('cooling_schedule', 0.95)
+    algorithm = kwargs.get('algorithm', 'TwoHill')
+    force_plateau_action_flag = kwargs.get('force_plateau_action_flag', None)
+    verbosity = kwargs.get('verbosity', 2)
+    partner_search = kwargs.get('partner_search', 'Deque')
+    num_workers = kwargs.get('num_workers', None)
+    deadline = kwargs.get('deadline', None)
+    encoded_data = kwargs.get('encoded_data', None)
+    weight_arr = kwargs.get('weight_arr', None)
+    run_control = kwargs.get('run_control', None)
+    checkpoint_file = kwargs.get('checkpoint_file', None)
+    checkpoint_interval = kwargs.get('checkpoint_interval', 60)
+    resume_flag = kwargs.get('resume_flag', False)
+    gap_tolerance = kwargs.get('gap_tolerance', None)
+    exact_limit = kwargs.get('exact_limit', 10 ** 9)
+    exact_node_limit = kwargs.get('exact_node_limit', 10 ** 5)
+    initialiser = kwargs.get('initialiser', 'Greedy')
+    plateau_action = kwargs.get('plateau_action', 'KernighanLin')
+    rotation_budget = kwargs.get('rotation_budget', 0)
+    tabu_sample_size = kwargs.get('tabu_sample_size', None)
+    random_seed = kwargs.get('seed', None)
+    random_stream = kwargs.get('random_stream', None)
+    
+    if run_control is None:
+        run_control = RunControl(deadline = deadline)
+    deadline = run_control.deadline
+    start_time = time()
+    
+    # Seeds of the restarts, spawned from seed unless a stream is given. See RandomStream
+    if random_stream is None:
+        random_stream = RandomStream(random_seed)
+    
+    # Small instances: find the best assignment exactly, as iterator(), without restarts
+    if algorithm == 'Exact' or exactSelector(num_rows, num_groups, exact_limit):
+        outputs = exactIterator(num_groups, 
+                                num_rows, 
+                                data, 
+                                weight_modifier_dict = weight_modifier_dict, 
+                                verbosity = verbosity, 
+                                encoded_data = encoded_data, 
+                                weight_arr = weight_arr, 
+                                run_control = run_control, 
+                                node_limit = None if algorithm == 'Exact' else exact_node_limit)
+        
+        if algorithm == 'Exact' or run_control.summary['optimal'] == True or run_control.stopped():
+            return outputs
+        
+        # Out of nodes: restart 1 starts from the best assignment the exact search found
+        exact_labels = outputs[1] if data is None else outputs[1]['assigned_group'].to_numpy()
+        start_labels = exact_labels - 1
+    else:
+        start_labels = None
+    
+    if num_workers is None:
+        num_workers = os.cpu_count()
+    
+    #%% Split the instances between the restarts
+    
+    num_restarts = max(1, min(num_workers, instance_count))
+    restart_instance_count = ceil(instance_count / num_restarts)
+    
+    # Same target temperature (cooling_schedule ** instance_count) in fewer instances
+    restart_cooling_schedule = cooling_schedule ** (instance_count / restart_instance_count)
+    
+    # Restarts only run the search. The exact search was tried above
+    iterator_kwargs = {'algorithm': algorithm, 
+                       'weight_modifier_dict': weight_modifier_dict, 
+                       'cooling_schedule': restart_cooling_schedule, 
+                       'force_plateau_action_flag': force_plateau_action_flag, 
+                       'partner_search': partner_search, 
+                       'initialiser': initialiser, 
+                       'plateau_action': plateau_action, 
+                       'rotation_budget': rotation_budget, 
+                       'tabu_sample_size': tabu_sample_size, 
+                       'checkpoint_file': checkpoint_file, 
+                       'checkpoint_interval': checkpoint_interval, 
+                       'resume_flag': resume_flag, 
+                       'gap_tolerance': gap_tolerance, 
+                       'exact_limit': None}
+    
+    #%% Load data into shared memory
+    
+    if encoded_data is None:
+        encoded_data = encodeData(data)
+        weight_arr = weightArray(data.columns, weight_modifier_dict)
+    
+    code_matrix, num_categories = encoded_data[0], encoded_data[1]
+    
+    shared_memory = SharedMemory(create = True, size = max(code_matrix.nbytes, 1))
+    shared_code_matrix = ndarray(code_matrix.shape, dtype = code_matrix.dtype, buffer = shared_memory.buf)
+    shared_code_matrix[:] = code_matrix
+    
+    if verbosity >= 1:
+        print()
+        print(f"Work progress: running {num_restarts:,} restarts in parallel...")
+        print()
+    
+    #%% Run the restarts, and pick the best solution
+    
+    restart_seed_lst = random_stream.spawn(num_restarts)
+    best_restart = None
+    stop_event = Event()
+    
+    try:
+        with ProcessPoolExecutor(max_workers = num_restarts, 
+                                 initializer = parallelWorkerInitialiser, 
+                                 initargs = (shared_memory.name, 
+                                             code_matrix.shape, 
+                                             code_matrix.dtype, 
+                                             num_categories, 
+                                             weight_arr, 
+                                             stop_event, 
+                                             helpers.debug_flag)) as executor:
+            
+            future_dict = {}
+            for restart_num in range(1, num_restarts + 1):
+                if restart_num == 1 and start_labels is not None:
+                    restart_kwargs = {**iterator_kwargs, 'start_labels': start_labels}
+                else:
+                    restart_kwargs = iterator_kwargs
+                
+                future = executor.submit(parallelWorker, 
+                                         restart_num, 
+                                         restart_seed_lst[restart_num - 1], 
+                                         restart_instance_count, 
+                                         num_groups, 
+                                         num_rows, 
+                                         deadline, 
+                                         restart_kwargs)
+                future_dict[future] = restart_num
+            
+            results_dict = {}
+            summary_dict = {}
+            pending_futures = set(future_dict)
+            while len(pending_futures) > 0:
+                # Wake up regularly, to pass a stop on to the workers
+                done_futures, pending_futures = wait(pending_futures, timeout = 0.1, return_when = FIRST_COMPLETED)
+                if run_control.stopRequested():
+                    stop_event.set()
+                
+                for future in done_futures:
+                    restart_num = future_dict[future]
+                    results_dict[restart_num], summary_dict[restart_num] = future.result()
+                    
+                    # A restart close enough to the upper bound stops the other restarts
+                    if summary_dict[restart_num]['stop_reason'] == 'gap':
+                        stop_event.set()
+                    
+                    if verbosity >= 1:
+                        print(f"Progress: {len(results_dict):,} of {num_restarts:,} restarts completed. Restart {restart_num:,}'s best diversity score was {results_dict[restart_num][2]}")
+    finally:
+        del shared_code_matrix
+        shared_memory.close()
+        shared_memory.unlink()
+    
+    # Ties go to the earliest restart
+    for restart_num in sorted(results_dict):
+        if best_restart is None or results_dict[restart_num][2] > results_dict[best_restart][2]:
+            best_restart = restart_num
+    
+    picked_solution, group_labels, best_diversity = results_dict[best_restart]
+    
+    # Solution number counted over all restarts
+    picked_solution = (best_restart - 1) * restart_instance_count + picked_solution
+    
+    if any(summary['stop_reason'] == 'gap' for summary in summary_dict.values()):
+        stop_reason = 'gap'
+    else:
+        stop_reason = run_control.stopReason()
+    
+    upper_bound = summary_dict[best_restart]['upper_bound']
+    
+    run_control.summary = {'stop_reason': stop_reason, 
+                           'solution_number': sum(summary['solution_number'] for summary in summary_dict.values()), 
+                           'picked_solution': picked_solution, 
+                           'baseline_initial_diversity': summary_dict[best_restart]['baseline_initial_diversity'], 
+                           'best_diversity': best_diversity, 
+                           'upper_bound': upper_bound, 
+                           'optimality_gap': optimalityGap(best_diversity, upper_bound), 
+                           'elapsed_seconds': time() - start_time, 
+                           'num_restarts': num_restarts}
+    
+    if verbosity >= 1:
+        if run_control.summary['stop_reason'] == 'stopped':
+            print("Stopped early. Keeping the best solution so far.")
+        elif run_control.summary['stop_reason'] == 'gap':
+            print(f"Stopped early. The best diversity score is within {run_control.summary['optimality_gap']:.2%} of the upper bound ({upper_bound:.3f}).")
+        print("Progress: 100%")
+    
+    # Without data (e.g. loaded by loader.py), return the best solution's assignments only
+    if data is None:
+        return picked_solution, group_labels, best_diversity
+    
+    # Save the best solution's assignments into a copy of the data
+    best_solution = data.assign(assigned_group = group_labels)
+    return picked_solution, best_solution, best_diversity
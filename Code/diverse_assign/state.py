@@ -0,0 +1,453 @@
+#%% Packages
+
+from numpy import arange, array, empty, full, zeros, ones, bincount, cumsum, add, argsort, split, repeat, roll, argmin, argmax, argwhere, where, partition, inf, nan, isnan, maximum
+
+from .scoring import (xlogxTable, 
+                      categoryOffsets, 
+                      buildCountTable, 
+                      swapDeltaDiversity, 
+                      swapCountTable, 
+                      buildDistinctTable, 
+                      swapHomogenCheck, 
+                      swapDistinctTable, 
+                      rotationDeltaDiversity, 
+                      rotationHomogenCheck, 
+                      partnerDeltaDiversity, 
+                      pairDeltaDiversity, 
+                      pairGainEstimate, 
+                      profileEncoder, 
+                      buildProfileTable, 
+                      profilePartnerDeltaDiversity, 
+                      invariantColumnDetector)
+
+#%% class AssignmentState. Array-backed group assignment used in the search.
+# Replaces the DataFrame (and its copies) in assigner() and iterator(). 
+# The data is only touched when loading and saving.
+#
+# Holds:
+#     group_index_arr: group of each row (0-based, i.e. assigned_group - 1)
+#     member_lst: rows in each group. One array per group
+#     position_arr: position of each row in its group's array in member_lst
+#     group_size_arr: number of rows in each group
+#     count_table: category counts of each group (see buildCountTable())
+#     distinct_table: number of categories present in each column of each group (see buildDistinctTable())
+# and the encoded data, shared (not copied) between copies of the state:
+#     num_categories, flat_code_matrix, flat_code_lst, weight_arr, xlogx_table, xlogx_lst
+#
+# Columns that swaps cannot change are left out of the encoded data (see invariantColumnDetector()):
+#     invariant_weight: sum of weights of all-unique columns. Adds log(n) to a group of n rows
+#     constant_column_flag: whether a homogenous column was left out
+#
+# Rows with identical codes in the remaining columns share a profile (see profileEncoder()):
+#     profile_index_arr, profile_flat_code_matrix, profile_member_lst
+#     profile_table: rows of each profile in each group. Only kept if profile_flag == True, else None
+#
+# Gain cache, for the greedy partner search (see assigner()). None until enableGainCache():
+#     gain_table: best change in diversity of swapping each row with a row of each group. 
+#                 NaN once stale, i.e. once the row's own group or that partner group changes
+#
+# A swap of 2 rows updates the state in O(number of columns). 
+# Copying the state copies its arrays only.
+
+class AssignmentState:
+    __slots__ = ('num_groups', 
+                 'group_index_arr', 
+                 'member_lst', 
+                 'position_arr', 
+                 'group_size_arr', 
+                 'count_table', 
+                 'distinct_table', 
+                 'num_categories', 
+                 'flat_code_matrix', 
+                 'flat_code_lst', 
+                 'weight_arr', 
+                 'xlogx_table', 
+                 'xlogx_lst', 
+                 'invariant_weight', 
+                 'constant_column_flag', 
+                 'profile_index_arr', 
+                 'profile_flat_code_matrix', 
+                 'profile_member_lst', 
+                 'profile_table', 
+                 'gain_table')
+    
+    def __init__(self, encoded_data, num_groups, group_index_arr, **kwargs):
+        weight_arr = kwargs.get('weight_arr', None)
+        profile_flag = kwargs.get('profile_flag', False)
+        
+        code_matrix, num_categories = encoded_data[0], encoded_data[1]
+        num_rows, num_cols = code_matrix.shape
+        
+        if weight_arr is None:
+            weight_arr = ones(num_cols)
+            
+        # Leave out columns that swaps cannot change
+        keep_arr, unique_arr, constant_arr = invariantColumnDetector(num_categories, num_rows)
+        self.invariant_weight = float(weight_arr[unique_arr].sum())
+        self.constant_column_flag = bool(constant_arr.any())
+        code_matrix = code_matrix[:, keep_arr]
+        num_categories = num_categories[keep_arr]
+        weight_arr = weight_arr[keep_arr]
+        
+        self.num_groups = num_groups
+        self.num_categories = num_categories
+        self.flat_code_matrix = code_matrix + categoryOffsets(num_categories)
+        self.flat_code_lst = self.flat_code_matrix.tolist()
+        self.weight_arr = weight_arr
+        
+        # c * log(c) table, sized to the largest group 
+        # (plus 1 spare entry, used by partnerDeltaDiversity())
+        self.xlogx_table = xlogxTable(num_rows // num_groups + 2)
+        self.xlogx_lst = self.xlogx_table.tolist()
+        
+        # Identical rows
+        (self.profile_index_arr, 
+         self.profile_flat_code_matrix, 
+         self.profile_member_lst) = profileEncoder(self.flat_code_matrix)
+        # Placeholder, built by reassign()
+        self.profile_table = zeros((0, 0), dtype = 'intp') if profile_flag == True else None
+        self.gain_table = None
+        
+        self.reassign(group_index_arr)
+    
+    # Start over from a new assignment of every row
+    def reassign(self, group_index_arr):
+        self.group_index_arr = array(group_index_arr, dtype = 'intp')
+        self.group_size_arr = bincount(self.group_index_arr, minlength = self.num_groups)
+        
+        member_arr = argsort(self.group_index_arr, kind = 'stable')
+        self.member_lst = split(member_arr, cumsum(self.group_size_arr)[:-1])
+        
+        self.position_arr = empty(len(self.group_index_arr), dtype = 'intp')
+        for members in self.member_lst:
+            self.position_arr[members] = arange(len(members))
+            
+        self.count_table = buildCountTable(self.flat_code_matrix, 
+                                           self.group_index_arr, 
+                                           self.num_groups, 
+                                           self.num_categories)
+        self.distinct_table = buildDistinctTable(self.count_table, self.num_categories)
+        
+        if self.profile_table is not None:
+            self.profile_table = buildProfileTable(self.profile_index_arr, 
+                                                   self.group_index_arr, 
+                                                   len(self.profile_flat_code_matrix), 
+                                                   self.num_groups)
+        
+        if self.gain_table is not None:
+            self.gain_table = full((len(self.group_index_arr), self.num_groups), nan)
+    
+    # Keep the gain cache from now on. Every entry starts stale
+    def enableGainCache(self):
+        self.gain_table = full((len(self.group_index_arr), self.num_groups), nan)
+    
+    def copy(self):
+        state = AssignmentState.__new__(AssignmentState)
+        
+        state.num_groups = self.num_groups
+        state.group_index_arr = self.group_index_arr.copy()
+        state.member_lst = [members.copy() for members in self.member_lst]
+        state.position_arr = self.position_arr.copy()
+        state.group_size_arr = self.group_size_arr
+        state.count_table = self.count_table.copy()
+        state.distinct_table = self.distinct_table.copy()
+        
+        # Encoded data is shared
+        state.num_categories = self.num_categories
+        state.flat_code_matrix = self.flat_code_matrix
+        state.flat_code_lst = self.flat_code_lst
+        state.weight_arr = self.weight_arr
+        state.xlogx_table = self.xlogx_table
+        state.xlogx_lst = self.xlogx_lst
+        state.invariant_weight = self.invariant_weight
+        state.constant_column_flag = self.constant_column_flag
+        state.profile_index_arr = self.profile_index_arr
+        state.profile_flat_code_matrix = self.profile_flat_code_matrix
+        state.profile_member_lst = self.profile_member_lst
+        state.profile_table = None if self.profile_table is None else self.profile_table.copy()
+        state.gain_table = None if self.gain_table is None else self.gain_table.copy()
+        
+        return state
+    
+    # Change in diversity of the 2 groups, if row i and row j swap. See swapDeltaDiversity()
+    def swapDelta(self, row_i, row_j):
+        return swapDeltaDiversity(self.count_table, 
+                                  self.group_size_arr, 
+                                  self.flat_code_lst[row_i], 
+                                  self.flat_code_lst[row_j], 
+                                  self.group_index_arr[row_i], 
+                                  self.group_index_arr[row_j], 
+                                  self.weight_arr, 
+                                  self.xlogx_lst)
+    
+    # Change in diversity of swapping row i with every row in every other group. See partnerDeltaDiversity()
+    def partnerDelta(self, row_i, group_flag_arr = None):
+        return partnerDeltaDiversity(self.count_table, 
+                                     self.group_size_arr, 
+                                     self.flat_code_matrix, 
+                                     self.group_index_arr, 
+                                     row_i, 
+                                     self.weight_arr, 
+                                     self.xlogx_table, 
+                                     group_flag_arr)
+    
+    # Best change in diversity of swapping row i with a row of each group, from the gain cache. 
+    # Only the stale groups are searched again. The group of row i scores -inf. 
+    # homogen_flag: leave out swaps that make a column homogenous in either group. 
+    # The same on every call, as the cache keeps the best of the swaps left in
+    def partnerGains(self, row_i, homogen_flag):
+        gain_arr = self.gain_table[row_i]
+        gain_arr[self.group_index_arr[row_i]] = -inf
+        stale_arr = isnan(gain_arr)
+        
+        if stale_arr.any():
+            candidate_arr, delta_arr, homogen_arr = self.partnerDelta(row_i, stale_arr)
+            if homogen_flag == True:
+                candidate_arr = candidate_arr[~homogen_arr]
+                delta_arr = delta_arr[~homogen_arr]
+            
+            best_arr = full(self.num_groups, -inf)
+            maximum.at(best_arr, self.group_index_arr[candidate_arr], delta_arr)
+            gain_arr[stale_arr] = best_arr[stale_arr]
+        
+        return gain_arr
+    
+    # Change in diversity of swapping each of rows_a (all in group a) 
+    # with each of rows_b (all in group b). See pairDeltaDiversity()
+    def pairDelta(self, rows_a, group_a, rows_b, group_b):
+        return pairDeltaDiversity(self.count_table, 
+                                  self.group_size_arr, 
+                                  self.flat_code_matrix[rows_a], 
+                                  group_a, 
+                                  self.flat_code_matrix[rows_b], 
+                                  group_b, 
+                                  self.weight_arr, 
+                                  self.xlogx_table)
+    
+    # Estimated change in diversity of the swaps of rows_a (all in group a) 
+    # with rows_b (all in group b), one part per row. See pairGainEstimate()
+    def pairGain(self, rows_a, group_a, rows_b, group_b):
+        return pairGainEstimate(self.count_table, 
+                                self.group_size_arr, 
+                                self.flat_code_matrix[rows_a], 
+                                group_a, 
+                                self.flat_code_matrix[rows_b], 
+                                group_b, 
+                                self.weight_arr, 
+                                self.xlogx_table)
+    
+    # Change in diversity of swapping a row of profile t in group a 
+    # with a row of every other profile in every other group. See profilePartnerDeltaDiversity()
+    def profilePartnerDelta(self, profile_t, group_a):
+        return profilePartnerDeltaDiversity(self.count_table, 
+                                            self.group_size_arr, 
+                                            self.profile_flat_code_matrix, 
+                                            self.profile_table, 
+                                            profile_t, 
+                                            group_a, 
+                                            self.weight_arr, 
+                                            self.xlogx_table)
+    
+    # Whether swapping row i and row j makes any column homogenous in either group. See swapHomogenCheck()
+    def swapHomogen(self, row_i, row_j):
+        return swapHomogenCheck(self.count_table, 
+                                self.distinct_table, 
+                                self.flat_code_lst[row_i], 
+                                self.flat_code_lst[row_j], 
+                                self.group_index_arr[row_i], 
+                                self.group_index_arr[row_j])
+    
+    # Row of group a at position rank (from 0), in row number order. 
+    # The order of member_lst depends on the swaps made, and reassign() sorts it. 
+    # Hence random picks by rank give the same rows after reassign() (e.g. on resuming a checkpoint)
+    def memberAt(self, group_a, rank):
+        return int(partition(self.member_lst[group_a], rank)[rank])
+    
+    # Swap the groups of row i and row j. Swapping the same 2 rows again reverts the swap
+    def swap(self, row_i, row_j):
+        group_a = self.group_index_arr[row_i]
+        group_b = self.group_index_arr[row_j]
+        position_i = self.position_arr[row_i]
+        position_j = self.position_arr[row_j]
+        
+        swapCountTable(self.count_table, 
+                       self.flat_code_lst[row_i], 
+                       self.flat_code_lst[row_j], 
+                       group_a, 
+                       group_b)
+        swapDistinctTable(self.count_table, 
+                          self.distinct_table, 
+                          self.flat_code_matrix[row_i], 
+                          self.flat_code_matrix[row_j], 
+                          group_a, 
+                          group_b)
+        
+        self.member_lst[group_a][position_i] = row_j
+        self.member_lst[group_b][position_j] = row_i
+        self.position_arr[row_i] = position_j
+        self.position_arr[row_j] = position_i
+        self.group_index_arr[row_i] = group_b
+        self.group_index_arr[row_j] = group_a
+        
+        if self.profile_table is not None:
+            profile_t = self.profile_index_arr[row_i]
+            profile_u = self.profile_index_arr[row_j]
+            self.profile_table[profile_t, group_a] -= 1
+            self.profile_table[profile_t, group_b] += 1
+            self.profile_table[profile_u, group_b] -= 1
+            self.profile_table[profile_u, group_a] += 1
+        
+        # Every swap of a row of group a or b, or with a row of group a or b, is stale
+        if self.gain_table is not None:
+            self.gain_table[:, [group_a, group_b]] = nan
+            self.gain_table[self.member_lst[group_a]] = nan
+            self.gain_table[self.member_lst[group_b]] = nan
+    
+    # Change in diversity of the rotation of row i, row j and row k (in 3 different groups): 
+    # row i moves to the group of row j, row j to the group of row k, row k to the group of row i. 
+    # See rotationDeltaDiversity()
+    def rotationDelta(self, row_i, row_j, row_k):
+        return rotationDeltaDiversity(self.count_table, 
+                                      self.group_size_arr, 
+                                      self.flat_code_lst[row_i], 
+                                      self.flat_code_lst[row_j], 
+                                      self.flat_code_lst[row_k], 
+                                      self.group_index_arr[row_i], 
+                                      self.group_index_arr[row_j], 
+                                      self.group_index_arr[row_k], 
+                                      self.weight_arr, 
+                                      self.xlogx_lst)
+    
+    # Whether the rotation makes any column homogenous in any of the 3 groups. See rotationHomogenCheck()
+    def rotationHomogen(self, row_i, row_j, row_k):
+        return rotationHomogenCheck(self.count_table, 
+                                    self.distinct_table, 
+                                    self.flat_code_lst[row_i], 
+                                    self.flat_code_lst[row_j], 
+                                    self.flat_code_lst[row_k], 
+                                    self.group_index_arr[row_i], 
+                                    self.group_index_arr[row_j], 
+                                    self.group_index_arr[row_k])
+    
+    # Rotate row i, row j and row k, as 2 swaps
+    def rotate(self, row_i, row_j, row_k):
+        self.swap(row_i, row_j)
+        self.swap(row_j, row_k)
+    
+    # Swap a row of profile t in group a with a row of profile u in group b.
+    # Only the count, distinct and profile tables are updated: 
+    # the rows are dealt to the groups by expandProfiles(), once the search is over
+    def swapProfiles(self, profile_t, group_a, profile_u, group_b):
+        codes_t = self.profile_flat_code_matrix[profile_t]
+        codes_u = self.profile_flat_code_matrix[profile_u]
+        
+        swapCountTable(self.count_table, codes_t.tolist(), codes_u.tolist(), group_a, group_b)
+        swapDistinctTable(self.count_table, self.distinct_table, codes_t, codes_u, group_a, group_b)
+        
+        self.profile_table[profile_t, group_a] -= 1
+        self.profile_table[profile_t, group_b] += 1
+        self.profile_table[profile_u, group_b] -= 1
+        self.profile_table[profile_u, group_a] += 1
+    
+    # Deal the rows of each profile to the groups, by the profile table
+    def expandProfiles(self):
+        group_index_arr = empty(len(self.profile_index_arr), dtype = 'intp')
+        for profile_t, members in enumerate(self.profile_member_lst):
+            group_index_arr[members] = repeat(arange(self.num_groups), self.profile_table[profile_t])
+        
+        self.reassign(group_index_arr)
+    
+    # Deal every row to a group in one pass, rarest categories first. See assigner()
+    # Rows go in order of the population count of their rarest category. 
+    # Each row goes into the group (with room left) holding the fewest rows that share its categories 
+    # (weighted by column), with ties dealt round-robin. 
+    # Hence the rows of each category are spread across the groups, as evenly as the other columns allow.
+    # row_order_arr: order of the rows of the same rarity, e.g. shuffled for a different start each time
+    def dealRarestFirst(self, row_order_arr):
+        num_rows = len(self.group_index_arr)
+        
+        if self.flat_code_matrix.shape[1] > 0:
+            population_count = self.count_table.sum(axis = 0)
+            rarity_arr = population_count[self.flat_code_matrix].min(axis = 1)
+            row_order_arr = row_order_arr[argsort(rarity_arr[row_order_arr], kind = 'stable')]
+        
+        count_table = zeros(self.count_table.shape, dtype = self.count_table.dtype)
+        size_arr = zeros(self.num_groups, dtype = 'intp')
+        group_index_arr = empty(num_rows, dtype = 'intp')
+        next_group = 0
+        
+        for row in row_order_arr:
+            codes = self.flat_code_matrix[row]
+            shared_arr = count_table[:, codes] @ self.weight_arr
+            shared_arr[size_arr == self.group_size_arr] = inf
+            
+            # Ties go to the first group from next_group on
+            group = (int(argmin(roll(shared_arr, -next_group))) + next_group) % self.num_groups
+            
+            count_table[group, codes] += 1
+            size_arr[group] += 1
+            group_index_arr[row] = group
+            next_group = (group + 1) % self.num_groups
+        
+        self.reassign(group_index_arr)
+    
+    # Swap rows until no group has a homogenous column, e.g. after dealRarestFirst(), 
+    # which does not look at homogenous columns. 
+    # For a homogenous column of a group, takes the best swap (by change in diversity) of a row of the group 
+    # with a row of another category in another group, that makes no column homogenous. 
+    # Each swap leaves one homogenous column fewer. 
+    # Returns whether a group is still homogenous, i.e. no such swap was left
+    def repairHomogen(self):
+        while (self.distinct_table == 1).any():
+            group_a, column_number = argwhere(self.distinct_table == 1)[0]
+            
+            best_swap = None
+            for row_i in self.member_lst[group_a]:
+                candidate_arr, delta_arr, homogen_arr = self.partnerDelta(row_i)
+                allowed_arr = ~homogen_arr & (self.flat_code_matrix[candidate_arr, column_number] 
+                                              != self.flat_code_matrix[row_i, column_number])
+                if not allowed_arr.any():
+                    continue
+                
+                pick = int(argmax(where(allowed_arr, delta_arr, -inf)))
+                if best_swap is None or delta_arr[pick] > best_swap[0]:
+                    best_swap = (delta_arr[pick], int(row_i), int(candidate_arr[pick]))
+            
+            if best_swap is None:
+                return True
+            
+            self.swap(best_swap[1], best_swap[2])
+        
+        return False
+    
+    # Diversity of each group, from the count table. 
+    # Includes the constant of the all-unique columns left out of the search
+    def groupDiversity(self):
+        size_arr = self.group_size_arr
+        invariant_diversity = self.invariant_weight * self.xlogx_table[size_arr] / size_arr
+        
+        if len(self.num_categories) == 0:
+            return invariant_diversity
+        
+        sum_xlogx = add.reduceat(self.xlogx_table[self.count_table], 
+                                 categoryOffsets(self.num_categories), 
+                                 axis = 1)
+        swi_table = (self.xlogx_table[size_arr[:, None]] - sum_xlogx) / size_arr[:, None]
+        
+        return swi_table @ self.weight_arr + invariant_diversity
+    
+    # Aggregate Diversity Score (ADS) of all groups
+    def totalDiversity(self):
+        return float(self.groupDiversity().sum())
+    
+    # Whether each group has a homogenous column, from the distinct table. 
+    # A homogenous column left out of the search is homogenous in every group
+    def homogenGroups(self):
+        if self.constant_column_flag == True:
+            return ones(self.num_groups, dtype = bool)
+        
+        return (self.distinct_table == 1).any(axis = 1)
+    
+    # assigned_group column of the assignment (1-based)
+    def groupLabels(self):
+        return self.group_index_arr + 1
@@ -0,0 +1,33 @@
+#%% Packages
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+code_path = Path(__file__).resolve().parents[1]
+script_path = code_path / 'DiverseAssign_v1_0_1b.py'
+sample_path = code_path.parent / 'Sample-data' / 'sample_input.csv'
+
+#%% A headless run at the default verbosity (0) prints nothing, with or without parallel restarts
+
+@pytest.mark.parametrize('num_workers', [1, 2])
+def test_headless_run_is_quiet(tmp_path, num_workers):
+    output_path = tmp_path / 'output.csv'
+    completed = subprocess.run([sys.executable, 
+                                str(script_path), 
+                                '--input', str(sample_path), 
+                                '--groups', '8', 
+                                '--output', str(output_path), 
+                                '--seed', '1', 
+                                '--workers', str(num_workers)], 
+                               cwd = code_path, 
+                               capture_output = True, 
+                               text = True, 
+                               timeout = 600)
+    
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout == ''
+    assert completed.stderr == ''
+    assert output_path.exists()
@@ -0,0 +1,49 @@
+#%% Packages
+
+from pathlib import Path
+
+import pytest
+from numpy import arange, tile
+
+from diverse_assign import readCsvEncoded, AssignmentState, RandomStream
+from diverse_assign.search import assigner
+
+sample_path = Path(__file__).resolve().parents[2] / 'Sample-data' / 'sample_input.csv'
+
+#%% Vectorised partner search to a local maximum, from a sequential grouping. 
+# gain_cache_limit = 0 turns the gain cache off
+
+def vectorisedSearch(encoded_data, num_groups, seed, gain_cache_limit, algorithm):
+    num_rows = encoded_data[0].shape[0]
+    solution = AssignmentState(encoded_data, num_groups, tile(arange(num_groups), num_rows // num_groups + 1)[:num_rows])
+    search_kwargs = {'algorithm': algorithm, 
+                     'partner_search': 'Vectorised', 
+                     'gain_cache_limit': gain_cache_limit, 
+                     'random_stream': RandomStream(seed)}
+    
+    solution, initial_diversity, final_diversity, check_homogen_flag = assigner(num_groups, num_rows, solution, True, **search_kwargs)
+    previous_diversity = None
+    while previous_diversity is None or final_diversity > previous_diversity + 1e-12:
+        previous_diversity = final_diversity
+        solution, initial_diversity, final_diversity, check_homogen_flag = assigner(num_groups, 
+                                                                                    num_rows, 
+                                                                                    solution, 
+                                                                                    False, 
+                                                                                    carried_over_homogen_result = check_homogen_flag, 
+                                                                                    **search_kwargs)
+    
+    return solution.group_index_arr, final_diversity
+
+#%% The gain cache picks the same swaps as the search without it, greedy or simulated annealing
+
+@pytest.mark.parametrize('num_groups', [3, 8, 12])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('algorithm', ['RandomRestart', 'TwoHill'])
+def test_gain_cache_same_result(num_groups, seed, algorithm):
+    column_lst, row_lst, encoded_data = readCsvEncoded(sample_path)
+    
+    uncached_labels, uncached_diversity = vectorisedSearch(encoded_data, num_groups, seed, 0, algorithm)
+    cached_labels, cached_diversity = vectorisedSearch(encoded_data, num_groups, seed, 10 ** 7, algorithm)
+    
+    assert (cached_labels == uncached_labels).all()
+    assert cached_diversity == uncached_diversity
@@ -0,0 +1,63 @@
+#%% Packages
+
+from pathlib import Path
+
+import pytest
+
+from diverse_assign import solveEncoded, readCsvEncoded, RunControl
+
+sample_path = Path(__file__).resolve().parents[2] / 'Sample-data' / 'sample_input.csv'
+
+#%% class CountingRunControl. Stops the search at the stop_count-th check of stopped(), 
+# i.e. at the same point of the search in every run
+
+class CountingRunControl(RunControl):
+    def __init__(self, stop_count, **kwargs):
+        super().__init__(**kwargs)
+        self.stop_count = stop_count
+        self.check_count = 0
+    
+    def stopped(self):
+        self.check_count += 1
+        if self.check_count >= self.stop_count:
+            self.stop_flag = True
+        return super().stopped()
+
+#%% A run stopped and resumed from its checkpoint gives the same groups as the run left alone, 
+# with rotation moves and Kernighan-Lin refinement too. The faster cooling reaches plateaus sooner
+
+@pytest.mark.parametrize('partner_search', ['Deque', 'Vectorised'])
+@pytest.mark.parametrize('stop_count', [1000, 4000])
+def test_resume_with_rotations(tmp_path, partner_search, stop_count):
+    column_lst, row_lst, encoded_data = readCsvEncoded(sample_path)
+    
+    checkpoint_path = tmp_path / 'run.ckpt'
+    solve_kwargs = {'partner_search': partner_search, 
+                    'rotation_budget': 50, 
+                    'cooling_schedule': 0.85, 
+                    'exact_limit': 0}
+    
+    full_labels, full_diversity = solveEncoded(encoded_data, column_lst, 4, seed = 7, **solve_kwargs)
+    
+    run_control = CountingRunControl(stop_count)
+    solveEncoded(encoded_data, 
+                 column_lst, 
+                 4, 
+                 seed = 7, 
+                 run_control = run_control, 
+                 checkpoint_file = str(checkpoint_path), 
+                 checkpoint_interval = 0, 
+                 **solve_kwargs)
+    assert run_control.summary['stop_reason'] == 'stopped'
+    
+    # The seed of the resumed run is not used: the random numbers come from the checkpoint
+    resumed_labels, resumed_diversity = solveEncoded(encoded_data, 
+                                                     column_lst, 
+                                                     4, 
+                                                     seed = 99, 
+                                                     checkpoint_file = str(checkpoint_path), 
+                                                     resume_flag = True, 
+                                                     **solve_kwargs)
+    
+    assert (resumed_labels == full_labels).all()
+    assert resumed_diversity == full_diversity
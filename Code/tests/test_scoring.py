@@ -0,0 +1,46 @@
+#%% Packages
+
+from pathlib import Path
+
+import pytest
+from numpy import nan
+
+pandas = pytest.importorskip('pandas')
+
+from diverse_assign import calculateDiversity, calculateDiversityEncoded, encodeData, weightArray, readCsvEncoded
+
+sample_path = Path(__file__).resolve().parents[2] / 'Sample-data' / 'sample_input.csv'
+
+#%% The encoded score is the score of calculateDiversity(), missing values included
+
+def test_encoded_score_with_missing_values():
+    data = pandas.DataFrame({'Country': ['A', 'B', nan, 'A', nan, 'C'], 
+                             'Team': ['X', nan, nan, nan, nan, 'Y'], 
+                             'Level': [nan, nan, nan, nan, nan, nan], 
+                             'Code': [1.0, 2.0, nan, 1.0, 3.0, 2.0]})
+    weight_modifier_dict = {'Team': 2.0}
+    
+    code_matrix, num_categories, category_lst = encodeData(data)
+    encoded_diversity = calculateDiversityEncoded(code_matrix, 
+                                                  num_categories, 
+                                                  weight_arr = weightArray(data.columns, weight_modifier_dict))
+    
+    assert encoded_diversity == pytest.approx(calculateDiversity(data, weight_modifier_dict = weight_modifier_dict))
+    
+    # Each subset of rows, as scored for a group
+    for row_lst in ([0, 1, 2], [2, 4], [1, 3, 5], [0, 3]):
+        subset_diversity = calculateDiversityEncoded(code_matrix[row_lst], num_categories)
+        assert subset_diversity == pytest.approx(calculateDiversity(data.iloc[row_lst]))
+
+#%% The CSV loader encodes missing values as pandas does
+
+def test_csv_loader_score_with_missing_values(tmp_path):
+    line_lst = sample_path.read_text(encoding = 'utf-8-sig').splitlines()
+    input_path = tmp_path / 'input.csv'
+    input_path.write_text('\n'.join([line_lst[0]] + [line.replace('Ms.', '') for line in line_lst[1:]]) + '\n', encoding = 'utf-8')
+    
+    column_lst, row_lst, (code_matrix, num_categories, category_lst) = readCsvEncoded(input_path)
+    data = pandas.read_csv(input_path)
+    assert data.isna().any().any()
+    
+    assert calculateDiversityEncoded(code_matrix, num_categories) == pytest.approx(calculateDiversity(data))
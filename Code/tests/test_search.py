@@ -0,0 +1,89 @@
+#%% Packages
+
+from pathlib import Path
+from time import time
+
+import pytest
+from numpy import arange, tile
+from numpy.random import default_rng
+
+from diverse_assign import readCsvEncoded, AssignmentState, RandomStream, RunControl
+from diverse_assign.scoring import codeMatrix
+from diverse_assign.search import assigner, kernighanLinRefiner
+
+sample_path = Path(__file__).resolve().parents[2] / 'Sample-data' / 'sample_input.csv'
+
+#%% Simulated annealing in the vectorised and profile partner searches never lowers the diversity, 
+# as in the deque partner search
+
+@pytest.mark.parametrize('partner_search', ['Deque', 'Vectorised', 'Profile'])
+@pytest.mark.parametrize('algorithm', ['TwoHill', 'SimAnneal'])
+@pytest.mark.parametrize('temperature', [1.0, 0.1])
+def test_annealing_never_lowers_diversity(partner_search, algorithm, temperature):
+    column_lst, row_lst, encoded_data = readCsvEncoded(sample_path)
+    num_rows = len(row_lst)
+    num_groups = 8
+    
+    solution = AssignmentState(encoded_data, 
+                               num_groups, 
+                               tile(arange(num_groups), num_rows // num_groups + 1)[:num_rows], 
+                               profile_flag = (partner_search == 'Profile'))
+    random_stream = RandomStream(3)
+    
+    shuffle_flag = True
+    for _ in range(5):
+        solution, initial_diversity, final_diversity, check_homogen_flag = assigner(num_groups, 
+                                                                                    num_rows, 
+                                                                                    solution, 
+                                                                                    shuffle_flag, 
+                                                                                    algorithm = algorithm, 
+                                                                                    partner_search = partner_search, 
+                                                                                    temperature = temperature, 
+                                                                                    random_stream = random_stream)
+        assert final_diversity >= initial_diversity - 1e-9
+        shuffle_flag = False
+
+#%% Random categorical data of num_rows rows, in num_groups sequential groups
+
+def randomSolution(num_rows, num_groups, seed):
+    rng = default_rng(seed)
+    codes_lst = [rng.integers(0, num_categories, num_rows) for num_categories in (2, 3, 5, 8, 12, 20)]
+    encoded_data = codeMatrix(codes_lst, [list(range(codes.max() + 1)) for codes in codes_lst], num_rows)
+    return AssignmentState(encoded_data, num_groups, tile(arange(num_groups), num_rows // num_groups + 1)[:num_rows])
+
+#%% The Kernighan-Lin refinement stops within a step of the deadline, keeping the best prefix of its swaps
+
+@pytest.mark.parametrize('num_rows', [2000, 20000])
+def test_kernighan_lin_stops_at_deadline(num_rows):
+    solution = randomSolution(num_rows, 2, 0)
+    initial_diversity = solution.totalDiversity()
+    
+    start_time = time()
+    total_delta = kernighanLinRefiner(solution, True, RunControl(deadline = start_time + 0.2), RandomStream(0))
+    
+    assert time() - start_time < 1.0
+    assert total_delta >= 0
+    assert solution.totalDiversity() == pytest.approx(initial_diversity + total_delta)
+
+#%% One tabu search pass takes about as long as a few deque partner search passes, 
+# and never ends below its start
+
+def test_tabu_runtime_bound():
+    num_rows = 2000
+    num_groups = 10
+    
+    elapsed_dict = {}
+    for algorithm, partner_search in [('TwoHill', 'Deque'), ('Tabu', 'Vectorised')]:
+        solution = randomSolution(num_rows, num_groups, 0)
+        start_time = time()
+        solution, initial_diversity, final_diversity, check_homogen_flag = assigner(num_groups, 
+                                                                                    num_rows, 
+                                                                                    solution, 
+                                                                                    True, 
+                                                                                    algorithm = algorithm, 
+                                                                                    partner_search = partner_search, 
+                                                                                    random_stream = RandomStream(1))
+        elapsed_dict[algorithm] = time() - start_time
+        assert final_diversity >= initial_diversity - 1e-9
+    
+    assert elapsed_dict['Tabu'] < 10 * elapsed_dict['TwoHill']